@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures: synthetic Nirvana HDF5 trays and datasets.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import os
+
+# tksamples reads the Crucible configuration on import
+os.environ.setdefault("CRUCIBLE_API_KEY", "test")
+
+import numpy as np
+import h5py
+import pytest
+
+#%%
+
+def write_tray(h5file, npos=4, nspots=3, nwl=200, seed=0, wl0=300., wl1=900., names=None):
+    """Write a synthetic new-format tray (path or file-like object)."""
+    rng = np.random.default_rng(seed)
+    wl  = np.linspace(wl0, wl1, nwl)
+    with h5py.File(h5file, "w") as fout:
+        fout.attrs["carrier"] = "C1"
+        group = fout.create_group("measurement/pollux_oospec_multipos_line_scan")
+        group["wavelengths"] = wl
+        group.create_group("settings").attrs["spec_integration_time"] = 10.0
+        positions = group.create_group("positions")
+        for pp in range(npos):
+            name = names[pp] if names else f"TF{pp+1:06d}"
+            pos  = positions.create_group(f"pos_{pp}")
+            pos.attrs.update(dict(sample_name=name, sample_uuid=f"uuid-{name}",
+                                  x_center=1.0*pp, y_center=2.0, integration_time=10.0,
+                                  x_positions=np.arange(nspots)*1.0,
+                                  y_positions=np.arange(nspots)*2.0))
+            edge  = 1 / (1 + np.exp(-(wl - (700 + 10*pp)) / 15))
+            dark  = 100 + rng.random(nwl)
+            blank = dark + 5000
+            raw   = dark + 5000 * (0.1 + 0.8*edge) * (1 + 0.01*rng.random((nspots, nwl)))
+            pos["raw_intensities"]   = raw
+            pos["blank_intensities"] = np.vstack([blank, blank, blank])
+            pos["dark_intensities"]  = np.vstack([dark, dark, dark])
+    return h5file
+
+
+def make_dataset(uid="ds1", name="251218_130227_pollux_oospec_multipos_line_scan"):
+    """Minimal Crucible dataset dictionary of a UV-Vis tray."""
+    return {"unique_id": uid, "dataset_name": name,
+            "measurement": "pollux_oospec_multipos_line_scan",
+            "scientific_metadata": {"scientific_metadata": {}}}
+
+
+@pytest.fixture
+def tray(tmp_path):
+    return write_tray(str(tmp_path / "tray.h5"))
+
+
+@pytest.fixture
+def measurements(tmp_path):
+    """UV-Vis measurements of two trays on different grids and numbers of spots."""
+    from tksamples.read import h5_to_samples
+    first  = write_tray(str(tmp_path / "first.h5"), npos=4, nwl=200, seed=0)
+    second = write_tray(str(tmp_path / "second.h5"), npos=3, nspots=5, nwl=150, seed=1,
+                        wl0=350., names=[f"TF{pp:06d}" for pp in range(10, 13)])
+    return (h5_to_samples(make_dataset("ds1"), first) +
+            h5_to_samples(make_dataset("ds2"), second))
+
+
+def make_sample(name, sample_type="thin film", datasets=()):
+    """Sample built from a minimal Crucible sample dictionary."""
+    from tksamples import Sample
+    return Sample({"unique_id": f"uuid-{name}", "project_id": "test",
+                   "date_created": "2026-01-01T00:00:00", "sample_name": name,
+                   "sample_type": sample_type, "description": "",
+                   "datasets": list(datasets)})
+
+
+def make_samples(names, tmp_path, exclusions=None, **kwargs):
+    """Samples collection (not from Crucible) of thin films."""
+    from tksamples import Samples, ExclusionRegistry
+    if exclusions is None:
+        exclusions = ExclusionRegistry()
+    return Samples(samples=[make_sample(name, **kwargs) for name in names],
+                   from_crucible=False, cache_dir=str(tmp_path), exclusions=exclusions)
+
+
+def make_project(nprec=4, nsol=10, nfilm=60, seed=0, graph_backend="networkx", edges=None):
+    """
+    CrucibleProject built offline: precursors -> solutions -> thin films with
+    random parents (or the given (parent name, child name) edges).
+    """
+    from tksamples.project import CrucibleProject
+    from tksamples.collection import SampleCollection
+
+    rng   = np.random.default_rng(seed)
+    precs = [make_sample(f"PB{ii:04d}", "precursor") for ii in range(nprec)]
+    sols  = [make_sample(f"SOL{ii:04d}", "solution") for ii in range(nsol)]
+    films = [make_sample(f"TF{ii:06d}", "thin film") for ii in range(nfilm)]
+    samples = precs + sols + films
+
+    if edges is None:
+        edges = [(precs[pp].sample_name, sol.sample_name) for sol in sols
+                 for pp in rng.choice(nprec, 2, replace=False)]
+        edges += [(sols[ss].sample_name, film.sample_name) for film in films
+                  for ss in rng.choice(nsol, rng.integers(1, 3), replace=False)]
+
+    project = CrucibleProject.__new__(CrucibleProject)
+    project._cache_dir       = None
+    project._use_cache       = False
+    project._overwrite_cache = False
+    project._datasets        = []
+    project._datasets_by_id  = {}
+    project._graph_backend   = graph_backend
+    SampleCollection.__init__(project, samples=samples, project_id="test")
+
+    graph = {"edges": [{"source": f"uuid-{parent}", "target": f"uuid-{child}"}
+                       for parent, child in edges]}
+    project._get_project_graph = lambda: graph
+    project._setup_graph()
+    return project
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from tksamples.analysis.bandgap import HC_EV_NM, tauc_band_gap, get_band_gaps
+
+#%%
+
+def _direct_gap_absorbance(wavelengths, band_gap):
+    """Absorbance with (A*E)^2 = E - Eg above the gap."""
+    energies = HC_EV_NM / wavelengths
+    return np.sqrt(np.clip(energies - band_gap, 0, None)) / energies
+
+
+def _measurement(name, mfid, band_gaps, wavelengths):
+    absorbances = np.array([_direct_gap_absorbance(wavelengths, eg) for eg in band_gaps])
+    return SimpleNamespace(sample_name=name, mfid=mfid, wavelengths=wavelengths,
+                           absorbances=absorbances, nspots=len(band_gaps))
+
+
+def test_tauc_band_gap_recovers_direct_gap():
+    wavelengths = np.linspace(400, 900, 400)
+    gaps = np.array([1.55, 1.6, 1.7, 2.0])
+    absorbances = np.array([_direct_gap_absorbance(wavelengths, eg) for eg in gaps])
+
+    band_gaps, slopes, r2s = tauc_band_gap(wavelengths, absorbances, window=10)
+
+    assert np.allclose(band_gaps, gaps, atol=0.01)
+    assert np.all(slopes > 0)
+    assert np.all(r2s >= 0.95)
+
+
+def test_get_band_gaps_keeps_order_and_dataset_ids():
+    grid1 = np.linspace(400, 900, 400)
+    grid2 = np.linspace(420, 880, 300)
+
+    # two scans of the same sample on different grids, interleaved
+    measurements = [
+        _measurement("TF000001", "scan-a", [1.6, 1.6], grid1),
+        _measurement("TF000002", "scan-b", [1.7], grid2),
+        _measurement("TF000001", "scan-c", [1.8, 1.8], grid2),
+        ]
+
+    table = get_band_gaps(measurements, window=10)
+
+    assert list(table["dataset_id"]) == ["scan-a", "scan-a", "scan-b", "scan-c", "scan-c"]
+    assert list(table["spot"]) == [0, 1, 0, 0, 1]
+    assert np.allclose(table["band_gap"], [1.6, 1.6, 1.7, 1.8, 1.8], atol=0.01)
+
+
+def test_get_band_gaps_empty():
+    assert len(get_band_gaps([])) == 0
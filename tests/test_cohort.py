@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cohort index: same-recipe and sibling queries.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+from conftest import make_sample
+from tksamples.graph.cohort import CohortIndex
+
+#%%
+
+def test_cohorts_and_siblings():
+    precursors = [make_sample(f"PB{ii}", "precursor") for ii in range(3)]
+    films = [make_sample(f"TF{ii:06d}") for ii in range(6)]
+    recipes = [(0, 1), (0, 1), (1, 2), (0,), (0, 1), (2,)]
+    for film, recipe in zip(films, recipes):
+        for pp in recipe:
+            film.add_parent(precursors[pp])
+
+    cohorts = CohortIndex(precursors + films)
+    assert cohorts.cohort(films[0]) == [films[1], films[4]]
+    assert set(cohorts.siblings(films[3])) == {films[0], films[1], films[4]}
+
+    groups = cohorts.cohorts(sample_type="thin film", min_size=2)
+    assert list(groups.values()) == [[films[0], films[1], films[4]]]
+
+    # new edge moves the film to another cohort
+    films[5].add_parent(precursors[1])
+    cohorts.add_edge(precursors[1], films[5])
+    assert cohorts.cohort(films[5]) == [films[2]]
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Genealogy export: JSON round trip and HTML escaping of sample metadata.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import json
+import re
+
+from conftest import make_project
+from tksamples.graph.export import export_html, export_json, genealogy_data
+
+#%%
+
+NASTY = '<img src=x onerror="alert(1)"></script>'
+
+
+def test_json_round_trip(tmp_path):
+    project = make_project(nfilm=20)
+    fname   = str(tmp_path / "genealogy.json")
+    export_json(project, fname)
+
+    with open(fname) as fin:
+        data = json.load(fin)
+
+    assert data == json.loads(json.dumps(genealogy_data(project)))
+    names = data["nodes"]["name"]
+    assert sorted(names) == sorted(sample.sample_name for sample in project.samples)
+    assert len(data["edges"]["source"]) == project.genealogy.number_of_edges()
+
+
+def test_html_does_not_inject_metadata(tmp_path):
+    project = make_project(nfilm=5)
+    project.samples[-1]._dataset["sample_name"] = NASTY
+    fname   = str(tmp_path / "genealogy.html")
+    export_html(project, fname, title=NASTY)
+
+    with open(fname) as fin:
+        html = fin.read()
+
+    # metadata only reaches the page as JSON and through textContent
+    assert "<img" not in html
+    assert "innerHTML" not in html
+    payload = re.search(r'<script type="application/json" id="data">(.*?)</script>', html, re.S)
+    data = json.loads(payload.group(1))
+    assert NASTY in data["nodes"]["name"]
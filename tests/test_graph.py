@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Genealogy graph: compact backend and incremental updates against networkx.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import numpy as np
+import networkx as nx
+
+from conftest import make_project, make_sample
+from tksamples.graph.compact import CompactGraph
+
+#%%
+
+def _edge_set(graph):
+    return {(parent.sample_name, child.sample_name) for parent, child in graph.edges()}
+
+
+def _assert_sorted_csr(graph):
+    for indptr, indices in [(graph._child_indptr, graph._child_indices),
+                            (graph._parent_indptr, graph._parent_indices)]:
+        assert indptr[-1] == len(indices) == graph.number_of_edges()
+        for ii in range(len(indptr) - 1):
+            row = indices[indptr[ii]:indptr[ii+1]]
+            assert np.all(np.diff(row) > 0)
+
+
+def test_compact_matches_networkx():
+    compact = make_project(graph_backend="compact")._genealogy
+    nxgraph = make_project(graph_backend="networkx")._genealogy
+
+    assert isinstance(compact, CompactGraph)
+    assert {node.sample_name for node in compact.nodes} == {node.sample_name for node in nxgraph.nodes}
+    assert _edge_set(compact.to_networkx()) == _edge_set(nxgraph)
+    _assert_sorted_csr(compact)
+
+
+def test_compact_keeps_outside_parents():
+    outside = make_sample("PB_EXT", "precursor")
+    film    = make_sample("TF_EXT")
+    film.add_parent(outside)
+
+    compact = CompactGraph([film])
+    reference = nx.DiGraph([(outside, film)])
+
+    assert set(compact.nodes) == set(reference.nodes)
+    assert list(compact.predecessors(film)) == [outside]
+    assert compact.number_of_edges() == 1
+
+
+def test_incremental_delta_matches_rebuild():
+    for backend in ["compact", "networkx"]:
+        project = make_project(graph_backend=backend)
+
+        new_films = [make_sample(f"TF9{ii:05d}") for ii in range(5)]
+        edges = [("SOL0000", film.sample_name) for film in new_films]
+        edges += [("SOL0003", "TF000001"), ("SOL0004", "TF000001"), ("SOL0001", "SOL0002")]
+        edges += [edges[0]]  # duplicate, skipped
+
+        graph  = project._genealogy
+        before = _edge_set(graph.to_networkx() if backend == "compact" else graph)
+        nadded, nedges = project.apply_graph_delta(samples=new_films, edges=edges)
+        assert nadded == 5
+        assert nedges == len(set(edges) - before)
+
+        graph = project._genealogy
+        reference = nx.DiGraph((parent, child) for child in project.samples
+                               for parent in child.parents)
+        reference.add_nodes_from(project.samples)
+
+        if backend == "compact":
+            _assert_sorted_csr(graph)
+            graph = graph.to_networkx()
+            rebuilt = CompactGraph(project.samples)
+            assert _edge_set(rebuilt.to_networkx()) == _edge_set(reference)
+
+        assert set(graph.nodes) == set(reference.nodes)
+        assert _edge_set(graph) == _edge_set(reference)
+
+
+def test_delta_applies_existing_sample_links():
+    for backend in ["compact", "networkx"]:
+        project = make_project(graph_backend=backend)
+        film     = project.samples[-1]
+        solution = project.get_sample("uuid-SOL0000")
+        other    = next(sample for sample in project.get_samples_by_type("solution")
+                        if sample not in film.parents)
+
+        # linked locally before the delta: a new sample and a new edge
+        new_film = make_sample("TF900000")
+        new_film.add_parent(solution)
+        film.add_parent(other)
+
+        nadded, nedges = project.apply_graph_delta(samples=[new_film], edges=[(other, film)])
+        assert (nadded, nedges) == (1, 2)
+
+        for parent, child in [(solution, new_film), (other, film)]:
+            assert project.genealogy.has_edge(parent, child)
+            assert child in project.get_descendants(parent)
+        assert project._cohorts.parent_set(new_film) == {solution}
+        assert project._cohorts.parent_set(film) == frozenset(film.parents)
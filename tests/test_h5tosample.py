@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+from io import BytesIO
+
+import numpy as np
+
+from tksamples.read.h5tosample import open_h5, h5_to_samples
+
+from conftest import write_tray, make_dataset
+
+#%%
+
+def _image(**kwargs):
+    buffer = BytesIO()
+    write_tray(buffer, **kwargs)
+    buffer.seek(0)
+    return buffer
+
+
+def test_open_h5_concurrent_images_do_not_alias():
+    first  = _image(nwl=100, seed=1)
+    second = _image(nwl=50, seed=2)
+
+    with open_h5(first) as h5first, open_h5(second) as h5second:
+        wl1 = h5first["measurement/pollux_oospec_multipos_line_scan/wavelengths"][()]
+        wl2 = h5second["measurement/pollux_oospec_multipos_line_scan/wavelengths"][()]
+
+    assert len(wl1) == 100
+    assert len(wl2) == 50
+
+
+def test_in_memory_and_file_reads_match(tray):
+    with open(tray, "rb") as fin:
+        buffer = BytesIO(fin.read())
+
+    from_file   = h5_to_samples(make_dataset(), tray)
+    from_memory = h5_to_samples(make_dataset(), buffer)
+
+    assert [mm.sample_name for mm in from_file] == [mm.sample_name for mm in from_memory]
+    for mfile, mmem in zip(from_file, from_memory):
+        assert np.array_equal(mfile.absorbances, mmem.absorbances)
+
+
+def test_live_reader_skips_preallocated_positions(tray):
+    import h5py
+    from tksamples.read.live import LiveTrayReader
+
+    # preallocate a new position, only raw intensities written so far
+    with h5py.File(tray, "a") as h5file:
+        positions = h5file["measurement/pollux_oospec_multipos_line_scan/positions"]
+        pos = positions.create_group("pos_9")
+        pos.attrs.update(dict(positions["pos_0"].attrs))
+        for key in ["raw_intensities", "blank_intensities", "dark_intensities"]:
+            pos.create_dataset(key, shape=(3, 200), dtype=float, fillvalue=0)
+        pos["raw_intensities"][:] = positions["pos_0"]["raw_intensities"][()]
+
+    reader = LiveTrayReader(make_dataset(), tray)
+    assert len(reader.poll()) == 4
+    assert "pos_9" not in reader.parsed_positions
+
+    # writer completes the position
+    with h5py.File(tray, "a") as h5file:
+        positions = h5file["measurement/pollux_oospec_multipos_line_scan/positions"]
+        for key in ["blank_intensities", "dark_intensities"]:
+            positions["pos_9"][key][:] = positions["pos_0"][key][()]
+
+    assert len(reader.poll()) == 1
+    assert reader.poll() == []
+
+
+def test_tray_correction_matches_single_measurement(tray):
+    from tksamples.measurements.uvvis import reference_spectrum, correct_intensities
+    from tksamples.read.h5tosample import read_position_new
+
+    measurements = h5_to_samples(make_dataset(), tray)
+
+    import h5py
+    with h5py.File(tray, "r") as h5file:
+        h5group = h5file["measurement/pollux_oospec_multipos_line_scan/positions"]
+        for measurement, poskey in zip(measurements, h5group):
+            _, _, raw, blank, dark = read_position_new(h5group, poskey)
+            _, transmissions, absorbances = correct_intensities(
+                raw, reference_spectrum(blank), reference_spectrum(dark))
+            emask = measurement._emask
+            assert np.allclose(measurement.transmissions, transmissions[:, emask])
+            assert np.allclose(measurement.absorbances, absorbances[:, emask])
+
+
+def test_correct_intensities_into_views():
+    from tksamples.measurements.uvvis import correct_intensities
+
+    rng   = np.random.default_rng(0)
+    dark  = 100 + rng.random(50)
+    blank = dark + 5000
+    raw   = dark + 5000 * rng.random((3, 50))
+
+    expected = correct_intensities(raw, blank, dark)
+    stacked  = np.zeros((3, 8, 50))
+    views    = (stacked[0, 2:5], stacked[1, 2:5], stacked[2, 2:5])
+    result   = correct_intensities(raw, blank, dark, out=views)
+
+    assert all(res is view for res, view in zip(result, views))
+    for res, exp in zip(result, expected):
+        assert np.allclose(res, exp)
+    assert not stacked[:, :2].any() and not stacked[:, 5:].any()
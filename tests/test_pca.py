@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Out-of-core incremental PCA against a batch decomposition.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import numpy as np
+
+from tksamples.read import write_uvvis_store
+from tksamples.analysis.pca import IncrementalPCA
+
+#%%
+
+def test_incremental_pca_matches_batch(measurements, tmp_path):
+    wavelengths = np.arange(360, 880, 4.0)
+    fname = write_uvvis_store(measurements, str(tmp_path / "store.h5"))
+
+    streamed = IncrementalPCA(3, wavelengths).fit(fname, chunk_size=2)
+    spectra  = streamed._spectra(measurements)
+    batch    = IncrementalPCA(3, wavelengths)
+    batch.partial_fit(spectra)
+
+    assert streamed.nsamples == batch.nsamples == len(spectra)
+    assert np.allclose(streamed.mean, spectra.mean(axis=0))
+
+    # reference: eigen decomposition of the full covariance matrix
+    eigvals, eigvecs = np.linalg.eigh(np.cov(spectra, rowvar=False))
+    order = np.argsort(eigvals)[::-1][:3]
+    assert np.allclose(streamed.explained_variance, eigvals[order])
+    for component, reference in zip(streamed.components, eigvecs[:, order].T):
+        assert np.isclose(abs(component @ reference), 1)
+
+    names, spots, scores = streamed.transform_source(measurements)
+    assert len(names) == len(spots) == len(scores) == len(spectra)
+    assert np.allclose(scores, streamed.transform(spectra))
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming UV-Vis QC: fixed limits and running-aggregate outliers.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+from conftest import write_tray, make_dataset
+from tksamples.read import h5_to_samples
+from tksamples.analysis.qc import UVVisQC
+
+#%%
+
+def _tray(tmp_path, seed):
+    dataset = make_dataset(f"ds{seed}")
+    return dataset, h5_to_samples(dataset, write_tray(str(tmp_path / f"tray{seed}.h5"), seed=seed))
+
+
+def test_outliers_flagged_from_running_aggregates(tmp_path):
+    qc = UVVisQC(min_datasets=5)
+
+    for seed in range(8):
+        assert qc.check(*_tray(tmp_path, seed))
+    assert qc.dataset_stats["blank_drift"].count == 8
+
+    # blank drift well below the fixed limit, but far outside the running spread
+    dataset, measurements = _tray(tmp_path, 100)
+    measurements[0]._blank_intensities *= 1.05
+    assert qc.limits()["blank_drift"] < 0.02 < qc.max_drift
+    assert not qc.check(dataset, measurements)
+    assert qc.flagged == {"ds100"}
+    assert qc.reasons("ds100")[0].startswith("blank drift")
+
+    # flagged datasets do not widen the thresholds
+    assert qc.dataset_stats["blank_drift"].count == 8
+    assert qc.report()["flagged"].sum() == 1
+
+
+def test_fixed_limits_before_enough_history(tmp_path):
+    qc = UVVisQC()
+    dataset, measurements = _tray(tmp_path, 0)
+    measurements[0]._blank_intensities *= 1.05
+    assert qc.check(dataset, measurements)
+
+    measurements[0]._blank_intensities *= 2
+    assert not qc.check(dict(dataset, unique_id="bad"), measurements)
+    assert qc.flagged == {"bad"}
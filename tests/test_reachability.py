@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reachability index and lineage queries against networkx.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import numpy as np
+import networkx as nx
+import pytest
+
+from conftest import make_project
+from tksamples.graph.reachability import ReachabilityIndex
+
+#%%
+
+def _random_graph(nnodes=60, nedges=120, seed=0, cycles=False):
+    rng   = np.random.default_rng(seed)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(nnodes))
+    while graph.number_of_edges() < nedges:
+        ss, tt = rng.integers(nnodes, size=2)
+        if ss == tt or (not cycles and ss > tt):
+            continue
+        graph.add_edge(int(ss), int(tt))
+    return graph
+
+
+@pytest.mark.parametrize("cycles", [False, True])
+def test_ancestors_descendants_match_networkx(cycles):
+    graph = _random_graph(cycles=cycles)
+    index = ReachabilityIndex(graph)
+
+    for node in graph:
+        assert set(index.ancestors(node)) == nx.ancestors(graph, node)
+        assert set(index.descendants(node)) == nx.descendants(graph, node)
+        assert index.nancestors(node) == len(nx.ancestors(graph, node))
+
+    for aa, bb in [(5, 40), (10, 11), (0, 59)]:
+        expected = nx.ancestors(graph, aa) & nx.ancestors(graph, bb)
+        assert set(index.common_ancestors(aa, bb)) == expected
+        assert index.is_ancestor(aa, bb) == (aa in nx.ancestors(graph, bb))
+
+
+@pytest.mark.parametrize("backend", ["networkx", "compact"])
+def test_project_queries(backend):
+    project = make_project(graph_backend=backend)
+    graph   = nx.DiGraph((parent, child) for child in project.samples
+                         for parent in child.parents)
+
+    for sample in project.samples[::5]:
+        assert set(project.get_ancestors(sample)) == nx.ancestors(graph, sample)
+        assert set(project.get_descendants(sample.unique_id)) == nx.descendants(graph, sample)
+
+
+def test_matrices_match_masks():
+    graph = _random_graph()
+    index = ReachabilityIndex(graph)
+
+    ancestors = index.ancestors_matrix().toarray()
+    for cc, node in enumerate(index.nodes):
+        expected = np.zeros(len(index), dtype=bool)
+        expected[[index.index(anc) for anc in nx.ancestors(graph, node)]] = True
+        assert np.array_equal(ancestors[cc], expected)
+
+    assert np.array_equal(index.descendants_matrix().toarray(), ancestors.T)
+
+
+def test_aggregate_matches_brute_force():
+    graph = _random_graph(nedges=100, seed=2)
+    index = ReachabilityIndex(graph)
+
+    rng    = np.random.default_rng(1)
+    values = rng.random(len(index))
+    values[rng.random(len(index)) < 0.3] = np.nan
+
+    stats = index.aggregate(values, over="descendants", include_self=True)
+    for cc, node in enumerate(index.nodes):
+        related = [index.index(desc) for desc in nx.descendants(graph, node) | {node}]
+        vals = values[related]
+        vals = vals[np.isfinite(vals)]
+        assert stats["count"][cc] == len(vals)
+        if len(vals):
+            assert np.isclose(stats["sum"][cc], vals.sum())
+            assert np.isclose(stats["mean"][cc], vals.mean())
+            assert np.isclose(stats["std"][cc], vals.std())
+            assert stats["min"][cc] == vals.min() and stats["max"][cc] == vals.max()
+        else:
+            assert np.isnan(stats["mean"][cc])
+
+
+def test_aggregate_counts_shared_ancestry_once():
+    # diamond: one precursor, two solutions, one film from both solutions
+    graph = nx.DiGraph([("P", "S1"), ("P", "S2"), ("S1", "F"), ("S2", "F")])
+    index = ReachabilityIndex(graph)
+
+    values = np.array([1.0 if node == "F" else np.nan for node in index.nodes])
+    stats  = index.aggregate(values)
+    assert stats["count"][index.index("P")] == 1
+
+
+@pytest.mark.parametrize("cycles", [False, True])
+def test_incremental_edges_match_rebuild(cycles):
+    graph = _random_graph(nedges=60, cycles=cycles)
+    index = ReachabilityIndex(graph)
+
+    extra = _random_graph(nedges=140, seed=1, cycles=cycles)
+    for ss, tt in extra.edges:
+        if not graph.has_edge(ss, tt):
+            graph.add_edge(ss, tt)
+            index.add_edge(ss, tt)
+
+    rebuilt = ReachabilityIndex(graph)
+    for node in graph:
+        assert index.ancestors_mask(node) == rebuilt.ancestors_mask(node)
+        assert index.descendants_mask(node) == rebuilt.descendants_mask(node)
+
+
+def _lowest_common_ancestors(graph, aa, bb):
+    common = (nx.ancestors(graph, aa) | {aa}) & (nx.ancestors(graph, bb) | {bb})
+    return {node for node in common if not nx.descendants(graph, node) & common}
+
+
+def test_lca_and_paths_match_networkx():
+    graph = _random_graph(nedges=90, seed=3)
+    index = ReachabilityIndex(graph)
+
+    rng = np.random.default_rng(0)
+    for aa, bb in rng.integers(len(graph), size=(200, 2)).tolist():
+        assert set(index.lowest_common_ancestors(aa, bb)) == _lowest_common_ancestors(graph, aa, bb)
+
+        path = index.shortest_path(aa, bb)
+        if nx.has_path(graph, aa, bb):
+            assert len(path) == nx.shortest_path_length(graph, aa, bb) + 1
+            assert path[0] == aa and path[-1] == bb
+            assert all(graph.has_edge(ss, tt) for ss, tt in zip(path[:-1], path[1:]))
+        else:
+            assert path is None
+
+        derivation = index.derivation_path(aa, bb)
+        if derivation is not None:
+            assert derivation[0] == aa and derivation[-1] == bb
+            undirected = graph.to_undirected(as_view=True)
+            assert all(undirected.has_edge(ss, tt)
+                       for ss, tt in zip(derivation[:-1], derivation[1:]))
+
+
+def test_project_lowest_common_ancestors():
+    project = make_project()
+    graph   = project.genealogy
+
+    film1, film2 = project.samples[-1], project.samples[-2]
+    expected = _lowest_common_ancestors(graph, film1, film2)
+    assert set(project.get_lowest_common_ancestors(film1, film2)) == expected
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import pytest
+
+from conftest import make_sample, make_samples
+
+#%%
+
+def _uvvis_dataset(uid, name):
+    return {"unique_id": uid, "dataset_name": name,
+            "measurement": "pollux_oospec_multipos_line_scan"}
+
+
+def test_datasets_table_follows_exclusions(tmp_path):
+    datasets = [_uvvis_dataset("ds-a", "251218_130227_scan"),
+                _uvvis_dataset("ds-b", "260107_151134_scan")]
+    samples = make_samples(["TF000001"], tmp_path, datasets=datasets)
+
+    mtype = "pollux_oospec_multipos_line_scan"
+    assert len(samples.get_measurments_datasets_of_type(mtype)) == 2
+
+    samples.exclusions.add("260107_151134")
+    assert [dst["unique_id"] for dst in samples.get_measurments_datasets_of_type(mtype)] == ["ds-a"]
+
+
+def test_datasets_table_follows_added_samples(tmp_path):
+    samples = make_samples(["TF000001"], tmp_path,
+                           datasets=[_uvvis_dataset("ds-a", "251218_130227_scan")])
+
+    mtype = "pollux_oospec_multipos_line_scan"
+    assert len(samples.get_measurments_datasets_of_type(mtype)) == 1
+
+    new = make_sample("TF000002", datasets=[_uvvis_dataset("ds-c", "260201_101010_scan")])
+    assert samples.add_samples([new]) == [new]
+    assert samples.version == 1
+
+    ids = [dst["unique_id"] for dst in samples.get_measurments_datasets_of_type(mtype)]
+    assert ids == ["ds-a", "ds-c"]
+
+
+def test_aging_scans_only_reach_series(tmp_path):
+    from tksamples.exclusions import ExclusionRegistry, default_exclusions, aging_datasets
+    from tksamples.read.h5tosample import h5_to_samples
+    from conftest import write_tray, make_dataset
+
+    # aging scans are excluded by default
+    registry = ExclusionRegistry(patterns=default_exclusions)
+    for name in aging_datasets:
+        assert registry.is_excluded({"unique_id": "x", "dataset_name": name})
+
+    samples = make_samples(["TF000001", "TF000002"], tmp_path)
+
+    original = h5_to_samples(make_dataset("ds-orig", "251201_120000_pollux_oospec_multipos_line_scan"),
+                             write_tray(str(tmp_path / "orig.h5"), npos=2))
+    aged     = h5_to_samples(make_dataset("ds-aged", aging_datasets[1]),
+                             write_tray(str(tmp_path / "aged.h5"), npos=2, seed=5))
+
+    samples._assign_measurements(original)
+    samples._assign_measurements(aged, series_only=True)
+
+    sample = samples.get_sample(sample_name="TF000001")
+    assert sample.uvvis.mfid == "ds-orig"
+    assert sample.get_latest_measurement("uvvis").mfid == "ds-orig"
+    assert list(sample.get_measurements("uvvis")) == ["ds-orig"]
+    assert [mm.mfid for mm in samples.get_measurements("uvvis", latest=True)] == ["ds-orig"] * 2
+    assert len(samples.get_measurements("uvvis")) == 2
+
+    series = sample.get_measurement_series("uvvis")
+    assert [mm.mfid for mm in series.measurements] == ["ds-orig", "ds-aged"]
+
+
+def test_sample_measurements_keyed_by_dataset(measurements):
+    sample = make_sample("TF000001")
+    first, second = measurements[0], measurements[4]
+    sample.add_measurement(first)
+    sample.add_measurement(second)
+
+    assert sample.get_measurements("uvvis") == {first.mfid: first, second.mfid: second}
+    assert sample.get_measurements() == sample.get_measurements("uvvis")
+    assert sample.get_measurements("image") == {}
+
+
+def test_exclusion_registry_save_and_truth(tmp_path):
+    from tksamples.exclusions import ExclusionRegistry
+
+    registry = ExclusionRegistry()
+    assert registry and len(registry) == 0
+    with pytest.raises(ValueError):
+        registry.save()
+
+    registry = ExclusionRegistry.load(cache_dir=str(tmp_path))
+    registry.add_dataset_id("ds-x")
+    registry.save()
+    assert "ds-x" in ExclusionRegistry.load(cache_dir=str(tmp_path)).dataset_ids
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Spectral similarity index: k-NN queries and persistence.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import numpy as np
+import pytest
+
+from tksamples.analysis.similarity import SpectralIndex
+
+#%%
+
+def test_spectral_index_query_and_save(measurements, tmp_path):
+    index = SpectralIndex(np.arange(360, 880, 4.0), ncomponents=3)
+    index.add(measurements)
+
+    # a measurement is its own nearest neighbor
+    label, distance = index.query(measurements[2], k=1)[0]
+    assert label == measurements[2].sample_name
+    assert distance == pytest.approx(0, abs=1e-6)
+
+    neighbors = index.query("TF000001", k=3)
+    assert "TF000001" not in [label for label, _ in neighbors]
+    assert [dd for _, dd in neighbors] == sorted(dd for _, dd in neighbors)
+
+    fname = str(tmp_path / "index.npz")
+    index.save(fname)
+    loaded = SpectralIndex.load(fname)
+    assert loaded.query("TF000001", k=3) == neighbors
+
+
+def test_spectral_index_rejects_bad_input_without_changes(measurements):
+    index = SpectralIndex(np.arange(360, 880, 4.0), ncomponents=3)
+
+    with pytest.raises(ValueError):
+        index.add(measurements[:2])
+    assert len(index) == 0 and index._components is None
+
+    with pytest.raises(ValueError):
+        index.add(measurements, labels=["only one"])
+    assert len(index) == 0 and index._components is None
+
+
+def test_spectral_index_replaces_existing_labels(measurements):
+    index = SpectralIndex(np.arange(360, 880, 4.0))
+    index.add(measurements)
+    nentries = len(index)
+
+    # re-adding a label overwrites its vector instead of appending
+    index.add([measurements[5]], labels=["TF000001"])
+    assert len(index) == nentries == len(index.vectors)
+    assert index.query("TF000001", k=1)[0] == (measurements[5].sample_name, pytest.approx(0, abs=1e-6))
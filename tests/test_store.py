@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Consolidated UV-Vis store: round trip, chunked reads and metadata.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import numpy as np
+import pytest
+
+from conftest import write_tray
+from tksamples.read import (write_uvvis_store, read_uvvis_store, read_uvvis_metadata,
+                            iter_uvvis_store)
+
+#%%
+
+def _assert_same(written, read):
+    assert [mm.sample_name for mm in written] == [mm.sample_name for mm in read]
+    for mwrite, mread in zip(written, read):
+        assert mread.mfid == mwrite.mfid
+        assert mread.sample_mfid == mwrite.sample_mfid
+        assert np.array_equal(mread._wavelengths, mwrite._wavelengths)
+        assert np.array_equal(mread._raw_intensities, mwrite._raw_intensities)
+        assert np.array_equal(mread._blank_intensities, mwrite._blank_intensities)
+        assert np.array_equal(mread._dark_intensities, mwrite._dark_intensities)
+        assert np.allclose(mread.absorbances, mwrite.absorbances, equal_nan=True)
+
+
+def test_store_round_trip(measurements, tmp_path):
+    fname = write_uvvis_store(measurements, str(tmp_path / "store.h5"))
+
+    _assert_same(measurements, read_uvvis_store(fname))
+
+    chunks = list(iter_uvvis_store(fname, chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    _assert_same(measurements, [mm for chunk in chunks for mm in chunk])
+
+    subset = read_uvvis_store(fname, sample_names=["TF000002", "TF000011"])
+    assert [mm.sample_name for mm in subset] == ["TF000002", "TF000011"]
+
+    metadata = read_uvvis_metadata(fname)
+    assert list(metadata["nspots"]) == [3]*4 + [5]*3
+    assert set(metadata["dataset_id"]) == {"ds1", "ds2"}
+
+
+def test_store_rejects_other_files(tmp_path):
+    fname = write_tray(str(tmp_path / "tray.h5"))
+    with pytest.raises(ValueError):
+        read_uvvis_store(fname)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Thumbnail cache: keys, pyramid levels, disk reload and LRU eviction.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import numpy as np
+from PIL import Image
+
+from tksamples.plot.thumbnails import ThumbnailCache, make_thumbnail
+
+#%%
+
+class Well(object):
+    """Image measurement counting how often its full image is decoded."""
+
+    def __init__(self, mfid, seed=0, shape=(300, 400)):
+        self.mfid  = mfid
+        self.nread = 0
+        rng = np.random.default_rng(seed)
+        self._image = Image.fromarray(rng.integers(0, 255, shape + (3,), dtype=np.uint8))
+
+    @property
+    def image(self):
+        self.nread += 1
+        return self._image
+
+
+def test_make_thumbnail_crops_center():
+    array = np.zeros((300, 400), dtype=np.uint8)
+    array[50:250, 100:300] = 255
+    thumb = make_thumbnail(Image.fromarray(array), side=200, size=20)
+    assert thumb.shape == (20, 20)
+    assert thumb.min() == 255
+
+
+def test_cache_keys_and_pyramid():
+    cache = ThumbnailCache()
+    well  = Well("ds1")
+
+    large = cache.get(well, side=200, size=64)
+    assert large.shape == (64, 64, 3)
+    assert cache.get(well, side=200, size=64) is large
+    assert well.nread == 1
+
+    # smaller level derived from the cached one, not from the image
+    small = cache.get(well, side=200, size=16)
+    assert small.shape == (16, 16, 3)
+    assert well.nread == 1
+
+    # a different crop or mode is a different key
+    cache.get(well, side=100, size=16)
+    gray = cache.get(well, side=200, size=16, mode="L")
+    assert gray.shape == (16, 16)
+    assert len(cache) == 4
+
+
+def test_cache_reloads_from_disk(tmp_path):
+    well  = Well("ds1")
+    thumb = ThumbnailCache(cache_dir=str(tmp_path)).get(well, side=200, size=32)
+
+    reloaded = ThumbnailCache(cache_dir=str(tmp_path)).get(well, side=200, size=32)
+    assert np.array_equal(reloaded, thumb)
+    assert well.nread == 1
+
+
+def test_cache_evicts_least_recently_used():
+    nbytes = 32 * 32 * 3
+    cache  = ThumbnailCache(max_bytes=2 * nbytes)
+    wells  = [Well(f"ds{ii}", seed=ii) for ii in range(3)]
+
+    cache.get(wells[0], side=200, size=32)
+    cache.get(wells[1], side=200, size=32)
+    cache.get(wells[0], side=200, size=32)
+    cache.get(wells[2], side=200, size=32)
+
+    assert len(cache) == 2 and cache.nbytes == 2 * nbytes
+    cache.get(wells[0], side=200, size=32)
+    assert wells[0].nread == 1
+    cache.get(wells[1], side=200, size=32)
+    assert wells[1].nread == 2
+
+
+def test_buffer_backed_image_is_not_decoded():
+    from io import BytesIO
+
+    rng    = np.random.default_rng(0)
+    buffer = BytesIO()
+    Image.fromarray(rng.integers(0, 255, (800, 1000, 3), dtype=np.uint8)).save(buffer, "JPEG")
+    buffer.seek(0)
+    image = Image.open(buffer)
+
+    thumb = make_thumbnail(image, side=800, size=50)
+    assert thumb.shape == (50, 50, 3)
+
+    # the measurement image keeps only the encoded bytes
+    assert image.fp is buffer
+
+    # reduced decode gives the same thumbnail as a full decode
+    full = make_thumbnail(Image.fromarray(np.asarray(Image.open(BytesIO(buffer.getvalue())))),
+                          side=800, size=50)
+    assert np.abs(thumb.astype(float) - full).mean() < 10
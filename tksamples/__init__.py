@@ -15,9 +15,10 @@ from .crucible import get_crucible_api_key, create_config_file, get_config_file_
 from .sample import Sample
 from .collection import SampleCollection
 from .samples import Samples
+from .exclusions import ExclusionRegistry
 
 # Data reading and measurements
-from .measurements import Measurement, NirvanaUVVis, TFImage
+from .measurements import Measurement, NirvanaUVVis, TFImage, SpectraCube
 
 # Genealogy module (import as submodule)
 from . import graph
@@ -29,9 +30,11 @@ __all__ = [
     "Sample",
     "SampleCollection",
     "Samples",
+    "ExclusionRegistry",
     "Measurement",
     "NirvanaUVVis",
     "TFImage",
+    "SpectraCube",
     "get_crucible_api_key",
     "create_config_file",
     "get_config_file_path",
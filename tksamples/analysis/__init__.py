@@ -0,0 +1,16 @@
+"""
+Analysis module for tksamples
+
+Contains collection-wide spectral analysis tools, such as resampling of
+spectra onto a common wavelength grid, band gap estimation, spectral
+similarity search, out-of-core PCA and quality control of UV-Vis datasets.
+"""
+
+from .resample import SpectralResampler
+from .bandgap import tauc_band_gap, get_band_gaps
+from .similarity import SpectralIndex
+from .pca import IncrementalPCA
+from .qc import UVVisQC, RunningStats
+
+__all__ = ["SpectralResampler", "tauc_band_gap", "get_band_gaps", "SpectralIndex",
+           "IncrementalPCA", "UVVisQC", "RunningStats"]
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Band Gap: Batched Tauc Analysis
+
+Estimates optical band gaps from absorbance spectra with Tauc plots. The
+absorption edge of every spectrum is fitted at once with rolling linear
+regressions computed from cumulative sums, so thousands of spectra are
+processed without Python loops.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+# Planck constant times speed of light [eV nm]
+HC_EV_NM = 1239.841984
+
+# Tauc exponents (1/r) for each transition type
+tauc_exponents = {
+    "direct"              : 2.0,
+    "indirect"            : 0.5,
+    "direct_forbidden"    : 2.0/3.0,
+    "indirect_forbidden"  : 1.0/3.0,
+    }
+
+bandgap_dtype = np.dtype([
+    ("sample_name", "U32"),
+    ("dataset_id",  "U64"),
+    ("spot",        np.int32),
+    ("band_gap",    float),
+    ("slope",       float),
+    ("r2",          float),
+    ])
+
+
+def _rolling_sums(values, window):
+    """Sum of `values` over all windows along the last axis."""
+    csum = np.cumsum(values, axis=-1)
+    sums = csum[..., window-1:].copy()
+    sums[..., 1:] -= csum[..., :-window]
+    return sums
+
+
+def tauc_band_gap(wavelengths, absorbances, transition="direct", window=15,
+                  min_r2=0.95, energy_range=None, chunk_size=2048):
+    """
+    Estimate band gaps of many spectra from their Tauc plots.
+
+    For each spectrum, (A*E)^(1/r) is fitted with a line over every window of
+    `window` consecutive points; the steepest window with r^2 >= `min_r2` is
+    taken as the absorption edge and its intercept with the energy axis is
+    the band gap.
+
+    Parameters
+    ----------
+    wavelengths : array_like
+        Wavelength grid [nm], shared by all spectra
+    absorbances : np.ndarray
+        (nspectra, nwavelengths) absorbance spectra
+    transition : str, optional
+        "direct", "indirect", "direct_forbidden" or "indirect_forbidden".
+        Default is "direct".
+    window : int, optional
+        Number of points of each linear fit. Default is 15.
+    min_r2 : float, optional
+        Minimum coefficient of determination of an accepted fit. Default 0.95.
+    energy_range : tuple, optional
+        (min, max) photon energy [eV] to search for the edge
+    chunk_size : int, optional
+        Number of spectra processed at once. Default is 2048.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (band gaps [eV], slopes, r^2) for each spectrum, NaN where no
+        acceptable fit was found
+    """
+    if transition not in tauc_exponents:
+        raise ValueError(f"Unknown transition '{transition}', use one of {list(tauc_exponents)}")
+
+    # photon energy, computed once and sorted increasing
+    energies = HC_EV_NM / np.asarray(wavelengths, dtype=float)
+    order    = np.argsort(energies)
+    energies = energies[order]
+
+    absorbances = np.atleast_2d(absorbances)[:, order]
+
+    if energy_range is not None:
+        emask = (energies >= energy_range[0]) & (energies <= energy_range[1])
+        energies    = energies[emask]
+        absorbances = absorbances[:, emask]
+
+    if len(energies) < window:
+        raise ValueError(f"Need at least {window} points to fit the absorption edge.")
+
+    nspectra  = len(absorbances)
+    band_gaps = np.full(nspectra, np.nan)
+    slopes    = np.full(nspectra, np.nan)
+    r2s       = np.full(nspectra, np.nan)
+
+    # window sums depending on energy only
+    sx  = _rolling_sums(energies, window)
+    sxx = _rolling_sums(energies**2, window)
+
+    exponent = tauc_exponents[transition]
+
+    for start in range(0, nspectra, chunk_size):
+        chunk = slice(start, start + chunk_size)
+
+        # Tauc ordinate, invalid points are excluded from the sums
+        with np.errstate(invalid="ignore", over="ignore"):
+            tauc = np.clip(absorbances[chunk], 0, None) * energies
+            tauc **= exponent
+        valid = np.isfinite(tauc)
+        tauc[~valid] = 0
+
+        npts = _rolling_sums(valid.astype(float), window)
+        sy   = _rolling_sums(tauc, window)
+        sxy  = _rolling_sums(tauc * energies, window)
+        syy  = _rolling_sums(tauc**2, window)
+
+        # least squares on complete windows only
+        with np.errstate(invalid="ignore", divide="ignore"):
+            n     = float(window)
+            cov   = sxy - sx*sy/n
+            varx  = sxx - sx**2/n
+            vary  = syy - sy**2/n
+            slope = cov / varx
+            r2    = cov**2 / (varx*vary)
+            xmean = sx / n
+            ymean = sy / n
+
+        good = (npts == window) & (slope > 0) & (r2 >= min_r2)
+        if not good.any():
+            continue
+
+        # steepest acceptable window of each spectrum
+        score = np.where(good, slope, -np.inf)
+        best  = np.argmax(score, axis=-1)
+        rows  = np.arange(len(best))
+        found = good[rows, best]
+
+        bslope = slope[rows, best]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bgap = xmean[best] - ymean[rows, best]/bslope
+
+        band_gaps[chunk] = np.where(found, bgap, np.nan)
+        slopes[chunk]    = np.where(found, bslope, np.nan)
+        r2s[chunk]       = np.where(found, r2[rows, best], np.nan)
+
+    return band_gaps, slopes, r2s
+
+
+def get_band_gaps(measurements, **kwargs):
+    """
+    Estimate band gaps for every spot of many NirvanaUVVis measurements.
+
+    Measurements sharing a wavelength grid are fitted together; rows follow
+    the order of the measurements.
+
+    Parameters
+    ----------
+    measurements : list of NirvanaUVVis
+        The measurements (their current energy range is used)
+    **kwargs
+        Passed to `tauc_band_gap`
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with fields sample_name, dataset_id, spot,
+        band_gap [eV], slope and r2, one row per spot
+    """
+    measurements = list(measurements)
+
+    # rows of each measurement in the table
+    nspots  = np.array([mm.nspots for mm in measurements], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(nspots)])
+
+    table = np.zeros(offsets[-1], dtype=bandgap_dtype)
+    table["sample_name"] = np.repeat([mm.sample_name for mm in measurements], nspots)
+    table["dataset_id"]  = np.repeat([mm.mfid for mm in measurements], nspots)
+    table["spot"]        = np.arange(offsets[-1]) - np.repeat(offsets[:-1], nspots)
+
+    if not measurements:
+        return table
+
+    # group measurements by wavelength grid
+    groups = {}
+    for cc, measurement in enumerate(measurements):
+        wavelengths = np.ascontiguousarray(measurement.wavelengths, dtype=float)
+        key = (len(wavelengths), wavelengths.tobytes())
+        groups.setdefault(key, (wavelengths, []))[1].append(cc)
+
+    for wavelengths, group in groups.values():
+
+        absorbances = np.concatenate([measurements[cc].absorbances for cc in group])
+        band_gaps, slopes, r2s = tauc_band_gap(wavelengths, absorbances, **kwargs)
+
+        rows = np.concatenate([np.arange(offsets[cc], offsets[cc+1]) for cc in group])
+        table["band_gap"][rows] = band_gaps
+        table["slope"][rows]    = slopes
+        table["r2"][rows]       = r2s
+
+    logger.info(f"Fitted {len(table)} spectra, {np.isfinite(table['band_gap']).sum()} band gaps found")
+
+    return table
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PCA: Out-of-Core Principal Component Analysis of Spectra
+
+Incremental PCA that streams spectra in chunks from a consolidated UV-Vis
+store, cached H5 files or loaded measurements, accumulating the mean and
+scatter matrix so that the full archive never needs to be in memory.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import os
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# internal modules
+from tksamples.analysis.resample import SpectralResampler
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+def _iter_measurements(source, chunk_size=256):
+    """
+    Iterate over chunks of NirvanaUVVis measurements from a source.
+
+    Parameters
+    ----------
+    source : str or list
+        Path of a consolidated UV-Vis store, list of cached H5 files (paths,
+        or (dataset, path) pairs), or list of NirvanaUVVis measurements
+    chunk_size : int, optional
+        Number of measurements (stores and measurement lists) per chunk
+
+    Yields
+    ------
+    list of NirvanaUVVis
+    """
+    # avoid circular import
+    from tksamples.read import h5_to_samples, iter_uvvis_store
+
+    if isinstance(source, str):
+        yield from iter_uvvis_store(source, chunk_size=chunk_size)
+        return
+
+    source = list(source)
+    if not source:
+        return
+
+    # already loaded measurements
+    if not isinstance(source[0], (str, tuple)):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+        return
+
+    # cached H5 files, one tray per chunk
+    for entry in source:
+        if isinstance(entry, tuple):
+            dataset, h5filename = entry
+        else:
+            h5filename = entry
+            dataset_id = os.path.splitext(os.path.basename(h5filename))[0]
+            dataset = {"unique_id": dataset_id}
+        try:
+            yield h5_to_samples(dataset, h5filename)
+        except ValueError:
+            logger.warning(f"Cannot read {h5filename}, skipping")
+
+
+class IncrementalPCA(object):
+    """
+    Out-of-core PCA of UV-Vis spectra.
+
+    Every spot is one observation. Spectra are resampled on a common grid
+    and streamed in chunks: `partial_fit` merges the chunk mean and scatter
+    matrix into running totals, and the components are obtained from the
+    resulting covariance matrix. Spectra with non-finite values (e.g.
+    outside the source wavelength range) are skipped.
+
+    Parameters
+    ----------
+    ncomponents : int
+        Number of principal components
+    wavelengths : array_like
+        Common wavelength grid
+    value : str, optional
+        NirvanaUVVis property analyzed. Default is "absorbances".
+
+    Examples
+    --------
+    >>> pca = IncrementalPCA(10, np.arange(400, 850, 2.0))
+    >>> pca.fit("project_uvvis.h5")
+    >>> names, spots, scores = pca.transform_source("project_uvvis.h5")
+    """
+
+    def __init__(self, ncomponents, wavelengths, value="absorbances"):
+
+        self._ncomponents = ncomponents
+        self._resampler   = SpectralResampler(wavelengths)
+        self._value       = value
+
+        # running aggregates
+        nwl = self._resampler.nwl
+        self._nsamples = 0
+        self._mean     = np.zeros(nwl)
+        self._scatter  = np.zeros((nwl, nwl))
+
+        # results
+        self._components = None
+        self._explained_variance = None
+        self._total_variance = None
+
+        return
+
+    @property
+    def wavelengths(self):
+        return self._resampler.wavelengths
+
+    @property
+    def nsamples(self):
+        """Number of spectra seen so far."""
+        return self._nsamples
+
+    @property
+    def mean(self):
+        return self._mean
+
+    @property
+    def components(self):
+        """(ncomponents, nwavelengths) component loadings."""
+        if self._components is None:
+            self._finalize()
+        return self._components
+
+    @property
+    def explained_variance(self):
+        if self._explained_variance is None:
+            self._finalize()
+        return self._explained_variance
+
+    @property
+    def explained_variance_ratio(self):
+        return self.explained_variance / self._total_variance
+
+    def _spectra(self, measurements):
+        """Stack the per-spot spectra of measurements on the common grid."""
+        resampled = self._resampler.resample_measurements(measurements, value=self._value)
+        return np.concatenate(resampled) if resampled else np.zeros((0, self._resampler.nwl))
+
+    def partial_fit(self, spectra):
+        """
+        Update the running mean and scatter matrix with a chunk of spectra.
+
+        Parameters
+        ----------
+        spectra : np.ndarray
+            (n, nwavelengths) spectra on the common grid
+        """
+        spectra = np.atleast_2d(spectra)
+        spectra = spectra[np.isfinite(spectra).all(axis=1)]
+        nchunk = len(spectra)
+        if nchunk == 0:
+            return
+
+        chunk_mean = spectra.mean(axis=0)
+        centered   = spectra - chunk_mean
+
+        # combine with running totals (Chan et al. parallel update)
+        ntotal = self._nsamples + nchunk
+        delta  = chunk_mean - self._mean
+        self._scatter += centered.T @ centered
+        self._scatter += np.outer(delta, delta) * (self._nsamples * nchunk / ntotal)
+        self._mean    += delta * (nchunk / ntotal)
+        self._nsamples = ntotal
+
+        # invalidate previous results
+        self._components = None
+        self._explained_variance = None
+
+        return
+
+    def fit(self, source, chunk_size=256):
+        """
+        Fit the PCA by streaming spectra from a source.
+
+        Parameters
+        ----------
+        source : str or list
+            Consolidated store path, list of cached H5 files or list of
+            NirvanaUVVis measurements
+        chunk_size : int, optional
+            Number of measurements per chunk. Default is 256.
+
+        Returns
+        -------
+        IncrementalPCA
+            The fitted object
+        """
+        for measurements in _iter_measurements(source, chunk_size=chunk_size):
+            self.partial_fit(self._spectra(measurements))
+
+        logger.info(f"Fitted PCA on {self._nsamples} spectra")
+
+        return self
+
+    def _finalize(self):
+        if self._nsamples < 2:
+            raise ValueError("At least two spectra are required to fit the PCA.")
+
+        covariance = self._scatter / (self._nsamples - 1)
+        eigvals, eigvecs = np.linalg.eigh(covariance)
+
+        # largest components first
+        order = np.argsort(eigvals)[::-1][:self._ncomponents]
+        self._explained_variance = np.clip(eigvals[order], 0, None)
+        self._components = eigvecs[:, order].T
+        self._total_variance = np.trace(covariance)
+
+        return
+
+    def transform(self, spectra):
+        """
+        Project spectra on the principal components.
+
+        Parameters
+        ----------
+        spectra : np.ndarray
+            (n, nwavelengths) spectra on the common grid
+
+        Returns
+        -------
+        np.ndarray
+            (n, ncomponents) scores, NaN for spectra with non-finite values
+        """
+        spectra = np.atleast_2d(spectra)
+        scores  = (np.nan_to_num(spectra) - self._mean) @ self.components.T
+        scores[~np.isfinite(spectra).all(axis=1)] = np.nan
+        return scores
+
+    def transform_source(self, source, chunk_size=256):
+        """
+        Compute per-spot scores by streaming spectra from a source.
+
+        Parameters
+        ----------
+        source : str or list
+            Consolidated store path, list of cached H5 files or list of
+            NirvanaUVVis measurements
+        chunk_size : int, optional
+            Number of measurements per chunk. Default is 256.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            (sample names, spot indices, (nspectra, ncomponents) scores)
+        """
+        names, spots, scores = [], [], []
+        for measurements in _iter_measurements(source, chunk_size=chunk_size):
+            if not measurements:
+                continue
+            names.extend(name for mm in measurements for name in [mm.sample_name]*mm.nspots)
+            spots.extend(spot for mm in measurements for spot in range(mm.nspots))
+            scores.append(self.transform(self._spectra(measurements)))
+
+        scores = np.concatenate(scores) if scores else np.zeros((0, self._ncomponents))
+
+        return np.array(names, dtype=str), np.array(spots, dtype=int), scores
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._ncomponents} components, {self._nsamples} spectra)"
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+QC: Streaming Quality Control of UV-Vis Datasets
+
+Computes per-spot statistics (saturation, negative corrected intensity,
+non-finite absorbances) and blank/dark drift across the positions of each
+tray while the data are ingested, keeping running aggregates, and flags
+suspect datasets (above fixed limits or outliers of the running
+aggregates) so that they can be excluded automatically.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+qc_dtype = np.dtype([
+    ("dataset_id",   "U64"),
+    ("dataset_name", "U128"),
+    ("npositions",   np.int32),
+    ("nspots",       np.int32),
+    ("saturated",    float),
+    ("negative",     float),
+    ("nonfinite",    float),
+    ("blank_drift",  float),
+    ("dark_drift",   float),
+    ("flagged",      bool),
+    ])
+
+
+class RunningStats(object):
+    """Running count, mean, variance, min and max (Welford's algorithm)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean  = 0.0
+        self._m2   = 0.0
+        self.min   = np.inf
+        self.max   = -np.inf
+        return
+
+    def update(self, values):
+        """Add a batch of values."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        nnew = len(values)
+        if nnew == 0:
+            return
+
+        new_mean = values.mean()
+        new_m2   = ((values - new_mean)**2).sum()
+
+        ntotal = self.count + nnew
+        delta  = new_mean - self.mean
+        self._m2  += new_m2 + delta**2 * self.count * nnew / ntotal
+        self.mean += delta * nnew / ntotal
+        self.count = ntotal
+
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        return
+
+    @property
+    def var(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(n={self.count}, mean={self.mean:.4g}, std={self.std:.4g})"
+
+
+class UVVisQC(object):
+    """
+    Streaming quality control of UV-Vis datasets.
+
+    Each dataset (tray) is checked as soon as it is parsed: the fractions of
+    saturated raw points, of negative dark-corrected points and of
+    non-finite absorbances are computed over all spots, and the drift of the
+    blank and dark references across positions is the relative standard
+    deviation of their mean intensities.
+
+    A dataset is flagged if any metric exceeds its fixed limit, or, once
+    `min_datasets` datasets have passed, if it lies more than `nsigma`
+    standard deviations above the running mean of that metric over the
+    datasets that passed so far (flagged datasets do not update the running
+    aggregates, so outliers do not widen the thresholds). Project-wide
+    running statistics of the per-spot metrics are kept in `stats`, those
+    of the per-dataset metrics in `dataset_stats`.
+
+    Parameters
+    ----------
+    saturation : float, optional
+        Raw intensity at which the detector saturates. Default is 65000
+        (16-bit spectrometers).
+    max_saturated : float, optional
+        Maximum fraction of saturated raw points. Default is 0.01.
+    max_negative : float, optional
+        Maximum fraction of negative dark-corrected points. Default is 0.05.
+    max_nonfinite : float, optional
+        Maximum fraction of NaN/inf absorbances. Default is 0.05.
+    max_drift : float, optional
+        Maximum relative drift of blank and dark across positions. Default 0.1.
+    nsigma : float, optional
+        Number of running standard deviations above the running mean at
+        which a dataset is an outlier. Default is 4.
+    min_datasets : int, optional
+        Number of passing datasets needed before outliers are flagged.
+        Default is 10.
+    exclude : bool, optional
+        Whether flagged datasets should be excluded from ingestion. Default True.
+
+    Examples
+    --------
+    >>> qc = UVVisQC(max_drift=0.05)
+    >>> thin_films.get_uvvis_data(qc=qc)
+    >>> qc.flagged
+    {'0tdm1...'}
+    """
+
+    # per-dataset metric -> label used in the flag reasons
+    _labels = {
+        "saturated"   : "saturated",
+        "negative"    : "negative corrected",
+        "nonfinite"   : "non-finite absorbance",
+        "blank_drift" : "blank drift",
+        "dark_drift"  : "dark drift",
+        }
+
+    def __init__(self, saturation=65000., max_saturated=0.01, max_negative=0.05,
+                 max_nonfinite=0.05, max_drift=0.1, nsigma=4., min_datasets=10,
+                 exclude=True):
+
+        self.saturation    = saturation
+        self.max_saturated = max_saturated
+        self.max_negative  = max_negative
+        self.max_nonfinite = max_nonfinite
+        self.max_drift     = max_drift
+        self.nsigma        = nsigma
+        self.min_datasets  = min_datasets
+        self.exclude       = exclude
+
+        # running per-spot statistics over all datasets
+        self.stats = {key: RunningStats() for key in ["saturated", "negative", "nonfinite"]}
+
+        # running per-dataset statistics over the datasets that passed
+        self.dataset_stats = {key: RunningStats() for key in self._labels}
+
+        # per-dataset results
+        self._records = []
+        self._flagged = {}
+
+        return
+
+    def limits(self):
+        """
+        Current flagging threshold of every per-dataset metric.
+
+        Returns
+        -------
+        dict
+            metric -> threshold: the fixed limit, lowered to the running
+            mean + nsigma * std once enough datasets passed
+        """
+        fixed = {
+            "saturated"   : self.max_saturated,
+            "negative"    : self.max_negative,
+            "nonfinite"   : self.max_nonfinite,
+            "blank_drift" : self.max_drift,
+            "dark_drift"  : self.max_drift,
+            }
+
+        limits = {}
+        for key, limit in fixed.items():
+            stats = self.dataset_stats[key]
+            # outlier threshold once the passing datasets show some spread
+            if stats.count >= self.min_datasets and stats.std > 0:
+                limit = min(limit, stats.mean + self.nsigma * stats.std)
+            limits[key] = limit
+        return limits
+
+    @property
+    def flagged(self):
+        """Set of flagged dataset IDs."""
+        return set(self._flagged)
+
+    @property
+    def ndatasets(self):
+        return len(self._records)
+
+    def is_flagged(self, dataset_id):
+        return dataset_id in self._flagged
+
+    def check(self, dataset, measurements):
+        """
+        Check the measurements of one dataset and update running statistics.
+
+        Parameters
+        ----------
+        dataset : dict
+            Crucible dataset information
+        measurements : list of NirvanaUVVis
+            Measurements parsed from the dataset
+
+        Returns
+        -------
+        bool
+            True if the dataset passes, False if it is flagged
+        """
+        if not isinstance(measurements, list):
+            measurements = [measurements]
+
+        record = np.zeros((), dtype=qc_dtype)
+        record["dataset_id"]   = dataset.get("unique_id", "")
+        record["dataset_name"] = dataset.get("dataset_name", "")
+        record["npositions"]   = len(measurements)
+
+        if not measurements:
+            self._records.append(record)
+            return True
+
+        # per-spot fractions
+        saturated, negative, nonfinite = [], [], []
+        blank_means, dark_means = [], []
+        for measurement in measurements:
+            raw  = measurement._raw_intensities
+            dark = measurement._dark_intensities
+
+            saturated.append((raw >= self.saturation).mean(axis=1))
+            negative.append((raw < dark).mean(axis=1))
+            nonfinite.append((~np.isfinite(measurement._absorbances)).mean(axis=1))
+
+            blank_means.append(np.mean(measurement._blank_intensities))
+            dark_means.append(np.mean(dark))
+
+        metrics = {
+            "saturated" : np.concatenate(saturated),
+            "negative"  : np.concatenate(negative),
+            "nonfinite" : np.concatenate(nonfinite),
+            }
+        for key, values in metrics.items():
+            self.stats[key].update(values)
+            record[key] = values.mean()
+
+        record["nspots"]      = len(metrics["saturated"])
+        record["blank_drift"] = _relative_std(blank_means)
+        record["dark_drift"]  = _relative_std(dark_means)
+
+        reasons = []
+        for key, limit in self.limits().items():
+            if record[key] > limit:
+                reasons.append(f"{self._labels[key]} {record[key]:.1%} > {limit:.1%}")
+
+        record["flagged"] = bool(reasons)
+        self._records.append(record)
+
+        # only datasets that pass define what is normal
+        if not reasons:
+            for key in self._labels:
+                self.dataset_stats[key].update(record[key])
+
+        if reasons:
+            self._flagged[str(record["dataset_id"])] = reasons
+            logger.warning(f"QC flagged dataset {record['dataset_name']}: {', '.join(reasons)}")
+
+        return not reasons
+
+    def reasons(self, dataset_id):
+        """Get the reasons a dataset was flagged."""
+        return self._flagged.get(dataset_id, [])
+
+    def report(self):
+        """
+        Get the QC results of all checked datasets.
+
+        Returns
+        -------
+        np.ndarray
+            Structured array with one row per dataset
+        """
+        return np.array(self._records, dtype=qc_dtype)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.ndatasets} datasets, {len(self._flagged)} flagged)"
+
+
+def _relative_std(values):
+    values = np.asarray(values, dtype=float)
+    mean = np.abs(values.mean())
+    if len(values) < 2 or mean == 0:
+        return 0.0
+    return values.std() / mean
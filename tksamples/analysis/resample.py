@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Resample: Common-Grid Spectral Resampling
+
+Linear interpolation of UV-Vis spectra onto a common wavelength grid, with
+interpolation weights computed once per source grid and reused for all
+spectra sharing it.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+class SpectralResampler(object):
+    """
+    Resample spectra onto a common wavelength grid.
+
+    Parameters
+    ----------
+    wavelengths : array_like
+        Target wavelength grid (increasing)
+
+    Examples
+    --------
+    >>> grid = np.arange(350, 850, 1.0)
+    >>> resampler = SpectralResampler(grid)
+    >>> spectra = resampler.resample_measurements(samples.get_measurements("uvvis"))
+    """
+
+    def __init__(self, wavelengths):
+
+        self._wavelengths = np.asarray(wavelengths, dtype=float)
+        if self._wavelengths.ndim != 1 or np.any(np.diff(self._wavelengths) <= 0):
+            raise ValueError("Target wavelengths must be a 1D increasing array.")
+
+        # interpolation weights per source grid
+        self._weights = {}
+
+        return
+
+    @property
+    def wavelengths(self):
+        return self._wavelengths
+
+    @property
+    def nwl(self):
+        return len(self._wavelengths)
+
+    @staticmethod
+    def _grid_key(source):
+        return (len(source), source.tobytes())
+
+    def weights(self, source):
+        """
+        Get interpolation weights from a source grid to the target grid.
+
+        Parameters
+        ----------
+        source : array_like
+            Source wavelength grid (increasing)
+
+        Returns
+        -------
+        tuple of np.ndarray
+            (left indices, right weights, mask of target points inside the
+            source range)
+        """
+        source = np.ascontiguousarray(source, dtype=float)
+        key = self._grid_key(source)
+
+        if key not in self._weights:
+            target = self._wavelengths
+
+            # index of the left neighbour of each target point
+            left = np.searchsorted(source, target, side="right") - 1
+            left = np.clip(left, 0, len(source) - 2)
+
+            # weight of the right neighbour
+            span  = source[left+1] - source[left]
+            right = (target - source[left]) / span
+
+            inside = (target >= source[0]) & (target <= source[-1])
+
+            self._weights[key] = (left, right, inside)
+
+        return self._weights[key]
+
+    def resample(self, values, source):
+        """
+        Resample values defined on a source grid onto the target grid.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Array whose last axis matches the source grid
+        source : array_like
+            Source wavelength grid
+
+        Returns
+        -------
+        np.ndarray
+            Array whose last axis matches the target grid, NaN outside the
+            source range
+        """
+        left, right, inside = self.weights(source)
+
+        resampled = values[..., left] * (1 - right)
+        resampled += values[..., left+1] * right
+        resampled[..., ~inside] = np.nan
+
+        return resampled
+
+    def resample_uvvis(self, uvvis, value="absorbances"):
+        """
+        Resample a property of a NirvanaUVVis measurement.
+
+        Parameters
+        ----------
+        uvvis : NirvanaUVVis
+            The measurement (its current energy range is used)
+        value : str, optional
+            Property to resample. Default is "absorbances".
+
+        Returns
+        -------
+        np.ndarray
+            (spots, wavelengths) array on the target grid
+        """
+        return self.resample(getattr(uvvis, value), uvvis.wavelengths)
+
+    def resample_measurements(self, measurements, value="absorbances"):
+        """
+        Resample a property of many NirvanaUVVis measurements in batch.
+
+        Spectra sharing a source grid are stacked and resampled together.
+
+        Parameters
+        ----------
+        measurements : list of NirvanaUVVis
+            The measurements
+        value : str, optional
+            Property to resample. Default is "absorbances".
+
+        Returns
+        -------
+        list of np.ndarray
+            One (spots, wavelengths) array per measurement, in input order
+        """
+        measurements = list(measurements)
+
+        # group measurements by source grid
+        groups = {}
+        for cc, measurement in enumerate(measurements):
+            source = np.ascontiguousarray(measurement.wavelengths, dtype=float)
+            key = self._grid_key(source)
+            groups.setdefault(key, (source, []))[1].append(cc)
+
+        resampled = [None] * len(measurements)
+        for source, indices in groups.values():
+
+            stacked = [getattr(measurements[cc], value) for cc in indices]
+            offsets = np.cumsum([0] + [len(values) for values in stacked])
+
+            values = self.resample(np.concatenate(stacked), source)
+
+            for cc, start, stop in zip(indices, offsets[:-1], offsets[1:]):
+                resampled[cc] = values[start:stop]
+
+        logger.debug(f"Resampled {len(measurements)} measurements from {len(groups)} grids")
+
+        return resampled
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._wavelengths[0]:.1f}-{self._wavelengths[-1]:.1f} nm, {self.nwl} points)"
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Similarity: Spectral Nearest-Neighbor Search
+
+Index of normalized (optionally PCA-reduced) spectra of a collection that
+answers "which samples have the most similar spectra" queries, with build,
+incremental add, persistence and k-NN query operations.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# internal modules
+from tksamples.analysis.resample import SpectralResampler
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+class SpectralIndex(object):
+    """
+    Nearest-neighbor index over normalized spectra.
+
+    Each sample is represented by its spot-averaged spectrum resampled onto
+    the index grid, mean-centered and scaled to unit norm, so that the
+    Euclidean distance between two entries is sqrt(2*(1 - r)) with r the
+    Pearson correlation of the spectra. Vectors are optionally projected on
+    the first principal components of the spectra the index was built with.
+
+    Parameters
+    ----------
+    wavelengths : array_like
+        Wavelength grid of the index
+    value : str, optional
+        NirvanaUVVis property indexed. Default is "absorbances".
+    ncomponents : int, optional
+        Number of principal components kept. Default keeps the full spectra.
+
+    Examples
+    --------
+    >>> index = thin_films.build_similarity_index(ncomponents=20)
+    >>> index.query("TF000123", k=5)
+    [('TF004567', 0.031), ...]
+    >>> index.save("tf_index.npz")
+    """
+
+    def __init__(self, wavelengths, value="absorbances", ncomponents=None):
+
+        self._resampler   = SpectralResampler(wavelengths)
+        self._value       = value
+        self._ncomponents = ncomponents
+
+        # PCA basis (set at the first add when ncomponents is given)
+        self._mean       = None
+        self._components = None
+
+        # indexed vectors and their labels
+        self._vectors = np.zeros((0, ncomponents or self._resampler.nwl))
+        self._labels  = []
+        self._index_by_label = {}
+
+        return
+
+    @property
+    def wavelengths(self):
+        return self._resampler.wavelengths
+
+    @property
+    def labels(self):
+        return list(self._labels)
+
+    @property
+    def vectors(self):
+        return self._vectors
+
+    def __len__(self):
+        return len(self._labels)
+
+    def _spectra(self, measurements):
+        """Spot-averaged spectra of measurements on the index grid."""
+        resampled = self._resampler.resample_measurements(measurements, value=self._value)
+        with np.errstate(invalid="ignore"):
+            spectra = np.array([np.nanmean(values, axis=0) for values in resampled])
+        return spectra
+
+    @staticmethod
+    def _normalize(vectors):
+        vectors = np.nan_to_num(vectors, nan=0.0, posinf=0.0, neginf=0.0)
+        vectors = vectors - vectors.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def _fit_components(self, spectra):
+        """PCA basis (mean, components) of normalized spectra, without setting it."""
+        mean = spectra.mean(axis=0)
+        _, _, vt = np.linalg.svd(spectra - mean, full_matrices=False)
+        components = vt[:self._ncomponents]
+        if len(components) < self._ncomponents:
+            raise ValueError(f"Cannot fit {self._ncomponents} components on {len(spectra)} spectra.")
+        return mean, components
+
+    def transform(self, spectra):
+        """
+        Map spectra on the index grid to index vectors.
+
+        Parameters
+        ----------
+        spectra : np.ndarray
+            (n, nwavelengths) spectra on the index grid
+
+        Returns
+        -------
+        np.ndarray
+            (n, ndim) index vectors
+        """
+        vectors = self._normalize(np.atleast_2d(spectra))
+        if self._components is not None:
+            vectors = self._normalize((vectors - self._mean) @ self._components.T)
+        return vectors
+
+    def add(self, measurements, labels=None):
+        """
+        Add measurements to the index.
+
+        Entries whose label is already indexed are replaced. The index is
+        left unchanged if the input is invalid.
+
+        Parameters
+        ----------
+        measurements : list of NirvanaUVVis
+            Measurements to add
+        labels : list of str, optional
+            Labels of the entries. Defaults to the sample names.
+        """
+        measurements = list(measurements)
+        if not measurements:
+            return
+
+        if labels is None:
+            labels = [measurement.sample_name for measurement in measurements]
+        labels = list(labels)
+        if len(labels) != len(measurements):
+            raise ValueError(f"Got {len(labels)} labels for {len(measurements)} measurements.")
+
+        # fit the PCA basis with the first batch of spectra
+        spectra = self._normalize(self._spectra(measurements))
+        mean, components = self._mean, self._components
+        if self._ncomponents is not None and components is None:
+            mean, components = self._fit_components(spectra)
+
+        if components is not None:
+            vectors = self._normalize((spectra - mean) @ components.T)
+        else:
+            vectors = spectra
+
+        # everything is valid: update the index
+        self._mean, self._components = mean, components
+
+        # replace entries already indexed, append the others (last one wins)
+        new = {}
+        for label, vector in zip(labels, vectors):
+            if label in self._index_by_label:
+                self._vectors[self._index_by_label[label]] = vector
+            else:
+                new[label] = vector
+
+        for label in new:
+            self._index_by_label[label] = len(self._labels)
+            self._labels.append(label)
+        if new:
+            self._vectors = np.concatenate([self._vectors, np.array(list(new.values()))])
+
+        logger.debug(f"Added {len(vectors)} entries to the spectral index ({len(self)} total)")
+
+        return
+
+    def query(self, query, k=10):
+        """
+        Find the k entries most similar to a query.
+
+        Parameters
+        ----------
+        query : str, NirvanaUVVis or np.ndarray
+            Label of an indexed entry (excluded from the results), a
+            measurement, or a spectrum on the index grid
+        k : int, optional
+            Number of neighbors. Default is 10.
+
+        Returns
+        -------
+        list of tuple
+            (label, distance) pairs, closest first
+        """
+        exclude = None
+        if isinstance(query, str):
+            try:
+                exclude = self._index_by_label[query]
+            except KeyError:
+                raise KeyError(f"'{query}' not in spectral index.")
+            vector = self._vectors[exclude]
+        elif isinstance(query, np.ndarray):
+            vector = self.transform(query)[0]
+        else:
+            vector = self.transform(self._spectra([query]))[0]
+
+        # unit vectors: squared distance = 2 - 2*dot
+        dist2 = 2 - 2*(self._vectors @ vector)
+        if exclude is not None:
+            dist2[exclude] = np.inf
+
+        k = min(k, len(self) - (exclude is not None))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(dist2, k-1)[:k]
+        nearest = nearest[np.argsort(dist2[nearest])]
+
+        distances = np.sqrt(np.clip(dist2[nearest], 0, None))
+
+        return [(self._labels[ii], float(dd)) for ii, dd in zip(nearest, distances)]
+
+    def save(self, filename):
+        """Save the index to a .npz file."""
+        np.savez(filename,
+                 wavelengths=self.wavelengths,
+                 value=self._value,
+                 ncomponents=-1 if self._ncomponents is None else self._ncomponents,
+                 mean=np.zeros(0) if self._mean is None else self._mean,
+                 components=np.zeros((0, 0)) if self._components is None else self._components,
+                 vectors=self._vectors,
+                 labels=np.array(self._labels, dtype=str))
+        return
+
+    @classmethod
+    def load(cls, filename):
+        """Load an index saved with `save`."""
+        with np.load(filename) as data:
+            ncomponents = int(data["ncomponents"])
+            index = cls(data["wavelengths"], value=str(data["value"]),
+                        ncomponents=None if ncomponents < 0 else ncomponents)
+            if ncomponents >= 0:
+                index._mean       = data["mean"]
+                index._components = data["components"]
+            index._vectors = data["vectors"]
+            index._labels  = [str(label) for label in data["labels"]]
+        index._index_by_label = {label: cc for cc, label in enumerate(index._labels)}
+        return index
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} entries, {self._vectors.shape[1]} dims)"
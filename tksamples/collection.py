@@ -12,6 +12,7 @@ Created on Thu Feb  6 2026
 
 import logging
 from tksamples.core import CruxObj
+from tksamples.sample import is_more_recent
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
@@ -42,8 +43,11 @@ class SampleCollection(CruxObj):
         super().__init__(mfid="", dtype="main", creation_time="1993-04-01T01:18:00.0000+01:00",
                          project_id=project_id)
 
-        # store samples
-        self._samples = samples if samples is not None else []
+        # store samples (own list, samples can be added later)
+        self._samples = list(samples) if samples is not None else []
+
+        # incremented when samples are added, for caches built from them
+        self._version = 0
 
         # set up internal structure
         self._setup_mapping()
@@ -53,11 +57,96 @@ class SampleCollection(CruxObj):
     def _setup_mapping(self):
         """Create internal mappings for fast sample lookup."""
         # define sample maps for fast lookups
-        self._samples_by_id = {sample.unique_id: sample for sample in self._samples}
-        self._samples_by_name = {sample.sample_name: sample for sample in self._samples}
+        self._samples_by_id = {}
+        self._samples_by_name = {}
+
+        # index measurements by type, kept up to date by Sample.add_measurement
+        self._measurements_by_type = {}
+        self._latest_by_type = {}
+
+        for sample in self._samples:
+            self._map_sample(sample)
+
+        return
+
+    def _map_sample(self, sample):
+        """Add one sample to the internal mappings."""
+        self._samples_by_id[sample.unique_id] = sample
+        self._samples_by_name[sample.sample_name] = sample
+
+        sample._collections.add(self)
+        for measurement in sample.measurements:
+            self._index_measurement(sample, measurement)
 
         return
 
+    def add_samples(self, samples):
+        """
+        Add new samples to the collection.
+
+        Samples whose unique ID is already in the collection are skipped.
+
+        Parameters
+        ----------
+        samples : list of Sample
+            Samples to add
+
+        Returns
+        -------
+        list of Sample
+            The samples actually added
+        """
+        added = []
+        for sample in samples:
+            if sample.unique_id in self._samples_by_id:
+                continue
+            self._samples.append(sample)
+            self._map_sample(sample)
+            added.append(sample)
+        if added:
+            self._version += 1
+        return added
+
+    @property
+    def version(self):
+        """Number of updates that added samples to the collection."""
+        return self._version
+
+    def _index_measurement(self, sample, measurement):
+        """Add a measurement of one of the samples to the type index."""
+        mtype = measurement.mtype
+        key = (sample.unique_id, measurement.mfid)
+        self._measurements_by_type.setdefault(mtype, {})[key] = measurement
+        latest = self._latest_by_type.setdefault(mtype, {})
+        if is_more_recent(measurement, latest.get(sample.unique_id)):
+            latest[sample.unique_id] = measurement
+        return
+
+    def get_measurements(self, mtype, latest=False):
+        """
+        Get the measurements of a given type of all samples.
+
+        Parameters
+        ----------
+        mtype : str
+            Measurement type (e.g. "uvvis")
+        latest : bool, optional
+            Only return the most recent measurement of each sample. Default
+            returns all of them.
+
+        Returns
+        -------
+        list of Measurement
+        """
+        if latest:
+            return list(self._latest_by_type.get(mtype, {}).values())
+        return list(self._measurements_by_type.get(mtype, {}).values())
+
+    @property
+    def measurement_types(self):
+        """Get list of measurement types present in the collection."""
+        return list(self._measurements_by_type.keys())
+
     @property
     def samples(self):
         """Get list of all samples in the collection."""
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exclusions: Registry of Datasets Excluded from Analysis
+
+Keeps the list of bad datasets (name patterns and dataset IDs) outside of
+the source code, loads it from a file given in the environment or from the
+cache directory, and compiles the patterns into a single matcher.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import os
+import re
+import json
+import logging
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+# environment variable pointing to an exclusion file
+EXCLUSIONS_ENV = "TKSAMPLES_EXCLUSIONS"
+
+# file name of the registry in the cache directory
+EXCLUSIONS_FNAME = "excluded_datasets.json"
+
+# Trays 3/4, repeated (aging) measurements on same tray: excluded from
+# analysis, only loaded on request as time series (Samples.get_uvvis_series_data)
+aging_datasets = [
+    "251218_130227_pollux_oospec_multipos_line_scan_TRAY3_4_1week",
+    "260107_151134_pollux_oospec_multipos_line_scan__TRAY3_4_4weeks",
+    "260109_111702_pollux_oospec_multipos_line_scan",
+    ]
+
+# datasets excluded when no registry file exists
+default_exclusions = aging_datasets + [
+    # Trays 51/52, Tim fucked up
+    "260119_183317_pollux_oospec_multipos_line_scan",
+    ]
+
+class ExclusionRegistry(object):
+    """
+    Registry of datasets excluded from analysis.
+
+    Datasets are excluded if their name contains any of the registered
+    patterns or if their unique ID is registered. Patterns are compiled into
+    a single regular expression, rebuilt only when the registry changes.
+
+    Parameters
+    ----------
+    patterns : iterable of str, optional
+        Substrings of dataset names to exclude
+    dataset_ids : iterable of str, optional
+        Unique IDs of datasets to exclude
+
+    Examples
+    --------
+    >>> registry = ExclusionRegistry.load()
+    >>> registry.add("260201_101010_pollux_oospec_multipos_line_scan")
+    >>> registry.save()
+    """
+
+    def __init__(self, patterns=None, dataset_ids=None):
+
+        self._patterns    = set(patterns) if patterns is not None else set()
+        self._dataset_ids = set(dataset_ids) if dataset_ids is not None else set()
+
+        # file the registry was loaded from (or would be), used by save
+        self._filename = None
+
+        # bumped at each change, used by collections to refresh their tables
+        self._version = 0
+        self._matcher = None
+
+        return
+
+    @classmethod
+    def from_file(cls, filename):
+        """Load a registry from a JSON file."""
+        with open(filename, "r") as fin:
+            data = json.load(fin)
+        return cls(patterns=data.get("patterns", []),
+                   dataset_ids=data.get("dataset_ids", []))
+
+    @classmethod
+    def load(cls, cache_dir=None):
+        """
+        Load the registry from the configured location.
+
+        Looks for the file given by the TKSAMPLES_EXCLUSIONS environment
+        variable, then for `excluded_datasets.json` in the cache directory,
+        and falls back to the default exclusions.
+
+        Parameters
+        ----------
+        cache_dir : str, optional
+            Cache directory to look into
+
+        Returns
+        -------
+        ExclusionRegistry
+        """
+        candidates = [os.environ.get(EXCLUSIONS_ENV)]
+        if cache_dir is not None:
+            candidates.append(os.path.join(cache_dir, EXCLUSIONS_FNAME))
+
+        for filename in candidates:
+            if filename and os.path.exists(filename):
+                logger.debug(f"Loading dataset exclusions from {filename}")
+                registry = cls.from_file(filename)
+                registry._filename = filename
+                return registry
+
+        registry = cls(patterns=default_exclusions)
+        if cache_dir is not None:
+            registry._filename = os.path.join(cache_dir, EXCLUSIONS_FNAME)
+        return registry
+
+    def save(self, filename=None):
+        """
+        Save the registry to a JSON file.
+
+        Parameters
+        ----------
+        filename : str, optional
+            Output file. Defaults to the file the registry was loaded from
+            (or would have been loaded from).
+        """
+        if filename is None:
+            filename = self._filename
+        if filename is None:
+            raise ValueError("No file name given to save the exclusion registry.")
+
+        dirname = os.path.dirname(filename)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        with open(filename, "w") as fout:
+            json.dump(self.to_dict(), fout, indent=2)
+
+        self._filename = filename
+        return filename
+
+    def to_dict(self):
+        return {"patterns": sorted(self._patterns),
+                "dataset_ids": sorted(self._dataset_ids)}
+
+    @property
+    def patterns(self):
+        return sorted(self._patterns)
+
+    @property
+    def dataset_ids(self):
+        return sorted(self._dataset_ids)
+
+    @property
+    def version(self):
+        return self._version
+
+    def _changed(self):
+        self._version += 1
+        self._matcher = None
+        return
+
+    def add(self, pattern):
+        """Exclude datasets whose name contains `pattern`."""
+        if pattern not in self._patterns:
+            self._patterns.add(pattern)
+            self._changed()
+        return
+
+    def remove(self, pattern):
+        """Remove a name pattern from the registry."""
+        if pattern in self._patterns:
+            self._patterns.discard(pattern)
+            self._changed()
+        return
+
+    def add_dataset_id(self, dataset_id):
+        """Exclude a dataset by unique ID."""
+        if dataset_id not in self._dataset_ids:
+            self._dataset_ids.add(dataset_id)
+            self._changed()
+        return
+
+    def remove_dataset_id(self, dataset_id):
+        """Remove a dataset ID from the registry."""
+        if dataset_id in self._dataset_ids:
+            self._dataset_ids.discard(dataset_id)
+            self._changed()
+        return
+
+    def add_flagged(self, qc):
+        """Exclude all datasets flagged by a QC object (e.g. UVVisQC)."""
+        for dataset_id in qc.flagged:
+            self.add_dataset_id(dataset_id)
+        return
+
+    @property
+    def matcher(self):
+        """Compiled regular expression matching any registered pattern."""
+        if self._matcher is None and self._patterns:
+            # longest first so that overlapping patterns match greedily
+            patterns = sorted(self._patterns, key=len, reverse=True)
+            self._matcher = re.compile("|".join(re.escape(pp) for pp in patterns))
+        return self._matcher
+
+    def is_excluded(self, dataset):
+        """
+        Check whether a dataset is excluded.
+
+        Parameters
+        ----------
+        dataset : dict
+            Crucible dataset information (unique_id and dataset_name)
+
+        Returns
+        -------
+        bool
+        """
+        if dataset.get("unique_id") in self._dataset_ids:
+            return True
+        matcher = self.matcher
+        if matcher is None:
+            return False
+        return matcher.search(dataset.get("dataset_name") or "") is not None
+
+    def __len__(self):
+        return len(self._patterns) + len(self._dataset_ids)
+
+    def __bool__(self):
+        # an empty registry is still a registry (`if exclusions:`)
+        return True
+
+    def __contains__(self, dataset):
+        return self.is_excluded(dataset)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self._patterns)} patterns, {len(self._dataset_ids)} dataset IDs)"
@@ -14,6 +14,11 @@ from .graph import (
     build_project_graph,
 )
 
+from .compact import CompactGraph
+from .reachability import ReachabilityIndex
+from .cohort import CohortIndex
+from .layout import LayeredLayout
+
 from .visualization import (
     plot_direct_neighbors,
     plot_ancestors,
@@ -23,12 +28,27 @@ from .visualization import (
     plot_full_graph,
 )
 
+from .export import (
+    genealogy_data,
+    export_json,
+    export_html,
+    export_graphml,
+)
+
 __all__ = [
     "build_project_graph",
+    "CompactGraph",
+    "ReachabilityIndex",
+    "CohortIndex",
+    "LayeredLayout",
     "plot_direct_neighbors",
     "plot_ancestors",
     "plot_descendants",
     "plot_connected_component",
     "plot_extended_family",
     "plot_full_graph",
+    "genealogy_data",
+    "export_json",
+    "export_html",
+    "export_graphml",
 ]
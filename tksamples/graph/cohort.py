@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cohort: Sibling and Same-Recipe Index
+
+Groups samples by their exact set of parents (e.g. films made from the
+same precursor solutions), so that "same recipe" and sibling queries are
+answered from precomputed groups instead of walking the graph.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import logging
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+class CohortIndex(object):
+    """
+    Index of samples grouped by parent set.
+
+    A cohort is the set of samples sharing exactly the same parents.
+    Siblings (samples sharing at least one parent) are read from the
+    children of each parent. Both are returned in O(result).
+
+    Parameters
+    ----------
+    samples : list of Sample
+        Samples to index, with their genealogy links already set
+
+    Examples
+    --------
+    >>> cohorts = CohortIndex(project.samples)
+    >>> cohorts.cohort(project["TF000123"])
+    [Sample(TF000120), Sample(TF000121), ...]
+    """
+
+    def __init__(self, samples):
+
+        # parent set -> samples (dict as insertion-ordered set)
+        self._by_parents = {}
+        self._parent_set = {}
+
+        self.add_samples(samples)
+
+        logger.debug(f"Built cohort index with {len(self._by_parents)} cohorts")
+
+        return
+
+    def add_samples(self, samples):
+        """Index new samples (or re-index existing ones)."""
+        for sample in samples:
+            self._update(sample)
+        return
+
+    def _update(self, sample):
+        """Move a sample to the cohort of its current parent set."""
+        new_key = frozenset(sample._parents)
+        old_key = self._parent_set.get(sample)
+        if sample in self._parent_set and old_key == new_key:
+            return
+
+        # remove from previous cohort (samples without parents have none)
+        cohort = self._by_parents.get(old_key)
+        if cohort is not None:
+            cohort.pop(sample, None)
+            if not cohort:
+                del self._by_parents[old_key]
+
+        self._parent_set[sample] = new_key
+        if new_key:
+            self._by_parents.setdefault(new_key, {})[sample] = None
+
+        return
+
+    def add_edge(self, parent, child):
+        """Update the index after `parent` was linked to `child`."""
+        self._update(child)
+        return
+
+    def parent_set(self, sample):
+        """Frozenset of the parents of a sample."""
+        return self._parent_set.get(sample, frozenset())
+
+    def cohort(self, sample, include_self=False):
+        """
+        Samples with exactly the same parents as `sample`.
+
+        Parameters
+        ----------
+        sample : Sample
+            The sample
+        include_self : bool, optional
+            Include the sample itself. Default is False.
+
+        Returns
+        -------
+        list of Sample
+        """
+        members = self._by_parents.get(self.parent_set(sample), {})
+        return [member for member in members if include_self or member is not sample]
+
+    def siblings(self, sample):
+        """Samples sharing at least one parent with `sample`."""
+        siblings = {}
+        for parent in self.parent_set(sample):
+            siblings.update(dict.fromkeys(parent._children))
+        siblings.pop(sample, None)
+        return list(siblings)
+
+    def cohorts(self, sample_type=None, min_size=1):
+        """
+        All cohorts.
+
+        Parameters
+        ----------
+        sample_type : str, optional
+            Only keep members of this type (e.g., "thin film")
+        min_size : int, optional
+            Minimum number of members. Default is 1.
+
+        Returns
+        -------
+        dict
+            frozenset of parents -> list of member samples
+        """
+        cohorts = {}
+        for key, members in self._by_parents.items():
+            if sample_type is not None:
+                members = [member for member in members if member.sample_type == sample_type]
+            if len(members) >= min_size:
+                cohorts[key] = list(members)
+        return cohorts
+
+    def __len__(self):
+        return len(self._by_parents)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self._by_parents)} cohorts)"
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compact Graph: Integer-Indexed Genealogy Graph
+
+CSR (compressed sparse row) representation of the genealogy graph over
+integer sample indices, with sample types stored as small integer codes,
+as a lightweight alternative to the networkx graph for large projects.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# graph operations
+import networkx as nx
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+def _csr(keys, values, nnodes):
+    """indptr and indices of the adjacency grouped by `keys`."""
+    order   = np.argsort(keys, kind="stable")
+    indptr  = np.zeros(nnodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=nnodes), out=indptr[1:])
+    return indptr, values[order].astype(np.int32)
+
+
+def index_edges(graph, index):
+    """
+    Edges of a graph as index arrays.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph or CompactGraph
+        The graph
+    index : dict
+        Node -> integer index
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (sources, targets) indices, from parent to child
+    """
+    if isinstance(graph, CompactGraph):
+        sources, targets = graph.edges
+        return np.asarray(sources, dtype=np.int64), np.asarray(targets, dtype=np.int64)
+
+    edges = np.array([(index[uu], index[vv]) for uu, vv in graph.edges], dtype=np.int64)
+    if not len(edges):
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return edges[:, 0], edges[:, 1]
+
+
+class CompactGraph(object):
+    """
+    Genealogy graph as CSR arrays over integer sample indices.
+
+    Children and parents of node i are `child_indices[child_indptr[i]:
+    child_indptr[i+1]]` and the same for parents. Node order follows the
+    samples the graph was built from. The query methods used by
+    CrucibleProject (`predecessors`, `successors`, membership) mirror the
+    networkx API and return Sample objects; `to_networkx` builds the
+    equivalent networkx graph on demand.
+
+    Parameters
+    ----------
+    samples : list of Sample
+        Samples of the graph, edges are read from their parents
+
+    Examples
+    --------
+    >>> graph = CompactGraph(project.samples)
+    >>> graph.number_of_edges()
+    15230
+    >>> list(graph.successors(project["SOL0001"]))
+    [Sample(TF000001), ...]
+    """
+
+    def __init__(self, samples):
+
+        samples = list(samples)
+        self._nodes = list(samples)
+        self._index = {sample: cc for cc, sample in enumerate(self._nodes)}
+
+        # parents outside of `samples` become nodes, as in the networkx graph
+        for sample in samples:
+            for parent in sample.parents:
+                if parent not in self._index:
+                    self._index[parent] = len(self._nodes)
+                    self._nodes.append(parent)
+
+        # sample types as integer codes
+        self._type_names = sorted({sample.sample_type for sample in self._nodes})
+        type2code = {stype: cc for cc, stype in enumerate(self._type_names)}
+        self._type_codes = np.array([type2code[sample.sample_type] for sample in self._nodes],
+                                    dtype=np.int16)
+
+        # edges from parent to child
+        src, dst = [], []
+        for cc, sample in enumerate(samples):
+            for parent in sample.parents:
+                src.append(self._index[parent])
+                dst.append(cc)
+
+        self._set_edges(np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64))
+
+        # networkx graph, built on demand
+        self._nx_graph = None
+
+        logger.info(f"Built compact genealogy graph with {self.number_of_nodes()} nodes "
+                    f"and {self.number_of_edges()} edges")
+
+        return
+
+    def _set_edges(self, src, dst):
+        """Build both CSR adjacencies from scratch (used at construction)."""
+        nnodes = len(self._nodes)
+
+        # drop duplicate edges
+        if len(src):
+            keys = np.unique(src * nnodes + dst)
+            src, dst = keys // nnodes, keys % nnodes
+
+        self._child_indptr, self._child_indices   = _csr(src, dst, nnodes)
+        self._parent_indptr, self._parent_indices = _csr(dst, src, nnodes)
+
+        return
+
+    @staticmethod
+    def _insert(indptr, indices, rows, cols):
+        """
+        Insert (row, col) entries, sorted by row then col and not already
+        present, into a CSR adjacency whose rows are sorted.
+        """
+        nnodes = len(indptr) - 1
+        positions = np.empty(len(rows), dtype=np.int64)
+        for cc, (row, col) in enumerate(zip(rows, cols)):
+            start, stop = indptr[row], indptr[row+1]
+            positions[cc] = start + np.searchsorted(indices[start:stop], col)
+
+        indices = np.insert(indices, positions, cols.astype(indices.dtype))
+        indptr  = indptr.copy()
+        indptr[1:] += np.cumsum(np.bincount(rows, minlength=nnodes))
+        return indptr, indices
+
+    def add_nodes(self, samples):
+        """Append new samples (without edges) to the graph."""
+        new = [sample for sample in samples if sample not in self._index]
+        if not new:
+            return
+
+        for sample in new:
+            self._index[sample] = len(self._nodes)
+            self._nodes.append(sample)
+            if sample.sample_type not in self._type_names:
+                self._type_names.append(sample.sample_type)
+        codes = [self._type_names.index(sample.sample_type) for sample in new]
+        self._type_codes = np.concatenate([self._type_codes, np.array(codes, dtype=np.int16)])
+
+        # new nodes have no edges yet: empty rows at the end
+        pad = np.full(len(new), self._child_indptr[-1], dtype=np.int64)
+        self._child_indptr  = np.concatenate([self._child_indptr, pad])
+        self._parent_indptr = np.concatenate([self._parent_indptr, pad])
+
+        if self._nx_graph is not None:
+            for sample in new:
+                self._nx_graph.add_node(sample, name=sample.sample_name,
+                                        type=sample.sample_type, mfid=sample.mfid)
+        return
+
+    def add_edges(self, edges):
+        """
+        Add edges to the graph, in place.
+
+        New edges are inserted into the sorted CSR rows (O(E + k log E) for
+        k new edges, no global re-sort). Samples not yet in the graph are
+        added as nodes, as networkx does.
+
+        Parameters
+        ----------
+        edges : list of tuple
+            (parent, child) Sample pairs
+        """
+        edges = list(edges)
+        if not edges:
+            return
+
+        self.add_nodes([sample for edge in edges for sample in edge])
+
+        src = np.array([self._index[parent] for parent, _ in edges], dtype=np.int64)
+        dst = np.array([self._index[child] for _, child in edges], dtype=np.int64)
+
+        # drop duplicates and edges already in the graph
+        pairs = np.unique(np.column_stack([src, dst]), axis=0)
+        new = np.array([not np.any(self.child_indices(ss) == tt) for ss, tt in pairs], dtype=bool)
+        src, dst = pairs[new, 0], pairs[new, 1]
+        if not len(src):
+            return
+
+        self._child_indptr, self._child_indices = self._insert(
+            self._child_indptr, self._child_indices, src, dst)
+
+        order = np.lexsort((src, dst))
+        self._parent_indptr, self._parent_indices = self._insert(
+            self._parent_indptr, self._parent_indices, dst[order], src[order])
+
+        if self._nx_graph is not None:
+            self._nx_graph.add_edges_from(edges)
+        return
+
+    @property
+    def nodes(self):
+        return list(self._nodes)
+
+    @property
+    def type_names(self):
+        return list(self._type_names)
+
+    @property
+    def type_codes(self):
+        return self._type_codes
+
+    @property
+    def edges(self):
+        """(sources, targets) index arrays, from parent to child."""
+        nchildren = np.diff(self._child_indptr)
+        sources = np.repeat(np.arange(len(self._nodes), dtype=np.int32), nchildren)
+        return sources, self._child_indices
+
+    def number_of_nodes(self):
+        return len(self._nodes)
+
+    def number_of_edges(self):
+        return len(self._child_indices)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return node in self._index
+
+    def index(self, node):
+        """Integer index of a sample."""
+        return self._index[node]
+
+    def nodes_of_type(self, sample_type):
+        """Indices of the samples of a given type."""
+        if sample_type not in self._type_names:
+            return np.zeros(0, dtype=np.int64)
+        return np.flatnonzero(self._type_codes == self._type_names.index(sample_type))
+
+    def parent_indices(self, ii):
+        return self._parent_indices[self._parent_indptr[ii]:self._parent_indptr[ii+1]]
+
+    def child_indices(self, ii):
+        return self._child_indices[self._child_indptr[ii]:self._child_indptr[ii+1]]
+
+    def has_edge(self, parent, child):
+        """Check if the edge from `parent` to `child` is in the graph."""
+        if parent not in self._index or child not in self._index:
+            return False
+        children = self.child_indices(self._index[parent])
+        pos = np.searchsorted(children, self._index[child])
+        return bool(pos < len(children) and children[pos] == self._index[child])
+
+    def in_degree(self):
+        return np.diff(self._parent_indptr)
+
+    def out_degree(self):
+        return np.diff(self._child_indptr)
+
+    def predecessors(self, node):
+        """Parents of a sample."""
+        return iter([self._nodes[ii] for ii in self.parent_indices(self._index[node])])
+
+    def successors(self, node):
+        """Children of a sample."""
+        return iter([self._nodes[ii] for ii in self.child_indices(self._index[node])])
+
+    def to_networkx(self):
+        """
+        Get the equivalent networkx graph (built once, then cached).
+
+        Returns
+        -------
+        nx.DiGraph
+            Graph with Sample nodes (name, type and mfid attributes)
+        """
+        if self._nx_graph is None:
+            graph = nx.DiGraph()
+            for sample in self._nodes:
+                graph.add_node(sample, name=sample.sample_name, type=sample.sample_type,
+                               mfid=sample.mfid)
+            sources, targets = self.edges
+            graph.add_edges_from((self._nodes[ss], self._nodes[tt])
+                                 for ss, tt in zip(sources, targets))
+            self._nx_graph = graph
+        return self._nx_graph
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.number_of_nodes()} nodes, {self.number_of_edges()} edges)"
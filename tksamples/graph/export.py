@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export: Genealogy Graph Export for External Viewers
+
+Writes the project genealogy, with its precomputed layered layout and
+sample metadata, to a columnar JSON document, to a self-contained HTML
+page that a browser can pan, zoom and search, or to GraphML for external
+graph tools.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import json
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# graph operations
+import networkx as nx
+
+# internal modules
+from tksamples.graph.compact import index_edges
+from tksamples.graph.visualization import _get_default_colors
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+def genealogy_data(project, sample_type_colors=None, decimals=6):
+    """
+    Genealogy graph of a project as a JSON-serializable dictionary.
+
+    Nodes and edges are stored column-wise (one list per attribute) and
+    edges refer to nodes by position, which keeps the document compact for
+    projects with thousands of samples.
+
+    Parameters
+    ----------
+    project : CrucibleProject
+        Project containing the graph and samples
+    sample_type_colors : dict, optional
+        Dictionary mapping sample_type to color
+    decimals : int, optional
+        Decimals of the node coordinates. Default is 6.
+
+    Returns
+    -------
+    dict
+        With keys "project_id", "graph_version", "types", "colors",
+        "nodes" (name, mfid, type code, x, y, layer, measurements) and
+        "edges" (source, target)
+    """
+    if sample_type_colors is None:
+        sample_type_colors = _get_default_colors()
+
+    layout = project.get_layout()
+    nodes  = layout.nodes
+    index  = {node: cc for cc, node in enumerate(nodes)}
+    sources, targets = index_edges(project.genealogy, index)
+
+    types = sorted({node.sample_type for node in nodes})
+    type2code = {stype: cc for cc, stype in enumerate(types)}
+
+    xy = np.round(layout.xy, decimals)
+
+    return {
+        "project_id"    : project.project_id,
+        "graph_version" : project.graph_version,
+        "types"         : types,
+        "colors"        : [sample_type_colors.get(stype, '#95a5a6') for stype in types],
+        "nodes"         : {
+            "name"         : [node.sample_name for node in nodes],
+            "mfid"         : [node.mfid for node in nodes],
+            "type"         : [type2code[node.sample_type] for node in nodes],
+            "x"            : xy[:, 0].tolist(),
+            "y"            : xy[:, 1].tolist(),
+            "layer"        : layout.layers.tolist(),
+            "measurements" : [node.measurement_types for node in nodes],
+            },
+        "edges"         : {
+            "source" : sources.tolist(),
+            "target" : targets.tolist(),
+            },
+        }
+
+
+def export_json(project, filename, sample_type_colors=None):
+    """
+    Write the genealogy graph to a JSON file (see `genealogy_data`).
+
+    Parameters
+    ----------
+    project : CrucibleProject
+        Project containing the graph and samples
+    filename : str
+        Output file
+    sample_type_colors : dict, optional
+        Dictionary mapping sample_type to color
+    """
+    data = genealogy_data(project, sample_type_colors=sample_type_colors)
+    with open(filename, "w") as fout:
+        json.dump(data, fout, separators=(",", ":"))
+
+    logger.info(f"Exported genealogy of {len(data['nodes']['name'])} samples to {filename}")
+
+    return
+
+
+def export_html(project, filename, sample_type_colors=None, title=None):
+    """
+    Write the genealogy graph to a self-contained interactive HTML page.
+
+    The page draws the graph on a canvas with the precomputed layout: drag
+    to pan, scroll to zoom, hover for sample metadata, click a sample to
+    highlight its ancestors and descendants, and search by name. Labels
+    are shown once zoomed in enough for them not to overlap.
+
+    Parameters
+    ----------
+    project : CrucibleProject
+        Project containing the graph and samples
+    filename : str
+        Output file
+    sample_type_colors : dict, optional
+        Dictionary mapping sample_type to color
+    title : str, optional
+        Page title. Defaults to the project ID.
+    """
+    data = genealogy_data(project, sample_type_colors=sample_type_colors)
+    if title is None:
+        title = f"Genealogy of {project.project_id}"
+
+    # no markup characters in the embedded JSON (cannot close the script tag)
+    payload = (json.dumps(data, separators=(",", ":")).replace("<", "\\u003c")
+               .replace(">", "\\u003e").replace("&", "\\u0026"))
+    html = _HTML_TEMPLATE.replace("__TITLE__", _escape(title)).replace("__DATA__", payload)
+
+    with open(filename, "w") as fout:
+        fout.write(html)
+
+    logger.info(f"Exported genealogy of {len(data['nodes']['name'])} samples to {filename}")
+
+    return
+
+
+def export_graphml(project, filename):
+    """
+    Write the genealogy graph to GraphML for external tools (e.g. Gephi).
+
+    Nodes are identified by their mfid and carry the sample name, type,
+    layout position (x, y, layer) and measurement types.
+
+    Parameters
+    ----------
+    project : CrucibleProject
+        Project containing the graph and samples
+    filename : str
+        Output file
+    """
+    layout = project.get_layout()
+    nodes  = layout.nodes
+    index  = {node: cc for cc, node in enumerate(nodes)}
+    sources, targets = index_edges(project.genealogy, index)
+    xy     = layout.xy
+    layers = layout.layers
+
+    graph = nx.DiGraph()
+    for cc, node in enumerate(nodes):
+        graph.add_node(node.mfid, name=node.sample_name, type=node.sample_type,
+                       x=float(xy[cc, 0]), y=float(xy[cc, 1]), layer=int(layers[cc]),
+                       measurements=",".join(node.measurement_types))
+    graph.add_edges_from((nodes[ss].mfid, nodes[tt].mfid) for ss, tt in zip(sources, targets))
+
+    nx.write_graphml(graph, filename)
+
+    logger.info(f"Exported genealogy of {graph.number_of_nodes()} samples to {filename}")
+
+    return
+
+
+def _escape(text):
+    return (str(text).replace("&", "&amp;").replace("<", "&lt;")
+            .replace(">", "&gt;").replace('"', "&quot;"))
+
+
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+  html, body { margin: 0; height: 100%; overflow: hidden; font-family: sans-serif; }
+  #graph { display: block; width: 100%; height: 100%; cursor: grab; }
+  #panel { position: absolute; top: 8px; left: 8px; background: rgba(255,255,255,0.9);
+           padding: 6px 10px; border-radius: 4px; font-size: 13px; }
+  #legend span { display: inline-block; width: 10px; height: 10px; margin: 0 4px 0 10px; }
+  #tooltip { position: absolute; pointer-events: none; background: rgba(0,0,0,0.8);
+             color: white; padding: 4px 8px; border-radius: 3px; font-size: 12px; display: none; }
+</style>
+</head>
+<body>
+<canvas id="graph"></canvas>
+<div id="panel">
+  <b>__TITLE__</b> <span id="counts"></span><br>
+  <input id="search" placeholder="sample name" size="14"> <span id="legend"></span>
+</div>
+<div id="tooltip"></div>
+<script type="application/json" id="data">__DATA__</script>
+<script>
+"use strict";
+const data = JSON.parse(document.getElementById("data").textContent);
+const N = data.nodes, E = data.edges, n = N.name.length, m = E.source.length;
+const canvas = document.getElementById("graph"), ctx = canvas.getContext("2d");
+const tooltip = document.getElementById("tooltip");
+
+// adjacency for lineage highlighting
+const parents = Array.from({length: n}, () => []), children = Array.from({length: n}, () => []);
+for (let k = 0; k < m; k++) { children[E.source[k]].push(E.target[k]); parents[E.target[k]].push(E.source[k]); }
+const byName = new Map(N.name.map((name, i) => [name, i]));
+
+document.getElementById("counts").textContent = `(${n} samples, ${m} edges)`;
+// names and metadata are inserted as text, never parsed as HTML
+const legend = document.getElementById("legend");
+data.types.forEach((t, i) => {
+  const swatch = document.createElement("span");
+  swatch.style.background = data.colors[i];
+  legend.append(swatch, t);
+});
+
+// view: screen = (world * scale) + offset, world in [0, 1]
+let W, H, scale, ox, oy, selected = -1, lineage = null;
+function fit() {
+  W = canvas.width = window.innerWidth; H = canvas.height = window.innerHeight;
+  scale = Math.min(W, H) * 0.9; ox = (W - scale) / 2; oy = (H - scale) / 2;
+}
+const sx = i => N.x[i] * scale + ox, sy = i => (1 - N.y[i]) * scale + oy;
+
+function walk(start, adjacency, seen) {
+  const stack = [start];
+  while (stack.length) { for (const j of adjacency[stack.pop()]) if (!seen.has(j)) { seen.add(j); stack.push(j); } }
+}
+function select(i) {
+  selected = i; lineage = null;
+  if (i >= 0) { lineage = new Set([i]); walk(i, parents, lineage); walk(i, children, lineage); }
+  draw();
+}
+
+function draw() {
+  ctx.clearRect(0, 0, W, H);
+  const radius = Math.max(1.5, Math.min(6, scale / 400));
+
+  // edges in one path (plus one for the highlighted lineage)
+  ctx.lineWidth = 0.5; ctx.strokeStyle = lineage ? "rgba(150,150,150,0.15)" : "rgba(150,150,150,0.5)";
+  ctx.beginPath();
+  for (let k = 0; k < m; k++) { const s = E.source[k], t = E.target[k]; ctx.moveTo(sx(s), sy(s)); ctx.lineTo(sx(t), sy(t)); }
+  ctx.stroke();
+  if (lineage) {
+    ctx.lineWidth = 1.5; ctx.strokeStyle = "#e67e22"; ctx.beginPath();
+    for (let k = 0; k < m; k++) {
+      const s = E.source[k], t = E.target[k];
+      if (lineage.has(s) && lineage.has(t)) { ctx.moveTo(sx(s), sy(s)); ctx.lineTo(sx(t), sy(t)); }
+    }
+    ctx.stroke();
+  }
+
+  // nodes, one path per sample type
+  for (let c = 0; c < data.types.length; c++) {
+    ctx.fillStyle = data.colors[c]; ctx.beginPath();
+    for (let i = 0; i < n; i++) {
+      if (N.type[i] !== c) continue;
+      const x = sx(i), y = sy(i);
+      if (x < -radius || x > W + radius || y < -radius || y > H + radius) continue;
+      ctx.moveTo(x + radius, y); ctx.arc(x, y, radius, 0, 2 * Math.PI);
+    }
+    ctx.fill();
+  }
+  if (selected >= 0) {
+    ctx.strokeStyle = "black"; ctx.lineWidth = 2; ctx.beginPath();
+    ctx.arc(sx(selected), sy(selected), radius + 3, 0, 2 * Math.PI); ctx.stroke();
+  }
+
+  // labels only where they do not overlap (one per label-sized cell)
+  ctx.fillStyle = "black"; ctx.font = "10px sans-serif"; ctx.textAlign = "center";
+  const used = new Set();
+  for (let i = 0; i < n; i++) {
+    const x = sx(i), y = sy(i);
+    if (x < 0 || x > W || y < 0 || y > H) continue;
+    const cell = Math.floor(x / 70) + "," + Math.floor(y / 14);
+    if (used.has(cell)) continue;
+    used.add(cell); ctx.fillText(N.name[i], x, y - radius - 2);
+  }
+}
+
+function nearest(px, py) {
+  let best = -1, bestd = 100;
+  for (let i = 0; i < n; i++) {
+    const d = (sx(i) - px) ** 2 + (sy(i) - py) ** 2;
+    if (d < bestd) { bestd = d; best = i; }
+  }
+  return best;
+}
+
+let drag = null, moved = false;
+canvas.addEventListener("mousedown", e => { drag = [e.clientX, e.clientY]; moved = false; canvas.style.cursor = "grabbing"; });
+window.addEventListener("mouseup", e => {
+  if (drag && !moved) select(nearest(e.clientX, e.clientY));
+  drag = null; canvas.style.cursor = "grab";
+});
+canvas.addEventListener("mousemove", e => {
+  if (drag) {
+    ox += e.clientX - drag[0]; oy += e.clientY - drag[1]; drag = [e.clientX, e.clientY];
+    moved = true; tooltip.style.display = "none"; draw(); return;
+  }
+  const i = nearest(e.clientX, e.clientY);
+  if (i < 0) { tooltip.style.display = "none"; return; }
+  const name = document.createElement("b");
+  name.textContent = N.name[i];
+  const lines = [data.types[N.type[i]], N.mfid[i], `${parents[i].length} parents, ${children[i].length} children`];
+  if (N.measurements[i].length) lines.push(N.measurements[i].join(", "));
+  tooltip.replaceChildren(name);
+  for (const line of lines) tooltip.append(document.createElement("br"), line);
+  tooltip.style.left = (e.clientX + 12) + "px"; tooltip.style.top = (e.clientY + 12) + "px";
+  tooltip.style.display = "block";
+});
+canvas.addEventListener("wheel", e => {
+  e.preventDefault();
+  const f = Math.exp(-e.deltaY * 0.002);
+  ox = e.clientX - (e.clientX - ox) * f; oy = e.clientY - (e.clientY - oy) * f; scale *= f;
+  draw();
+}, {passive: false});
+document.getElementById("search").addEventListener("keydown", e => {
+  if (e.key !== "Enter") return;
+  const i = byName.get(e.target.value.trim());
+  if (i === undefined) return;
+  scale = Math.max(scale, Math.min(W, H) * 20);
+  ox = W / 2 - N.x[i] * scale; oy = H / 2 - (1 - N.y[i]) * scale;
+  select(i);
+});
+window.addEventListener("resize", () => { fit(); draw(); });
+fit(); draw();
+</script>
+</body>
+</html>
+"""
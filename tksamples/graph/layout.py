@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Layout: Fast Layered Layout of Genealogy Graphs
+
+Hierarchical (layered) positions of the genealogy graph computed with array
+operations over integer node indices: layers are the topological
+generations of the graph and nodes within a layer are ordered by the mean
+position of their parents. The full-graph layout is computed once and
+subgraph layouts are derived from it.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# internal modules
+from tksamples.graph.compact import index_edges
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+def _spread(counts, padding=0.1):
+    """x position of each slot of consecutive groups of `counts` nodes."""
+    counts = np.asarray(counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    slot   = np.arange(counts.sum()) - starts
+    size   = np.repeat(counts, counts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        xx = padding + slot * (1 - 2*padding) / (size - 1)
+    return np.where(size == 1, 0.5, xx)
+
+
+def topological_generations(nnodes, sources, targets):
+    """
+    Topological generation (longest distance from a root) of every node.
+
+    Parameters
+    ----------
+    nnodes : int
+        Number of nodes
+    sources, targets : np.ndarray
+        Edge index arrays, from parent to child
+
+    Returns
+    -------
+    np.ndarray
+        Generation of each node. Nodes in cycles are put one generation
+        after the last acyclic one.
+    """
+    indegree = np.bincount(targets, minlength=nnodes)
+
+    # children of each node as CSR
+    order    = np.argsort(sources, kind="stable")
+    children = targets[order]
+    indptr   = np.zeros(nnodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=nnodes), out=indptr[1:])
+
+    layers   = np.full(nnodes, -1, dtype=np.int64)
+    frontier = np.flatnonzero(indegree == 0)
+    generation = 0
+    while len(frontier):
+        layers[frontier] = generation
+
+        # all children of the frontier at once
+        starts  = indptr[frontier]
+        lengths = indptr[frontier + 1] - starts
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        reached = children[np.arange(lengths.sum()) + offsets]
+
+        indegree -= np.bincount(reached, minlength=nnodes)
+        frontier = np.unique(reached[indegree[reached] == 0])
+        generation += 1
+
+    layers[layers < 0] = generation
+
+    return layers
+
+
+class LayeredLayout(object):
+    """
+    Layered layout of a genealogy graph.
+
+    Roots are at the top (y = 1) and each generation one level below.
+    Within a generation, nodes are sorted by the mean x of their parents,
+    then by name, and spread evenly with 10% padding on each side.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph or CompactGraph
+        Graph with Sample nodes and edges from parent to child
+
+    Examples
+    --------
+    >>> layout = project.get_layout()
+    >>> pos = layout.positions()                  # full graph
+    >>> pos = layout.positions(subgraph.nodes())  # consistent subgraph layout
+    """
+
+    def __init__(self, graph):
+
+        self._nodes = list(graph.nodes)
+        self._index = {node: cc for cc, node in enumerate(self._nodes)}
+
+        sources, targets = index_edges(graph, self._index)
+        self._compute(sources, targets)
+
+        return
+
+    def _compute(self, sources, targets):
+
+        nnodes = len(self._nodes)
+        self._layers = topological_generations(nnodes, sources, targets)
+
+        # tie-breaking by name
+        names = np.array([node.sample_name for node in self._nodes], dtype=str)
+        name_rank = np.empty(nnodes, dtype=np.int64)
+        name_rank[np.argsort(names, kind="stable")] = np.arange(nnodes)
+
+        # edges grouped by layer of their child
+        edge_order  = np.argsort(self._layers[targets], kind="stable")
+        sources, targets = sources[edge_order], targets[edge_order]
+        nlayers     = self._layers.max() + 1 if nnodes else 0
+        edge_bounds = np.searchsorted(self._layers[targets], np.arange(nlayers + 1))
+
+        node_order  = np.argsort(self._layers, kind="stable")
+        node_bounds = np.searchsorted(self._layers[node_order], np.arange(nlayers + 1))
+
+        # place layers top-down, barycenter of already placed parents
+        self._x = np.zeros(nnodes)
+        for layer in range(nlayers):
+            members = node_order[node_bounds[layer]:node_bounds[layer+1]]
+            esrc = sources[edge_bounds[layer]:edge_bounds[layer+1]]
+            etgt = targets[edge_bounds[layer]:edge_bounds[layer+1]]
+
+            total = np.bincount(etgt, weights=self._x[esrc], minlength=nnodes)[members]
+            count = np.bincount(etgt, minlength=nnodes)[members]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                barycenter = np.where(count > 0, total / count, 0)
+
+            # rounding, so that equal barycenters tie regardless of summation order
+            barycenter = np.round(barycenter, 12)
+
+            ordered = members[np.lexsort((name_rank[members], barycenter))]
+            self._x[ordered] = _spread([len(ordered)])
+
+        max_layer = max(nlayers - 1, 1)
+        self._y = 1.0 - self._layers / max_layer
+
+        logger.debug(f"Computed layered layout of {nnodes} nodes in {nlayers} layers")
+
+        return
+
+    @property
+    def nodes(self):
+        return list(self._nodes)
+
+    @property
+    def layers(self):
+        return self._layers
+
+    @property
+    def xy(self):
+        """(nnodes, 2) positions in node order."""
+        return np.column_stack([self._x, self._y])
+
+    def __contains__(self, node):
+        return node in self._index
+
+    def positions(self, nodes=None):
+        """
+        Node positions as a dictionary (networkx `pos` format).
+
+        Parameters
+        ----------
+        nodes : iterable, optional
+            Subset of nodes. Their layers are compacted and they are re-spread
+            within each layer keeping the order of the full layout, so that
+            subgraph plots are consistent with the full graph.
+
+        Returns
+        -------
+        dict
+            node -> (x, y)
+        """
+        if nodes is None:
+            return dict(zip(self._nodes, zip(self._x.tolist(), self._y.tolist())))
+
+        nodes = list(nodes)
+        if not nodes:
+            return {}
+        idx = np.array([self._index[node] for node in nodes], dtype=np.int64)
+
+        # compact the layers present in the subset
+        levels, rank = np.unique(self._layers[idx], return_inverse=True)
+        yy = 1.0 - rank / max(len(levels) - 1, 1)
+
+        # keep the full-layout order within each layer
+        order  = np.lexsort((self._x[idx], rank))
+        counts = np.bincount(rank, minlength=len(levels))
+        xx = np.empty(len(idx))
+        xx[order] = _spread(counts)
+
+        return dict(zip(nodes, zip(xx.tolist(), yy.tolist())))
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self._nodes)} nodes)"
@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reachability: Precomputed Ancestor/Descendant Index
+
+Transitive closure of the genealogy graph stored as one bitset (Python int)
+per node, computed once in topological order, so that ancestor, descendant
+and common-ancestor queries are answered with bitwise operations instead
+of graph traversals, and batch queries are returned as sparse matrices.
+
+Lineage aggregation (`aggregate`) is computed as a product of the sparse
+closure matrix with the per-node values, not as a topological sweep: a
+sweep that propagates partial sums counts a value once per path, so
+nodes reached through several paths (a film made from two solutions that
+share a precursor) would be counted more than once. The closure matrix
+holds one nonzero per ancestor-descendant pair. It is built once and
+cached, so memory and the cost of each aggregation are both
+O(closure size) rather than O(edges).
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import logging
+from collections import deque
+from functools import lru_cache
+
+# numpy is my rock
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+# internal modules
+from tksamples.graph.compact import index_edges
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+class ReachabilityIndex(object):
+    """
+    Bitset transitive closure of a directed graph.
+
+    Bit i of a node's ancestor (descendant) mask is set if node i of the
+    index is an ancestor (descendant) of it. Strongly connected components
+    are collapsed first, so inconsistent genealogies with cycles are
+    handled like networkx does (a node is never its own ancestor).
+
+    Lowest common ancestors and shortest derivation paths are answered
+    from the masks and depth labels (longest distance from a root), with
+    results memoized in bounded LRU caches that are cleared on updates.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph or CompactGraph
+        Graph with edges from parent to child
+    cache_size : int, optional
+        Maximum number of memoized LCA and path queries. Default is 4096.
+
+    Examples
+    --------
+    >>> index = ReachabilityIndex(project.graph)
+    >>> index.ancestors(project["TF0001"])
+    [Sample(SOL0001), Sample(PBI0003)]
+    >>> index.is_ancestor(project["SOL0001"], project["TF0001"])
+    True
+    """
+
+    def __init__(self, graph, cache_size=4096):
+
+        self._nodes = list(graph.nodes)
+        self._index = {node: cc for cc, node in enumerate(self._nodes)}
+
+        # full closure matrices and depth labels, computed on demand
+        self._matrices = {}
+        self._depths   = None
+
+        # memoized LCA/path queries
+        self._cache_size = cache_size
+        self._setup_caches()
+
+        # edges as index arrays
+        sources, targets = index_edges(graph, self._index)
+
+        self._build(sources, targets)
+
+        # adjacency lists, for path queries
+        self._parents  = [[] for _ in self._nodes]
+        self._children = [[] for _ in self._nodes]
+        for ss, tt in zip(sources.tolist(), targets.tolist()):
+            self._children[ss].append(tt)
+            self._parents[tt].append(ss)
+
+        return
+
+    def _setup_caches(self):
+        self._lca_cached  = lru_cache(maxsize=self._cache_size)(self._lca_indices)
+        self._path_cached = lru_cache(maxsize=self._cache_size)(self._path_indices)
+        return
+
+    def _invalidate(self):
+        """Drop everything derived from the masks after an update."""
+        self._matrices = {}
+        self._depths   = None
+        self._lca_cached.cache_clear()
+        self._path_cached.cache_clear()
+        return
+
+    def _build(self, sources, targets):
+
+        nnodes = len(self._nodes)
+
+        # collapse cycles into strongly connected components
+        adjacency = sparse.csr_matrix((np.ones(len(sources), dtype=bool), (sources, targets)),
+                                      shape=(nnodes, nnodes))
+        ncomps, labels = csgraph.connected_components(adjacency, directed=True,
+                                                      connection="strong")
+
+        comp_bits = [0] * ncomps
+        comp_size = np.bincount(labels, minlength=ncomps)
+        for cc, comp in enumerate(labels):
+            comp_bits[comp] |= 1 << cc
+        comp_cycle = comp_size > 1
+
+        # edges between components
+        csrc, cdst = labels[sources], labels[targets]
+        keep = csrc != cdst
+        ckeys = np.unique(csrc[keep].astype(np.int64) * ncomps + cdst[keep])
+        csrc, cdst = ckeys // ncomps, ckeys % ncomps
+
+        preds = [[] for _ in range(ncomps)]
+        succs = [[] for _ in range(ncomps)]
+        for ss, tt in zip(csrc.tolist(), cdst.tolist()):
+            preds[tt].append(ss)
+            succs[ss].append(tt)
+
+        # topological order of the components (Kahn)
+        indegree = np.bincount(cdst, minlength=ncomps).tolist()
+        queue = deque(comp for comp in range(ncomps) if indegree[comp] == 0)
+        order = []
+        while queue:
+            comp = queue.popleft()
+            order.append(comp)
+            for succ in succs[comp]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    queue.append(succ)
+
+        # ancestors: sweep parents before children
+        comp_anc = [0] * ncomps
+        for comp in order:
+            mask = comp_bits[comp] if comp_cycle[comp] else 0
+            for pred in preds[comp]:
+                mask |= comp_anc[pred] | comp_bits[pred]
+            comp_anc[comp] = mask
+
+        # descendants: sweep children before parents
+        comp_desc = [0] * ncomps
+        for comp in reversed(order):
+            mask = comp_bits[comp] if comp_cycle[comp] else 0
+            for succ in succs[comp]:
+                mask |= comp_desc[succ] | comp_bits[succ]
+            comp_desc[comp] = mask
+
+        # per-node masks, a node is not its own ancestor
+        self._ancestors   = [0] * nnodes
+        self._descendants = [0] * nnodes
+        for cc, comp in enumerate(labels.tolist()):
+            self._ancestors[cc]   = comp_anc[comp] & ~(1 << cc)
+            self._descendants[cc] = comp_desc[comp] & ~(1 << cc)
+
+        logger.debug(f"Built reachability index of {nnodes} nodes ({ncomps} components)")
+
+        return
+
+    @property
+    def nodes(self):
+        return list(self._nodes)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, node):
+        return node in self._index
+
+    def index(self, node):
+        """Position of a node in the index."""
+        return self._index[node]
+
+    def _mask2indices(self, mask):
+        """Indices of the bits set in a mask."""
+        if not mask:
+            return np.zeros(0, dtype=np.int64)
+        nbytes = (len(self._nodes) + 7) // 8
+        bits = np.unpackbits(np.frombuffer(mask.to_bytes(nbytes, "little"), dtype=np.uint8),
+                             bitorder="little")
+        return np.flatnonzero(bits)
+
+    def _mask2nodes(self, mask):
+        """Nodes whose bits are set in a mask, in index order."""
+        return [self._nodes[ii] for ii in self._mask2indices(mask)]
+
+    def add_nodes(self, nodes):
+        """Append new (unconnected) nodes to the index."""
+        for node in nodes:
+            if node in self._index:
+                continue
+            self._index[node] = len(self._nodes)
+            self._nodes.append(node)
+            self._ancestors.append(0)
+            self._descendants.append(0)
+            self._parents.append([])
+            self._children.append([])
+        self._invalidate()
+        return
+
+    def add_edge(self, parent, child):
+        """
+        Update the closure with a new edge from `parent` to `child`.
+
+        The edge must not be in the index already.
+
+        Every ancestor of the parent (and the parent) becomes an ancestor of
+        every descendant of the child (and the child), and vice versa, so
+        only the affected masks are touched.
+        """
+        pp, cc = self._index[parent], self._index[child]
+
+        self._children[pp].append(cc)
+        self._parents[cc].append(pp)
+        self._invalidate()
+
+        new_ancestors   = self._ancestors[pp] | (1 << pp)
+        new_descendants = self._descendants[cc] | (1 << cc)
+
+        # nothing new if the child already descends from the parent
+        if self._ancestors[cc] & new_ancestors == new_ancestors and \
+            self._descendants[pp] & new_descendants == new_descendants:
+            return
+
+        for ii in self._mask2indices(new_descendants):
+            self._ancestors[ii] = (self._ancestors[ii] | new_ancestors) & ~(1 << int(ii))
+        for ii in self._mask2indices(new_ancestors):
+            self._descendants[ii] = (self._descendants[ii] | new_descendants) & ~(1 << int(ii))
+
+        return
+
+    def ancestors_mask(self, node):
+        return self._ancestors[self._index[node]]
+
+    def descendants_mask(self, node):
+        return self._descendants[self._index[node]]
+
+    def ancestors(self, node):
+        """All ancestors of a node."""
+        return self._mask2nodes(self.ancestors_mask(node))
+
+    def descendants(self, node):
+        """All descendants of a node."""
+        return self._mask2nodes(self.descendants_mask(node))
+
+    def common_ancestors(self, *nodes):
+        """Ancestors shared by all the given nodes."""
+        if not nodes:
+            return []
+        mask = self.ancestors_mask(nodes[0])
+        for node in nodes[1:]:
+            mask &= self.ancestors_mask(node)
+        return self._mask2nodes(mask)
+
+    def is_ancestor(self, ancestor, node):
+        """Check if `ancestor` is an ancestor of `node`."""
+        return bool(self.ancestors_mask(node) >> self._index[ancestor] & 1)
+
+    def nancestors(self, node):
+        return bin(self.ancestors_mask(node)).count("1")
+
+    def ndescendants(self, node):
+        return bin(self.descendants_mask(node)).count("1")
+
+    @property
+    def depths(self):
+        """
+        Depth label of every node: longest number of edges from a root.
+
+        Nodes in cycles keep the depth reached from their acyclic parents.
+        """
+        if self._depths is None:
+            indegree = [len(parents) for parents in self._parents]
+            depths   = [0] * len(self._nodes)
+            queue    = deque(ii for ii, deg in enumerate(indegree) if deg == 0)
+            while queue:
+                ii = queue.popleft()
+                for child in self._children[ii]:
+                    depths[child] = max(depths[child], depths[ii] + 1)
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        queue.append(child)
+            self._depths = np.array(depths, dtype=np.int64)
+        return self._depths
+
+    def depth(self, node):
+        return int(self.depths[self._index[node]])
+
+    def _lca_indices(self, ia, ib):
+        """Lowest common ancestors of two node indices, deepest first."""
+        common = (self._ancestors[ia] | (1 << ia)) & (self._ancestors[ib] | (1 << ib))
+        if not common:
+            return ()
+
+        candidates = self._mask2indices(common)
+        lowest = [int(cc) for cc in candidates if not self._descendants[cc] & common]
+
+        # common ancestors all in one cycle: keep the deepest ones
+        if not lowest:
+            lowest = [int(cc) for cc in candidates]
+
+        depths = self.depths
+        return tuple(sorted(lowest, key=lambda cc: (-depths[cc], cc)))
+
+    def lowest_common_ancestors(self, node1, node2):
+        """
+        Lowest common ancestors of two nodes.
+
+        A common ancestor is lowest if none of its descendants is also a
+        common ancestor. A node counts as its own ancestor here, so the LCA
+        of a node and one of its descendants is the node itself.
+
+        Returns
+        -------
+        list
+            Lowest common ancestors, deepest first (empty if unrelated)
+        """
+        ia, ib = sorted((self._index[node1], self._index[node2]))
+        return [self._nodes[cc] for cc in self._lca_cached(ia, ib)]
+
+    def _path_indices(self, source, target):
+        """Shortest directed path between two node indices (BFS)."""
+        if source == target:
+            return (source,)
+        if not self._descendants[source] >> target & 1:
+            return None
+
+        # only visit nodes lying between source and target
+        allowed = self._descendants[source] & (self._ancestors[target] | (1 << target))
+
+        previous = {source: None}
+        queue = deque([source])
+        while queue:
+            ii = queue.popleft()
+            for child in self._children[ii]:
+                if child in previous or not allowed >> child & 1:
+                    continue
+                previous[child] = ii
+                if child == target:
+                    queue.clear()
+                    break
+                queue.append(child)
+
+        path = [target]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        return tuple(path[::-1])
+
+    def shortest_path(self, source, target):
+        """
+        Shortest derivation path from an ancestor to a descendant.
+
+        Returns
+        -------
+        list or None
+            Nodes from `source` to `target`, None if `target` does not
+            descend from `source`
+        """
+        path = self._path_cached(self._index[source], self._index[target])
+        return None if path is None else [self._nodes[cc] for cc in path]
+
+    def derivation_path(self, node1, node2):
+        """
+        Shortest path connecting two nodes through their genealogy.
+
+        If one node descends from the other, this is the directed path
+        between them; otherwise the path goes up from `node1` to the lowest
+        common ancestor minimizing the total length and down to `node2`.
+
+        Returns
+        -------
+        list or None
+            Nodes from `node1` to `node2`, None if they share no ancestor
+        """
+        ia, ib = self._index[node1], self._index[node2]
+
+        path = self._path_cached(ia, ib)
+        if path is None:
+            path = self._path_cached(ib, ia)
+            path = path[::-1] if path is not None else None
+
+        if path is None:
+            best = None
+            for lca in self._lca_cached(*sorted((ia, ib))):
+                up, down = self._path_cached(lca, ia), self._path_cached(lca, ib)
+                if up is None or down is None:
+                    continue
+                if best is None or len(up) + len(down) < len(best[0]) + len(best[1]):
+                    best = (up, down)
+            if best is None:
+                return None
+            path = best[0][::-1] + best[1][1:]
+
+        return [self._nodes[cc] for cc in path]
+
+    def _masks2matrix(self, masks, chunk_size=1024):
+        """Sparse boolean matrix with one row per mask."""
+        nnodes = len(self._nodes)
+        nbytes = (nnodes + 7) // 8
+
+        # unpack the bitsets in chunks of rows to bound memory
+        blocks = []
+        for start in range(0, len(masks), chunk_size):
+            chunk = masks[start:start + chunk_size]
+            packed = np.frombuffer(b"".join(mask.to_bytes(nbytes, "little") for mask in chunk),
+                                   dtype=np.uint8).reshape(len(chunk), nbytes)
+            bits = np.unpackbits(packed, axis=1, count=nnodes, bitorder="little")
+            blocks.append(sparse.csr_matrix(bits.astype(bool)))
+
+        if not blocks:
+            return sparse.csr_matrix((0, nnodes), dtype=bool)
+        return sparse.vstack(blocks, format="csr")
+
+    def ancestors_matrix(self, nodes=None):
+        """
+        Sparse node x ancestor membership matrix.
+
+        Parameters
+        ----------
+        nodes : list, optional
+            Row nodes. Defaults to all nodes of the index.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Boolean (len(nodes), len(index)) matrix, columns follow `nodes`
+            of the index
+        """
+        if nodes is None:
+            if "ancestors" not in self._matrices:
+                self._matrices["ancestors"] = self._masks2matrix(self._ancestors)
+            return self._matrices["ancestors"]
+        return self._masks2matrix([self.ancestors_mask(node) for node in nodes])
+
+    def descendants_matrix(self, nodes=None):
+        """
+        Sparse node x descendant membership matrix.
+
+        Parameters
+        ----------
+        nodes : list, optional
+            Row nodes. Defaults to all nodes of the index.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Boolean (len(nodes), len(index)) matrix, columns follow `nodes`
+            of the index
+        """
+        if nodes is None:
+            if "descendants" not in self._matrices:
+                self._matrices["descendants"] = self._masks2matrix(self._descendants)
+            return self._matrices["descendants"]
+        return self._masks2matrix([self.descendants_mask(node) for node in nodes])
+
+    def group_by_ancestor(self, nodes, ancestors=None):
+        """
+        Group nodes by their ancestors.
+
+        Parameters
+        ----------
+        nodes : list
+            Nodes to group
+        ancestors : list, optional
+            Candidate ancestors (e.g. all precursor solutions). Defaults to
+            every node with at least one descendant among `nodes`.
+
+        Returns
+        -------
+        dict
+            ancestor -> list of nodes descending from it, in input order
+        """
+        nodes = list(nodes)
+        matrix = self.ancestors_matrix(nodes).tocsc()
+
+        if ancestors is None:
+            columns = np.flatnonzero(matrix.getnnz(axis=0))
+        else:
+            columns = np.array([self._index[node] for node in ancestors], dtype=int)
+
+        groups = {}
+        for col in columns:
+            rows = matrix.indices[matrix.indptr[col]:matrix.indptr[col+1]]
+            groups[self._nodes[col]] = [nodes[row] for row in np.sort(rows)]
+
+        return groups
+
+    def aggregate(self, values, over="descendants", include_self=False):
+        """
+        Aggregate per-node values over the ancestors or descendants of every node.
+
+        Computed from the cached closure matrix (see module docstring), so
+        every related node is counted once whatever the number of paths.
+
+        Parameters
+        ----------
+        values : array_like
+            One value per node of the index, NaN where missing
+        over : str, optional
+            "descendants" (propagate up, e.g. films -> precursor) or
+            "ancestors" (propagate down). Default is "descendants".
+        include_self : bool, optional
+            Include the value of the node itself. Default is False.
+
+        Returns
+        -------
+        dict
+            count, sum, mean, std, min and max arrays, one value per node
+            (NaN where no value was aggregated)
+        """
+        if over not in ["descendants", "ancestors"]:
+            raise ValueError("`over` must be 'descendants' or 'ancestors'.")
+
+        values = np.asarray(values, dtype=float)
+        if values.shape != (len(self._nodes),):
+            raise ValueError(f"Expected {len(self._nodes)} values, got {values.shape}.")
+
+        matrix = self.descendants_matrix() if over == "descendants" else self.ancestors_matrix()
+        if include_self:
+            matrix = (matrix + sparse.identity(len(self._nodes), dtype=bool, format="csr")).tocsr()
+
+        # keep only columns with a value
+        valid  = np.isfinite(values)
+        matrix = matrix[:, valid].astype(float)
+        vals   = values[valid]
+
+        count = np.asarray(matrix.sum(axis=1)).ravel()
+        total = matrix @ vals
+        sumsq = matrix @ vals**2
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            std  = np.sqrt(np.clip(sumsq / count - mean**2, 0, None))
+
+        # min/max over the nonzeros of each row
+        vmin = np.full(len(self._nodes), np.nan)
+        vmax = np.full(len(self._nodes), np.nan)
+        rows = np.flatnonzero(np.diff(matrix.indptr))
+        if len(rows):
+            data = vals[matrix.indices]
+            starts = matrix.indptr[rows]
+            vmin[rows] = np.minimum.reduceat(data, starts)
+            vmax[rows] = np.maximum.reduceat(data, starts)
+
+        total[count == 0] = np.nan
+
+        return {"count": count.astype(int), "sum": total, "mean": mean,
+                "std": std, "min": vmin, "max": vmax}
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self._nodes)} nodes)"
@@ -13,10 +13,24 @@ Created on Tue Feb 4 2026
 import logging
 import networkx as nx
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+# numpy is my rock
+import numpy as np
+
+# internal modules
+from tksamples.graph.layout import LayeredLayout
+from tksamples.graph.compact import index_edges
 
 # Set up logger for this module
 logger = logging.getLogger(__name__)
 
+# above this many nodes, full-graph plots use the collection-based renderer
+FAST_RENDER_THRESHOLD = 500
+
+# largest automatic figure size of the collection-based renderer [inches]
+MAX_FAST_FIGSIZE = (48, 32)
+
 
 def plot_direct_neighbors(project, sample, figsize=None, node_size=None,
                           font_size=None, highlight_color='#f39c12'):
@@ -75,7 +89,7 @@ def plot_direct_neighbors(project, sample, figsize=None, node_size=None,
     fig, ax = plt.subplots(figsize=figsize)
 
     # Use hierarchical layout
-    pos = _hierarchical_layout(subgraph)
+    pos = _hierarchical_layout(subgraph, project)
 
     # Color nodes
     sample_type_colors = _get_default_colors()
@@ -163,7 +177,7 @@ def plot_ancestors(project, sample, figsize=None, node_size=None,
     fig, ax = plt.subplots(figsize=figsize)
 
     # Use hierarchical layout
-    pos = _hierarchical_layout(subgraph)
+    pos = _hierarchical_layout(subgraph, project)
 
     # Color nodes
     sample_type_colors = _get_default_colors()
@@ -251,7 +265,7 @@ def plot_descendants(project, sample, figsize=None, node_size=None,
     fig, ax = plt.subplots(figsize=figsize)
 
     # Use hierarchical layout
-    pos = _hierarchical_layout(subgraph)
+    pos = _hierarchical_layout(subgraph, project)
 
     # Color nodes
     sample_type_colors = _get_default_colors()
@@ -339,7 +353,7 @@ def plot_connected_component(project, sample, figsize=None, node_size=None,
     fig, ax = plt.subplots(figsize=figsize)
 
     # Use hierarchical layout
-    pos = _hierarchical_layout(subgraph)
+    pos = _hierarchical_layout(subgraph, project)
 
     # Color nodes
     sample_type_colors = _get_default_colors()
@@ -435,7 +449,7 @@ def plot_extended_family(project, sample, figsize=None, node_size=None,
     fig, ax = plt.subplots(figsize=figsize)
 
     # Use hierarchical layout
-    pos = _hierarchical_layout(subgraph)
+    pos = _hierarchical_layout(subgraph, project)
 
     # Color nodes
     sample_type_colors = _get_default_colors()
@@ -465,10 +479,16 @@ def plot_extended_family(project, sample, figsize=None, node_size=None,
 
 
 def plot_full_graph(project, figsize=None, node_size=None, font_size=None,
-                   layout='hierarchical', sample_type_colors=None):
+                   layout='hierarchical', sample_type_colors=None, renderer='auto',
+                   max_labels=None, rasterized=True):
     """
     Plot the complete genealogy graph for the project.
 
+    The "fast" renderer draws all nodes as a single scatter collection and
+    all edges as a single LineCollection (no arrows), labels only the nodes
+    that fit without overlapping and rasterizes nodes and edges, so that
+    projects with thousands of samples render in seconds.
+
     Parameters
     ----------
     project : CrucibleProject
@@ -483,16 +503,33 @@ def plot_full_graph(project, figsize=None, node_size=None, font_size=None,
         Layout algorithm: 'hierarchical', 'spring', 'circular', 'kamada_kawai'
     sample_type_colors : dict, optional
         Dictionary mapping sample_type to color
+    renderer : str, optional
+        'networkx', 'fast' or 'auto' (fast above FAST_RENDER_THRESHOLD
+        nodes). Default is 'auto'.
+    max_labels : int, optional
+        Maximum number of labels drawn by the fast renderer (after culling
+        overlapping ones). Default is no limit.
+    rasterized : bool, optional
+        Rasterize nodes and edges with the fast renderer. Default is True.
 
     Returns
     -------
     fig, ax
         Matplotlib figure and axis objects
     """
+    if renderer not in ['auto', 'networkx', 'fast']:
+        raise ValueError(f"Unknown renderer '{renderer}'.")
+
+    n_nodes = project.genealogy.number_of_nodes()
+    if renderer == 'fast' or (renderer == 'auto' and n_nodes > FAST_RENDER_THRESHOLD):
+        return _plot_full_graph_fast(project, figsize=figsize, node_size=node_size,
+                                     font_size=font_size, layout=layout,
+                                     sample_type_colors=sample_type_colors,
+                                     max_labels=max_labels, rasterized=rasterized)
+
     graph = project.graph
 
     # Auto-size figure and nodes based on number of nodes
-    n_nodes = graph.number_of_nodes()
     if figsize is None:
         figsize = _calculate_figsize(n_nodes)
     if node_size is None:
@@ -505,7 +542,7 @@ def plot_full_graph(project, figsize=None, node_size=None, font_size=None,
 
     # Choose layout
     if layout == 'hierarchical':
-        pos = _hierarchical_layout(graph)
+        pos = project.get_layout().positions()
     elif layout == 'spring':
         pos = nx.spring_layout(graph, seed=42)
     elif layout == 'circular':
@@ -548,6 +585,110 @@ def plot_full_graph(project, figsize=None, node_size=None, font_size=None,
     return fig, ax
 
 
+def _plot_full_graph_fast(project, figsize=None, node_size=None, font_size=None,
+                          layout='hierarchical', sample_type_colors=None,
+                          max_labels=None, rasterized=True):
+    """Collection-based renderer of plot_full_graph (see there)."""
+    genealogy = project.genealogy
+
+    # node positions as a (nnodes, 2) array
+    if layout == 'hierarchical':
+        glayout = project.get_layout()
+        nodes, xy = glayout.nodes, glayout.xy
+    else:
+        if layout == 'circular':
+            pos = nx.circular_layout(project.graph)
+        elif layout == 'kamada_kawai':
+            pos = nx.kamada_kawai_layout(project.graph)
+        else:
+            if layout != 'spring':
+                logger.warning(f"Unknown layout '{layout}', using spring layout")
+            pos = nx.spring_layout(project.graph, seed=42)
+        nodes = list(genealogy.nodes)
+        xy = np.array([pos[node] for node in nodes], dtype=float).reshape(-1, 2)
+
+    index = {node: cc for cc, node in enumerate(nodes)}
+    sources, targets = index_edges(genealogy, index)
+    n_nodes = len(nodes)
+
+    # Auto-size figure and nodes, within what can be rendered
+    if figsize is None:
+        width, height = _calculate_figsize(n_nodes)
+        figsize = (min(width, MAX_FAST_FIGSIZE[0]), min(height, MAX_FAST_FIGSIZE[1]))
+    if node_size is None:
+        node_size = _calculate_node_size(n_nodes)
+        if layout == 'hierarchical' and n_nodes:
+            # shrink nodes to fit the widest layer
+            spacing = 0.8 * figsize[0] * 72 / np.bincount(glayout.layers).max()
+            node_size = min(node_size, max(spacing**2, 1))
+    if font_size is None:
+        font_size = _calculate_font_size(n_nodes)
+
+    if sample_type_colors is None:
+        sample_type_colors = _get_default_colors()
+    node_colors = [sample_type_colors.get(node.sample_type, '#95a5a6') for node in nodes]
+
+    fig, ax = plt.subplots(figsize=figsize)
+
+    # all edges as one collection
+    edges = LineCollection(np.stack([xy[sources], xy[targets]], axis=1), colors='gray',
+                           linewidths=0.5, alpha=0.5, zorder=1, rasterized=rasterized)
+    ax.add_collection(edges)
+
+    # all nodes as one collection
+    ax.scatter(xy[:, 0], xy[:, 1], c=node_colors, s=node_size, zorder=2,
+               edgecolors='none', rasterized=rasterized)
+
+    # labels of the nodes that fit
+    for cc in _cull_labels(nodes, xy, figsize, font_size, max_labels=max_labels):
+        ax.text(xy[cc, 0], xy[cc, 1], nodes[cc].sample_name, fontsize=font_size,
+                ha='center', va='center', zorder=3)
+
+    # Add legend
+    from matplotlib.patches import Patch
+    legend_elements = [Patch(facecolor=color, label=stype)
+                      for stype, color in sample_type_colors.items()
+                      if stype in project.sample_types]
+    ax.legend(handles=legend_elements, loc='upper right')
+
+    ax.set_title(f"Full Genealogy Graph ({n_nodes} samples, {len(sources)} edges)")
+    ax.autoscale_view()
+    ax.axis('off')
+    plt.tight_layout()
+
+    return fig, ax
+
+
+def _cull_labels(nodes, xy, figsize, font_size, max_labels=None):
+    """
+    Indices of the nodes whose labels are drawn.
+
+    The plot is divided in cells of the size of a label and only the first
+    node of each cell is labeled, so that labels do not overlap.
+    """
+    if not len(nodes):
+        return np.zeros(0, dtype=np.int64)
+
+    # label footprint in points (approximate glyph width)
+    name_len = max(len(node.sample_name) for node in nodes)
+    label_w  = max(0.6 * font_size * name_len, 1)
+    label_h  = max(1.5 * font_size, 1)
+
+    span = np.ptp(xy, axis=0)
+    span[span == 0] = 1
+    points = (xy - xy.min(axis=0)) / span * np.array(figsize) * 72
+    cells  = np.floor(points / np.array([label_w, label_h])).astype(np.int64)
+
+    _, keep = np.unique(cells, axis=0, return_index=True)
+    keep = np.sort(keep)
+    if max_labels is not None:
+        keep = keep[:max_labels]
+
+    logger.debug(f"Labeling {len(keep)} of {len(nodes)} nodes")
+
+    return keep
+
+
 def _calculate_figsize(n_nodes):
     """
     Calculate appropriate figure size based on number of nodes.
@@ -644,23 +785,30 @@ def _get_default_colors():
     }
 
 
-def _hierarchical_layout(graph):
+def _hierarchical_layout(graph, project=None):
     """
     Create a hierarchical layout for a directed acyclic graph.
 
-    Uses graphviz dot layout if available for better results, otherwise
-    falls back to custom hierarchical positioning with improved spacing.
+    If a project is given, positions are taken from its cached full-graph
+    layout (consistent across plots, no recomputation). Otherwise uses
+    graphviz dot layout if available, falling back to the array-based
+    layered layout.
 
     Parameters
     ----------
     graph : networkx.DiGraph
         Directed graph
+    project : CrucibleProject, optional
+        Project whose cached layout is reused (graph must be a subgraph)
 
     Returns
     -------
     dict
         Dictionary mapping nodes to (x, y) positions
     """
+    if project is not None:
+        return project.get_layout().positions(graph.nodes())
+
     # Try to use graphviz for better hierarchical layout
     try:
         pos = nx.nx_agraph.graphviz_layout(graph, prog='dot')
@@ -679,86 +827,7 @@ def _hierarchical_layout(graph):
                    for node, (x, y) in pos.items()}
             return pos
     except (ImportError, AttributeError):
-        logger.debug("graphviz not available, using custom hierarchical layout")
-
-    # Fallback: Custom hierarchical layout with improved spacing
-    # Find all layers (using topological generations)
-    layers = {}
-    for node in nx.topological_sort(graph):
-        # Get the maximum layer of all parents + 1
-        parents = list(graph.predecessors(node))
-        if not parents:
-            layers[node] = 0  # Root node
-        else:
-            layers[node] = max(layers[p] for p in parents) + 1
-
-    # Group nodes by layer
-    layer_nodes = {}
-    for node, layer in layers.items():
-        if layer not in layer_nodes:
-            layer_nodes[layer] = []
-        layer_nodes[layer].append(node)
-
-    # Position nodes with better spacing
-    pos = {}
-    max_layer = max(layer_nodes.keys()) if layer_nodes else 0
-
-    # Calculate maximum width needed (based on widest layer)
-    max_width = max(len(nodes) for nodes in layer_nodes.values()) if layer_nodes else 1
-
-    for layer, nodes in layer_nodes.items():
-        y = 1.0 - (layer / max(max_layer, 1))  # Invert so roots are at top
-        n_nodes = len(nodes)
-
-        # Sort nodes by their average parent position for better alignment
-        sorted_nodes = _sort_nodes_by_parent_position(nodes, graph, pos)
-
-        # Use wider spacing to reduce cramming
-        # Center smaller layers
-        if n_nodes == 1:
-            positions = [0.5]
-        else:
-            # Calculate spacing based on number of nodes
-            # Use padding on sides and distribute evenly
-            padding = 0.1  # 10% padding on each side
-            available_width = 1.0 - 2 * padding
-            spacing = available_width / (n_nodes - 1) if n_nodes > 1 else 0
-            positions = [padding + i * spacing for i in range(n_nodes)]
-
-        for node, x in zip(sorted_nodes, positions):
-            pos[node] = (x, y)
-
-    return pos
-
-
-def _sort_nodes_by_parent_position(nodes, graph, pos):
-    """
-    Sort nodes by their parent positions to reduce edge crossings.
-
-    Parameters
-    ----------
-    nodes : list
-        Nodes to sort
-    graph : networkx.DiGraph
-        Graph containing the nodes
-    pos : dict
-        Current positions of already-placed nodes
-
-    Returns
-    -------
-    list
-        Sorted nodes
-    """
-    def get_parent_avg_x(node):
-        parents = list(graph.predecessors(node))
-        if not parents:
-            # No parents, sort by name
-            return (0, node.sample_name)
-        # Average x position of parents
-        parent_xs = [pos[p][0] for p in parents if p in pos]
-        if parent_xs:
-            return (sum(parent_xs) / len(parent_xs), node.sample_name)
-        else:
-            return (0, node.sample_name)
+        logger.debug("graphviz not available, using layered layout")
 
-    return sorted(nodes, key=get_parent_avg_x)
+    # Fallback: layered layout (topological generations, parent barycenters)
+    return LayeredLayout(graph).positions()
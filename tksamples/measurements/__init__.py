@@ -8,5 +8,7 @@ types including UV-Vis spectroscopy with support for data processing and analysi
 from .measurement import Measurement
 from .uvvis import NirvanaUVVis
 from .image import TFImage
+from .cube import SpectraCube
+from .series import UVVisSeries
 
-__all__ = ["Measurement", "NirvanaUVVis", "TFImage"]
\ No newline at end of file
+__all__ = ["Measurement", "NirvanaUVVis", "TFImage", "SpectraCube", "UVVisSeries"]
\ No newline at end of file
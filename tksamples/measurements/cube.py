@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SpectraCube: Memory-Mapped Spectra of a Sample Collection
+
+Stacks the UV-Vis spectra of a collection of samples into memory-mapped
+(sample, spot, wavelength) arrays for raw and corrected intensities,
+transmissions and absorbances, so that NumPy reductions can run over the
+full dataset without loading it into RAM.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import os
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# internal modules
+from tksamples.analysis.resample import SpectralResampler
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+cube_values = ["raw_intensities", "cor_intensities", "transmissions", "absorbances"]
+
+class SpectraCube(object):
+    """
+    Memory-mapped (sample, spot, wavelength) arrays of UV-Vis spectra.
+
+    Rows follow the order of the samples the cube was built from; samples
+    without a UV-Vis measurement and missing spots are filled with NaN.
+    Indexing with an int, a sample name or a slice returns a view sharing
+    the same memory maps (no copy).
+
+    Parameters
+    ----------
+    directory : str
+        Directory containing a cube written by `SpectraCube.from_samples`
+    mode : str, optional
+        Memory-map mode ("r" or "r+"). Default is "r".
+
+    Examples
+    --------
+    >>> cube = thin_films.get_spectra_cube("/scratch/tf_cube")
+    >>> mean_abs = np.nanmean(cube.absorbances, axis=1)
+    >>> cube["TF000123"].absorbances.shape
+    (1, 5, 2048)
+    """
+
+    def __init__(self, directory, mode="r"):
+
+        self._directory = directory
+
+        # small arrays are fully loaded
+        self._wavelengths  = np.load(os.path.join(directory, "wavelengths.npy"))
+        self._sample_names = np.load(os.path.join(directory, "sample_names.npy"))
+        self._nspots       = np.load(os.path.join(directory, "nspots.npy"))
+
+        # spectra arrays are memory-mapped
+        self._arrays = {value: np.load(os.path.join(directory, f"{value}.npy"),
+                                       mmap_mode=mode)
+                        for value in cube_values}
+
+        self._rows = slice(None)
+        self._setup_mapping()
+
+        return
+
+    @classmethod
+    def from_samples(cls, samples, directory, mtype="uvvis", dtype=np.float32,
+                     wavelengths=None, chunk_size=256):
+        """
+        Build a cube from the UV-Vis measurements of a sample collection.
+
+        The current energy range of each measurement is used. Unless a common
+        wavelength grid is given, all measurements must share the same
+        (masked) wavelength grid.
+
+        Parameters
+        ----------
+        samples : iterable of Sample
+            Samples, in the order the cube rows should follow
+        directory : str
+            Directory where the memory-mapped arrays are written
+        mtype : str, optional
+            Measurement type to read. Default is "uvvis".
+        dtype : numpy dtype, optional
+            Storage type of the spectra. Default is float32.
+        wavelengths : array_like, optional
+            Common wavelength grid to resample all spectra onto.
+        chunk_size : int, optional
+            Number of measurements resampled together. Default is 256.
+
+        Returns
+        -------
+        SpectraCube
+            The newly written cube, opened read-only
+        """
+        samples = list(samples)
+
+        # resample onto a common grid if requested
+        resampler = SpectralResampler(wavelengths) if wavelengths is not None else None
+
+        # find the common grid and the maximum number of spots
+        max_spots   = 0
+        measurements = []
+        for sample in samples:
+            measurement = sample.get_latest_measurement(mtype)
+            measurements.append(measurement)
+            if measurement is None:
+                continue
+            max_spots = max(max_spots, measurement.nspots)
+            if resampler is not None:
+                continue
+            if wavelengths is None:
+                wavelengths = measurement.wavelengths
+            elif not np.array_equal(wavelengths, measurement.wavelengths):
+                raise ValueError(f"{sample.sample_name}: wavelength grid differs "
+                                 "from the rest of the collection.")
+
+        if wavelengths is None or max_spots == 0:
+            raise ValueError(f"No '{mtype}' measurements found.")
+
+        os.makedirs(directory, exist_ok=True)
+
+        shape = (len(samples), max_spots, len(wavelengths))
+        arrays = {}
+        for value in cube_values:
+            arrays[value] = np.lib.format.open_memmap(
+                os.path.join(directory, f"{value}.npy"), mode="w+",
+                dtype=dtype, shape=shape)
+            arrays[value][:] = np.nan
+
+        # fill in chunks of samples, resampled in batch
+        nspots = np.zeros(len(samples), dtype=np.int32)
+        rows   = [cc for cc, measurement in enumerate(measurements) if measurement is not None]
+        for start in range(0, len(rows), chunk_size):
+            chunk  = rows[start:start + chunk_size]
+            mchunk = [measurements[cc] for cc in chunk]
+            for cc, measurement in zip(chunk, mchunk):
+                nspots[cc] = measurement.nspots
+            for value in cube_values:
+                if resampler is not None:
+                    values = resampler.resample_measurements(mchunk, value=value)
+                else:
+                    values = [getattr(measurement, value) for measurement in mchunk]
+                for cc, vv in zip(chunk, values):
+                    arrays[value][cc, :nspots[cc]] = vv
+
+        for array in arrays.values():
+            array.flush()
+        del arrays
+
+        np.save(os.path.join(directory, "wavelengths.npy"), np.asarray(wavelengths))
+        np.save(os.path.join(directory, "sample_names.npy"),
+                np.array([sample.sample_name for sample in samples], dtype=str))
+        np.save(os.path.join(directory, "nspots.npy"), nspots)
+
+        logger.info(f"Wrote spectra cube {shape} to {directory}")
+
+        return cls(directory)
+
+    def _setup_mapping(self):
+        self._index_by_name = {name: cc for cc, name in enumerate(self.sample_names)}
+        return
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def wavelengths(self):
+        return self._wavelengths
+
+    @property
+    def sample_names(self):
+        return self._sample_names[self._rows]
+
+    @property
+    def nspots(self):
+        return self._nspots[self._rows]
+
+    @property
+    def raw_intensities(self):
+        return self._arrays["raw_intensities"][self._rows]
+
+    @property
+    def cor_intensities(self):
+        return self._arrays["cor_intensities"][self._rows]
+
+    @property
+    def transmissions(self):
+        return self._arrays["transmissions"][self._rows]
+
+    @property
+    def absorbances(self):
+        return self._arrays["absorbances"][self._rows]
+
+    @property
+    def shape(self):
+        return self.absorbances.shape
+
+    def index(self, sample_name):
+        """Get the row index of a sample in the cube."""
+        try:
+            return self._index_by_name[sample_name]
+        except KeyError:
+            raise KeyError(f"Sample '{sample_name}' not in cube.")
+
+    def __len__(self):
+        return len(self.sample_names)
+
+    def __getitem__(self, index):
+        """
+        Get a view of the cube for a subset of samples.
+
+        Parameters
+        ----------
+        index : int, str or slice
+            Row position, sample name or slice of rows
+
+        Returns
+        -------
+        SpectraCube
+            View sharing the memory maps of this cube
+        """
+        if isinstance(index, str):
+            index = self.index(index)
+
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("Cube index out of range.")
+            index = slice(index, index + 1)
+        elif not isinstance(index, slice):
+            raise TypeError("Index must be either a string, slice, or an integer.")
+
+        # compose with the current row selection
+        rows = range(len(self._sample_names))[self._rows][index]
+
+        view = object.__new__(self.__class__)
+        view._directory    = self._directory
+        view._wavelengths  = self._wavelengths
+        view._sample_names = self._sample_names
+        view._nspots       = self._nspots
+        view._arrays       = self._arrays
+        view._rows         = slice(rows.start, rows.stop if rows.stop >= 0 else None,
+                                   rows.step)
+        view._setup_mapping()
+
+        return view
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} samples, {self.shape[1]} spots, {self.shape[2]} wavelengths)"
@@ -12,6 +12,7 @@ Created on Fri Jan 16 18:22:21 2026
 """
 
 import logging
+from datetime import datetime
 
 # internal modules
 from tksamples.core import CruxObj
@@ -82,6 +83,19 @@ class Measurement(CruxObj):
     def sample_mfid(self):
         return self._sample_mfid
     
+    @property
+    def measured_at(self):
+        """
+        Acquisition time of the measurement (naive datetime).
+
+        Parsed from the YYMMDD_HHMMSS prefix of the dataset name, falling back
+        to the dataset creation time.
+        """
+        try:
+            return datetime.strptime(self._dataset.get("dataset_name", "")[:13], "%y%m%d_%H%M%S")
+        except (TypeError, ValueError):
+            return self._creation_time.replace(tzinfo=None)
+
     @property
     def mtype(self):
         return self.measurement_type.lower()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Series: Time-Ordered UV-Vis Measurements of a Sample
+
+Stacks repeated UV-Vis measurements of the same sample (e.g. aging studies)
+into a (spot, wavelength, time) array and computes degradation metrics for
+all spots and times at once.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import logging
+
+# numpy is my rock
+import numpy as np
+from scipy.integrate import trapezoid
+
+# internal modules
+from tksamples.analysis.resample import SpectralResampler
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+class UVVisSeries(object):
+    """
+    Time-ordered series of UV-Vis measurements of one sample.
+
+    Measurements are sorted by acquisition time and their spectra stacked
+    into a (spots, wavelengths, times) array. Measurements on a different
+    wavelength grid are resampled onto the common grid; missing spots are
+    filled with NaN.
+
+    Parameters
+    ----------
+    measurements : list of NirvanaUVVis
+        Measurements of the same sample
+    wavelengths : array_like, optional
+        Common wavelength grid. Defaults to the grid of the first measurement.
+    value : str, optional
+        NirvanaUVVis property stacked. Default is "absorbances".
+
+    Examples
+    --------
+    >>> series = sample.get_measurement_series("uvvis")
+    >>> series.elapsed
+    array([ 0.,  7., 28.])
+    >>> series.relative_change(erange=(400, 750))[:, -1]
+    array([-0.12, -0.15, -0.11])
+    """
+
+    def __init__(self, measurements, wavelengths=None, value="absorbances"):
+
+        measurements = sorted(measurements, key=lambda mm: mm.measured_at)
+        if not measurements:
+            raise ValueError("Cannot build a series without measurements.")
+
+        self._measurements = measurements
+        self._value        = value
+
+        # resample only if grids differ
+        if wavelengths is None:
+            wavelengths = measurements[0].wavelengths
+            same_grid = all(np.array_equal(wavelengths, mm.wavelengths) for mm in measurements)
+        else:
+            same_grid = False
+
+        if same_grid:
+            values = [getattr(mm, value) for mm in measurements]
+        else:
+            resampler = SpectralResampler(wavelengths)
+            values = resampler.resample_measurements(measurements, value=value)
+
+        self._wavelengths = np.asarray(wavelengths, dtype=float)
+
+        # (spots, wavelengths, times) array
+        nspots = max(len(vv) for vv in values)
+        self._spectra = np.full((nspots, len(self._wavelengths), len(values)), np.nan)
+        for cc, vv in enumerate(values):
+            self._spectra[:len(vv), :, cc] = vv
+
+        return
+
+    @property
+    def measurements(self):
+        return list(self._measurements)
+
+    @property
+    def sample_name(self):
+        return self._measurements[0].sample_name
+
+    @property
+    def wavelengths(self):
+        return self._wavelengths
+
+    @property
+    def spectra(self):
+        """(spots, wavelengths, times) array of spectra."""
+        return self._spectra
+
+    @property
+    def nspots(self):
+        return self._spectra.shape[0]
+
+    @property
+    def ntimes(self):
+        return self._spectra.shape[2]
+
+    @property
+    def times(self):
+        """Acquisition times as datetime64 array."""
+        return np.array([mm.measured_at for mm in self._measurements], dtype="datetime64[s]")
+
+    @property
+    def elapsed(self):
+        """Time elapsed since the first measurement [days]."""
+        times = self.times
+        return (times - times[0]) / np.timedelta64(1, "D")
+
+    def _masked(self, erange=None):
+        if erange is None:
+            return self._wavelengths, self._spectra
+        emask = (self._wavelengths >= erange[0]) & (self._wavelengths <= erange[1])
+        return self._wavelengths[emask], self._spectra[:, emask, :]
+
+    def mean_spectra(self):
+        """(wavelengths, times) spot-averaged spectra."""
+        with np.errstate(invalid="ignore"):
+            return np.nanmean(self._spectra, axis=0)
+
+    def integrated(self, erange=None):
+        """
+        Spectra integrated over wavelength.
+
+        Parameters
+        ----------
+        erange : tuple, optional
+            (min, max) wavelength range [nm]
+
+        Returns
+        -------
+        np.ndarray
+            (spots, times) integrals
+        """
+        wavelengths, spectra = self._masked(erange)
+        return trapezoid(spectra, wavelengths, axis=1)
+
+    def relative_change(self, erange=None):
+        """(spots, times) change of the integrated spectra relative to the first time."""
+        integrated = self.integrated(erange=erange)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return integrated / integrated[:, :1] - 1
+
+    def spectral_distance(self, erange=None):
+        """(spots, times) RMS difference of the spectra from the first time."""
+        _, spectra = self._masked(erange)
+        diff = spectra - spectra[:, :, :1]
+        return np.sqrt(np.mean(diff**2, axis=1))
+
+    def peak_shift(self, erange=None):
+        """(spots, times) shift of the spectral maximum from the first time [nm]."""
+        wavelengths, spectra = self._masked(erange)
+        valid  = np.isfinite(spectra).any(axis=1)
+        peaks  = wavelengths[np.argmax(np.nan_to_num(spectra, nan=-np.inf), axis=1)]
+        peaks  = np.where(valid, peaks, np.nan)
+        return peaks - peaks[:, :1]
+
+    def degradation_rate(self, metric="relative_change", erange=None):
+        """
+        Linear rate of change of a metric over time, for each spot.
+
+        Parameters
+        ----------
+        metric : str, optional
+            "relative_change", "spectral_distance", "peak_shift" or
+            "integrated". Default is "relative_change".
+        erange : tuple, optional
+            (min, max) wavelength range [nm]
+
+        Returns
+        -------
+        np.ndarray
+            (spots,) least-squares slope per day, NaN with fewer than two
+            valid times
+        """
+        if metric not in ["relative_change", "spectral_distance", "peak_shift", "integrated"]:
+            raise ValueError(f"Unknown metric '{metric}'.")
+
+        values = getattr(self, metric)(erange=erange)
+        elapsed = np.broadcast_to(self.elapsed, values.shape)
+
+        valid  = np.isfinite(values)
+        npts   = valid.sum(axis=1)
+        tt     = np.where(valid, elapsed, 0)
+        yy     = np.where(valid, values, 0)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            tmean = tt.sum(axis=1) / npts
+            ymean = yy.sum(axis=1) / npts
+            dt    = np.where(valid, elapsed - tmean[:, None], 0)
+            slope = (dt * (yy - ymean[:, None])).sum(axis=1) / (dt**2).sum(axis=1)
+
+        return np.where(npts >= 2, slope, np.nan)
+
+    def __len__(self):
+        return self.ntimes
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.sample_name}, {self.ntimes} times, {self.nspots} spots)"
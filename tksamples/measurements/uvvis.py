@@ -21,11 +21,65 @@ from tksamples.measurements.measurement import Measurement
 
 #%%
 
+def reference_spectrum(intensities):
+    """Reduce a blank/dark reference to one spectrum (middle row if 2D)."""
+    if intensities is None:
+        return None
+    if intensities.ndim == 2:
+        npos = len(intensities)
+        intensities = intensities[npos//2]
+    return intensities
+
+def correct_intensities(raw_intensities, blank_intensities, dark_intensities, out=None):
+    """
+    Dark/blank correct raw intensities.
+
+    Works on a single measurement (spots, wavelengths) or on stacked spots of
+    many measurements, in which case blank and dark must be broadcastable to
+    the raw intensities. Operations are done in place on the outputs to limit
+    temporaries.
+
+    Parameters
+    ----------
+    out : tuple of np.ndarray, optional
+        (corrected intensities, transmissions, absorbances) float arrays of
+        the output shape to write the results into (e.g. views of larger
+        preallocated arrays). Default allocates new arrays.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (corrected intensities, transmissions, absorbances)
+    """
+    if out is None:
+        shape = np.broadcast_shapes(np.shape(raw_intensities), np.shape(blank_intensities),
+                                    np.shape(dark_intensities))
+        out = tuple(np.empty(shape, dtype=float) for _ in range(3))
+    cor_intensities, transmissions, absorbances = out
+
+    # corrected intensities (remove dark)
+    np.subtract(raw_intensities, dark_intensities, out=cor_intensities)
+    np.abs(cor_intensities, out=cor_intensities)
+
+    # corrected blank intensities
+    cor_blank_intensities = np.subtract(blank_intensities, dark_intensities, dtype=float)
+    np.abs(cor_blank_intensities, out=cor_blank_intensities)
+
+    # transmissions
+    np.divide(cor_intensities, cor_blank_intensities, out=transmissions)
+
+    # absorbances
+    np.log10(transmissions, out=absorbances)
+    np.negative(absorbances, out=absorbances)
+
+    return cor_intensities, transmissions, absorbances
+
 class NirvanaUVVis(Measurement):
     
     def __init__(self, dataset=None, sample_attrs=None, tray_well=None, wavelengths=None,
                  raw_intensities=None, blank_intensities=None, dark_intensities=None,
-                 erange=None, measurement_settings=None, carrier_attrs=None):
+                 erange=None, measurement_settings=None, carrier_attrs=None,
+                 corrected=None):
         
         # make safe copies to avoid shared references
         safe_sample_attrs = sample_attrs.copy() if sample_attrs is not None else {}
@@ -44,13 +98,18 @@ class NirvanaUVVis(Measurement):
         
         # set measurement data - make copies to avoid shared references
         self._wavelengths     = wavelengths.copy() if wavelengths is not None else None
-        self._raw_intensities = raw_intensities.copy() if raw_intensities is not None else None
         
         # initialize references
         self._set_blank_and_dark(blank_intensities, dark_intensities)
 
-        # calculate corrected intensities, transmissions, absorbances
-        self._initialize_uvvis()
+        # calculate corrected intensities, transmissions, absorbances, unless
+        # already computed for the whole tray (then keep views, no copies)
+        if corrected is None:
+            self._raw_intensities = raw_intensities.copy() if raw_intensities is not None else None
+            self._initialize_uvvis()
+        else:
+            self._raw_intensities = raw_intensities
+            self._cor_intensities, self._transmissions, self._absorbances = corrected
         
         # set sample position on carrier
         self._set_sample_position()
@@ -67,40 +126,20 @@ class NirvanaUVVis(Measurement):
     def _set_blank_and_dark(self, blank_intensities, dark_intensities):
 
         # make safe copies to avoid shared references
-        if blank_intensities is not None:
-            blank_copy = blank_intensities.copy()
-            if blank_copy.ndim == 2:
-                npos = len(blank_copy)
-                blank_copy = blank_copy[npos//2]
-            self._blank_intensities = blank_copy
-        else:
-            self._blank_intensities = None
-
-        if dark_intensities is not None:
-            dark_copy = dark_intensities.copy()
-            if dark_copy.ndim == 2:
-                npos = len(dark_copy)
-                dark_copy = dark_copy[npos//2]
-            self._dark_intensities = dark_copy
-        else:
-            self._dark_intensities = None
+        blank_copy = reference_spectrum(blank_intensities)
+        self._blank_intensities = blank_copy.copy() if blank_copy is not None else None
+
+        dark_copy = reference_spectrum(dark_intensities)
+        self._dark_intensities = dark_copy.copy() if dark_copy is not None else None
 
         return
     
     def _initialize_uvvis(self):
         
-        # get corrected intensities (remove dark)
-        self._cor_intensities = abs(np.clip(
-            self._raw_intensities - self._dark_intensities))
-        
-        # calculate transmissions
-        cor_blank_intensities = abs(np.clip(
-            self._blank_intensities - self._dark_intensities))
-        
-        self._transmissions = self._cor_intensities/cor_blank_intensities
-        
-        # calculcate absorbances
-        self._absorbances = -np.log10(self._transmissions)
+        # get corrected intensities, transmissions and absorbances
+        self._cor_intensities, self._transmissions, self._absorbances = \
+            correct_intensities(self._raw_intensities, self._blank_intensities,
+                                self._dark_intensities)
         
         return
     
@@ -8,6 +8,9 @@ Created on Fri Jan 30 15:40:15 2026
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgb
+
+from tksamples.plot.thumbnails import default_cache
 
 #%%
 
@@ -52,6 +55,23 @@ def center_crop_square(img, side):
     x0 = (w - side) // 2
     return img[y0:y0 + side, x0:x0 + side, ...]
 
+def compose_mosaic(thumbs, nrows, ncols, fill=0):
+    """
+    Assemble equally sized thumbnails row-major into one (nrows*size,
+    ncols*size[, C]) array, empty cells filled with `fill`.
+    """
+    thumbs = np.asarray(thumbs)
+    nimages, size = thumbs.shape[:2]
+    tail = thumbs.shape[3:]
+
+    cells = np.empty((nrows * ncols, size, size) + tail, dtype=thumbs.dtype)
+    cells[:nimages] = thumbs
+    cells[nimages:] = fill
+
+    cells = cells.reshape((nrows, ncols, size, size) + tail)
+    cells = np.swapaxes(cells, 1, 2)
+    return cells.reshape((nrows * size, ncols * size) + tail)
+
 def plot_tfilms_grid(
     tfilms,
     crop_side=None,              # int (pixels) or None => auto (min over all images)
@@ -60,75 +80,91 @@ def plot_tfilms_grid(
     facecolor="black",
     cmap="viridis",
     show_label=True,
+    thumb_size=None,             # int (pixels) or None => auto from fig_width and dpi
+    dpi=200,
+    cache=None,                  # ThumbnailCache or None => shared in-memory cache
 ):
     """
     Collects images from tfilms, center-crops to a common square, and plots on a grid
     whose rows/cols approximate target_ratio.
 
-    Returns: (fig, axes, valid_idxs, images_data)
+    Images are downsampled to cached thumbnails (see ThumbnailCache), just
+    large enough for the figure at `dpi`, and drawn as a single mosaic
+    with one imshow.
+
+    Returns: fig
     """
-    # Collect images + indices
-    images_data, valid_idxs = [], []
+    if cache is None:
+        cache = default_cache
+
+    # Collect images + indices (images are not decoded here)
+    images, valid_idxs = [], []
     for cc, tf in enumerate(tfilms):
         if getattr(tf, "image", None) is None:
             continue
-        images_data.append(np.array(tf.image.image))
+        images.append(tf.image)
         valid_idxs.append(cc)
 
-    nimages = len(images_data)
+    nimages = len(images)
     if nimages == 0:
         raise ValueError("No images found (all tf.image are None).")
 
-    # Decide crop size (square)
+    # Decide crop size (square), from the image headers
+    max_allowed = min(min(img.image.size) for img in images)
     if crop_side is None:
-        side = min(min(img.shape[0], img.shape[1]) for img in images_data)
+        side = max_allowed
     else:
         side = int(crop_side)
-        max_allowed = min(min(img.shape[0], img.shape[1]) for img in images_data)
         if side > max_allowed:
             raise ValueError(f"crop_side={side} exceeds smallest image side={max_allowed}.")
 
-    # Crop all to common centered square
-    images_data = [center_crop_square(img, side) for img in images_data]
-
     # Grid dims near target_ratio
     nrows, ncols = best_grid(nimages, target_ratio=target_ratio)
 
+    # Thumbnail size: one figure pixel per thumbnail pixel at dpi
+    if thumb_size is None:
+        thumb_size = int(np.ceil(fig_width * dpi / ncols))
+    size = max(1, min(int(thumb_size), side))
+
+    # grayscale mosaic only if all images are grayscale
+    grayscale = all(img.image.mode == "L" for img in images)
+    mode = "L" if grayscale else "RGB"
+
+    thumbs = [cache.get(img, side, size, mode=mode) for img in images]
+
+    # Pre-assembled mosaic, empty cells in the face color
+    if grayscale:
+        mosaic = compose_mosaic(np.asarray(thumbs, dtype=float), nrows, ncols, fill=np.nan)
+        mosaic = np.ma.masked_invalid(mosaic)
+    else:
+        fill = np.round(np.array(to_rgb(facecolor)) * 255).astype(np.uint8)
+        mosaic = compose_mosaic(thumbs, nrows, ncols, fill=fill)
+
     # Figure size consistent with target_ratio
     figsize = (fig_width, fig_width / target_ratio)
 
-    fig, axes = plt.subplots(nrows, ncols, figsize=figsize, facecolor=facecolor)
-    axes = np.atleast_1d(axes).ravel()
-
-    # turn off everything by default
-    for ax in axes:
-        ax.set_axis_off()
-        ax.set_facecolor(facecolor)
-
-    # Plot
-    for cc, (idx, img) in enumerate(zip(valid_idxs, images_data)):
-        ax = axes[cc]
-        if img.ndim == 3:
-            ax.imshow(img)
-        else:
-            ax.imshow(img, cmap=cmap)
-        
-        if show_label:
+    fig = plt.figure(figsize=figsize, facecolor=facecolor)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.set_facecolor(facecolor)
+
+    if grayscale:
+        ax.imshow(mosaic, cmap=cmap, interpolation="nearest")
+    else:
+        ax.imshow(mosaic, interpolation="nearest")
+
+    if show_label:
+        for cc, idx in enumerate(valid_idxs):
+            row, col = divmod(cc, ncols)
             tf_idx = int(tfilms[idx].sample_name[2:])
             ax.text(
-                0.02, 0.02, f"TF#{tf_idx}",
-                transform=ax.transAxes,
+                (col + 0.02) * size, (row + 0.98) * size, f"TF#{tf_idx}",
                 fontsize=4, color="black", weight="bold",
                 va="bottom", ha="left",
                 bbox=dict(boxstyle="round,pad=0.1", facecolor="white", alpha=0.8, edgecolor="none"),
             )
 
-    # Hide unused slots completely
-    for ax in axes[nimages:]:
-        ax.set_visible(False)
-
-    plt.subplots_adjust(left=0, bottom=0, right=1, top=1, hspace=0, wspace=0)
     fig.patch.set_facecolor(facecolor)
     plt.show()
 
-    return fig
\ No newline at end of file
+    return fig
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Thumbnails: Cached Downsampled Well Images
+
+Center-cropped, downsampled thumbnails of sample well images, cached in
+memory (and optionally on disk) by dataset ID, crop side and size, so that
+mosaics of thousands of wells never hold the full-resolution arrays.
+Smaller thumbnails are derived from the closest larger cached level of
+the same image (a thumbnail pyramid) instead of the full image.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import os
+import logging
+from io import BytesIO
+from collections import OrderedDict
+
+# numpy is my rock
+import numpy as np
+
+# image stuff
+from PIL import Image
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+def _open_source(image, side, size):
+    """
+    Decoder for a file- or buffer-backed image, separate from `image` so that
+    the full decoded image is not kept by the measurement. JPEGs are decoded
+    at a reduced scale (1/2 to 1/8) when the thumbnail allows it. Images
+    already decoded (or built in memory) are used as they are.
+
+    Returns the source image and its scale relative to `image`.
+    """
+    filename = getattr(image, "filename", None)
+    buffer   = getattr(image, "fp", None)
+    if filename and os.path.exists(filename):
+        source = Image.open(filename)
+    elif buffer is not None and hasattr(buffer, "getvalue"):
+        # not decoded yet: decode a copy of the encoded bytes
+        source = Image.open(BytesIO(buffer.getvalue()))
+    else:
+        return image, 1.0
+
+    if source.format == "JPEG":
+        reduce = max(1, min(8, side // size))
+        source.draft(source.mode, (image.size[0] // reduce, image.size[1] // reduce))
+
+    return source, source.size[0] / image.size[0]
+
+
+def make_thumbnail(image, side, size, mode=None):
+    """
+    Center-crop a PIL image to a (side, side) square and downsample it.
+
+    Parameters
+    ----------
+    image : PIL.Image.Image
+        Full-resolution image
+    side : int
+        Side of the centered square crop, in full-resolution pixels
+    size : int
+        Side of the thumbnail [pixels]
+    mode : str, optional
+        PIL mode to convert to (e.g., "RGB")
+
+    Returns
+    -------
+    np.ndarray
+        (size, size) or (size, size, C) uint8 array
+    """
+    width, height = image.size
+    if side > min(width, height):
+        raise ValueError(f"side={side} is larger than image ({height}, {width})")
+
+    source, scale = _open_source(image, side, size)
+
+    # crop box in source pixels
+    x0 = (width - side) // 2
+    y0 = (height - side) // 2
+    box = [int(round(vv * scale)) for vv in (x0, y0, x0 + side, y0 + side)]
+    thumb = source.crop(box)
+    if source is not image:
+        source.close()
+
+    # fast integer box reduction first, exact resampling after
+    factor = thumb.size[0] // size
+    if factor >= 2:
+        thumb = thumb.reduce(factor)
+    if thumb.size != (size, size):
+        thumb = thumb.resize((size, size), Image.LANCZOS)
+
+    if mode is not None and thumb.mode != mode:
+        thumb = thumb.convert(mode)
+
+    return np.asarray(thumb)
+
+
+class ThumbnailCache(object):
+    """
+    Cache of well image thumbnails.
+
+    Thumbnails are keyed by (dataset ID, crop side, size) and kept in an
+    in-memory LRU bounded by `max_bytes`. With a `cache_dir` they are also
+    stored as .npy files and reloaded by later sessions.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        Directory where thumbnails are stored on disk (in a "thumbnails"
+        subfolder). Default is memory only.
+    max_bytes : int, optional
+        Maximum memory used by cached thumbnails. Default is 512 MB.
+
+    Examples
+    --------
+    >>> cache = ThumbnailCache(cache_dir=samples._cache_dir)
+    >>> thumb = cache.get(tfilm.image, side=1000, size=64)
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=512 * 1024**2):
+
+        self._dir = None
+        if cache_dir is not None:
+            self._dir = os.path.join(cache_dir, "thumbnails")
+            os.makedirs(self._dir, exist_ok=True)
+
+        self._max_bytes = max_bytes
+        self._nbytes    = 0
+        self._thumbs    = OrderedDict()
+
+        # (dataset ID, crop side, mode) -> cached sizes
+        self._levels = {}
+
+        return
+
+    def _fname(self, key):
+        mfid, side, size, mode = key
+        return os.path.join(self._dir, f"{mfid}_{side}_{size}_{mode}.npy")
+
+    def _store(self, key, thumb):
+
+        self._thumbs[key] = thumb
+        self._nbytes += thumb.nbytes
+        self._levels.setdefault(key[:2] + key[3:], set()).add(key[2])
+
+        # evict least recently used
+        while self._nbytes > self._max_bytes and len(self._thumbs) > 1:
+            old_key, old = self._thumbs.popitem(last=False)
+            self._nbytes -= old.nbytes
+            self._levels[old_key[:2] + old_key[3:]].discard(old_key[2])
+
+        return
+
+    def get(self, measurement, side, size, mode=None):
+        """
+        Thumbnail of a well image.
+
+        Parameters
+        ----------
+        measurement : TFImage
+            Image measurement (its mfid is the dataset ID)
+        side : int
+            Side of the centered square crop, in full-resolution pixels
+        size : int
+            Side of the thumbnail [pixels]
+        mode : str, optional
+            PIL mode to convert to (e.g., "RGB")
+
+        Returns
+        -------
+        np.ndarray
+            (size, size) or (size, size, C) uint8 array
+        """
+        key = (measurement.mfid, int(side), int(size), mode)
+
+        if key in self._thumbs:
+            self._thumbs.move_to_end(key)
+            return self._thumbs[key]
+
+        if self._dir is not None and os.path.exists(self._fname(key)):
+            thumb = np.load(self._fname(key))
+            self._store(key, thumb)
+            return thumb
+
+        # downsample the closest larger level, if any, else the full image
+        larger = [ss for ss in self._levels.get(key[:2] + key[3:], ()) if ss > size]
+        if larger:
+            source = Image.fromarray(self._thumbs[key[:2] + (min(larger),) + key[3:]])
+            thumb  = make_thumbnail(source, source.size[0], size, mode=mode)
+        else:
+            thumb  = make_thumbnail(measurement.image, side, size, mode=mode)
+
+        if self._dir is not None:
+            np.save(self._fname(key), thumb)
+        self._store(key, thumb)
+
+        return thumb
+
+    def clear(self):
+        """Empty the in-memory cache (files on disk are kept)."""
+        self._thumbs.clear()
+        self._levels.clear()
+        self._nbytes = 0
+        return
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def __len__(self):
+        return len(self._thumbs)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({len(self)} thumbnails, {self._nbytes / 1024**2:.1f} MB)"
+
+
+# shared in-memory cache used by the mosaic plots
+default_cache = ThumbnailCache()
@@ -10,6 +10,10 @@ Created on Thu Feb  5 13:09:34 2026
 from tksamples import Sample
 from tksamples.collection import SampleCollection
 from tksamples.graph.graph import build_project_graph
+from tksamples.graph.compact import CompactGraph
+from tksamples.graph.reachability import ReachabilityIndex
+from tksamples.graph.cohort import CohortIndex
+from tksamples.graph.layout import LayeredLayout
 from tksamples.crucible.config import get_cache_dir
 
 # avoid circular import by importing inside method
@@ -19,21 +23,37 @@ from tksamples.crucible.config import get_cache_dir
 import logging
 logger = logging.getLogger(__name__)
 
-# graph operations
-import networkx as nx
+# numpy is my rock
+import numpy as np
 
 #%%
 
+lineage_dtype = np.dtype([
+    ("sample_name", "U32"),
+    ("sample_type", "U32"),
+    ("count",       np.int64),
+    ("sum",         float),
+    ("mean",        float),
+    ("std",         float),
+    ("min",         float),
+    ("max",         float),
+    ])
+
 class CrucibleProject(SampleCollection):
 
     def __init__(self, project_id, cache_dir=None, use_cache=True,
-                 overwrite_cache=False):
+                 overwrite_cache=False, graph_backend="networkx"):
 
         # store cache settings
         self._cache_dir = cache_dir if cache_dir is not None else str(get_cache_dir())
         self._use_cache = use_cache
         self._overwrite_cache = overwrite_cache
 
+        # genealogy graph representation: "networkx" or "compact" (CSR arrays)
+        if graph_backend not in ["networkx", "compact"]:
+            raise ValueError(f"Unknown graph backend '{graph_backend}', use 'networkx' or 'compact'.")
+        self._graph_backend = graph_backend
+
         # load datasets and samples and initialize parent
         self._load_datasets(project_id)
         samples = self._load_samples(project_id)
@@ -93,16 +113,21 @@ class CrucibleProject(SampleCollection):
     
     def _setup_mapping(self):
         """Extend parent mapping with sample type grouping."""
+        # group samples by type (filled by _map_sample)
+        self._samples_by_type = {}
+
         # Call parent mapping setup
         super()._setup_mapping()
 
-        # group samples by type
-        self._samples_by_type = {}
-        for sample in self._samples:
-            sample_type = sample.sample_type
-            if sample_type not in self._samples_by_type:
-                self._samples_by_type[sample_type] = []
-            self._samples_by_type[sample_type].append(sample)
+        return
+
+    def _map_sample(self, sample):
+        super()._map_sample(sample)
+
+        sample_type = sample.sample_type
+        if sample_type not in self._samples_by_type:
+            self._samples_by_type[sample_type] = []
+        self._samples_by_type[sample_type].append(sample)
 
         return
     
@@ -124,18 +149,169 @@ class CrucibleProject(SampleCollection):
             else:
                 logger.warn("Graph info inconsistent")
         
-        # build graph with networkx
-        self._graph = build_project_graph(self.samples)
+        # build graph with networkx, or as compact arrays (networkx on demand)
+        if self._graph_backend == "compact":
+            self._genealogy = CompactGraph(self.samples)
+        else:
+            self._genealogy = build_project_graph(self.samples)
+
+        # precompute ancestors/descendants of all samples
+        self._reachability = ReachabilityIndex(self._genealogy)
+
+        # group samples by parent set
+        self._cohorts = CohortIndex(self.samples)
+
+        # bumped at each graph update, used by derived caches
+        self._graph_version = 0
+
+        # plotting layout, computed on demand for the current graph version
+        self._layout = None
+        self._layout_version = None
                 
         return
 
+    def apply_graph_delta(self, samples=None, edges=None):
+        """
+        Apply new samples and edges to the genealogy without rebuilding it.
+
+        Sample links, the graph (either backend) and the reachability index
+        are updated in place. Edges are only added, never removed. An edge
+        is new if it is not in the graph, even if the Samples are already
+        linked, and links of new samples to project samples are added too.
+
+        Parameters
+        ----------
+        samples : list of Sample or dict, optional
+            New samples, as Sample objects or Crucible sample dictionaries.
+            Samples already in the project are skipped.
+        edges : list, optional
+            New parent -> child edges, as {"source": id, "target": id}
+            dictionaries (as in the project sample graph) or (parent, child)
+            pairs of Samples or unique_ids/names
+
+        Returns
+        -------
+        tuple of int
+            Number of samples and edges actually added
+
+        Examples
+        --------
+        >>> project = CrucibleProject("10k_perovskites")
+        >>> project.apply_graph_delta(edges=[("SOL0001", "TF009999")])
+        (0, 1)
+        """
+        # new samples
+        new_samples = []
+        for sample in samples or []:
+            if isinstance(sample, dict):
+                for dst in sample.get("datasets", []):
+                    dst.update(self._datasets_by_id.get(dst["unique_id"], {}))
+                sample = Sample(sample)
+            new_samples.append(sample)
+
+        added = self.add_samples(new_samples)
+        if added:
+            if isinstance(self._genealogy, CompactGraph):
+                self._genealogy.add_nodes(added)
+            else:
+                for sample in added:
+                    self._genealogy.add_node(sample, name=sample.sample_name,
+                                             type=sample.sample_type, mfid=sample.mfid)
+            self._reachability.add_nodes(added)
+            self._cohorts.add_samples(added)
+
+        # new edges, plus the links new samples already have to the project
+        candidates = list(edges or [])
+        for sample in added:
+            candidates.extend((parent, sample) for parent in sample._parents)
+            candidates.extend((sample, child) for child in sample._children)
+
+        new_edges, seen = [], set()
+        for edge in candidates:
+            if isinstance(edge, dict):
+                edge = (edge["source"], edge["target"])
+            resolved = self._resolve_samples(edge)
+            if len(resolved) != 2:
+                logger.warning(f"Graph info inconsistent, skipping edge {edge}")
+                continue
+            parent, child = resolved
+            # the graph decides what is new: Sample links may predate the delta
+            if (parent, child) in seen or self._genealogy.has_edge(parent, child):
+                continue
+            seen.add((parent, child))
+            child.add_parent(parent)
+            new_edges.append((parent, child))
+
+        if new_edges:
+            if isinstance(self._genealogy, CompactGraph):
+                self._genealogy.add_edges(new_edges)
+            else:
+                self._genealogy.add_edges_from(new_edges)
+            for parent, child in new_edges:
+                self._reachability.add_edge(parent, child)
+                self._cohorts.add_edge(parent, child)
+
+        if added or new_edges:
+            self._graph_version += 1
+            logger.info(f"Added {len(added)} samples and {len(new_edges)} edges to the genealogy")
+
+        return len(added), len(new_edges)
+
+    def sync_graph(self):
+        """
+        Fetch the project samples and sample graph and apply what is new.
+
+        Returns
+        -------
+        tuple of int
+            Number of samples and edges added
+        """
+        new_samples = [dst_sample for dst_sample in self._get_project_samples(self.project_id)
+                       if dst_sample["unique_id"] not in self._samples_by_id]
+
+        graph = self._get_project_graph()
+
+        return self.apply_graph_delta(samples=new_samples, edges=graph.get("edges", []))
+
     @property
     def datasets(self):
         return self._datasets
     
     @property
     def graph(self):
-        return self._graph
+        """Genealogy graph as networkx DiGraph (built on demand for the compact backend)."""
+        if isinstance(self._genealogy, CompactGraph):
+            return self._genealogy.to_networkx()
+        return self._genealogy
+
+    def get_layout(self):
+        """
+        Get the layered layout of the genealogy graph.
+
+        Computed once per graph version and reused by all genealogy plots.
+
+        Returns
+        -------
+        LayeredLayout
+        """
+        if self._layout is None or self._layout_version != self._graph_version:
+            self._layout = LayeredLayout(self._genealogy)
+            self._layout_version = self._graph_version
+        return self._layout
+
+    @property
+    def graph_version(self):
+        """Number of incremental updates applied to the genealogy graph."""
+        return self._graph_version
+
+    @property
+    def genealogy(self):
+        """Genealogy graph in the backend representation (DiGraph or CompactGraph)."""
+        return self._genealogy
+
+    @property
+    def reachability(self):
+        return self._reachability
 
     def get_samples_by_type(self, sample_type):
         """
@@ -195,7 +371,7 @@ class CrucibleProject(SampleCollection):
         """
         Get all ancestor samples using the project graph.
 
-        Uses networkx to efficiently find all ancestors in the genealogy graph.
+        Uses the precomputed reachability index of the genealogy graph.
 
         Parameters
         ----------
@@ -220,18 +396,17 @@ class CrucibleProject(SampleCollection):
                 logger.warning(f"Sample '{sample}' not found")
                 return []
 
-        if sample not in self._graph:
+        if sample not in self._reachability:
             logger.debug(f"Sample {sample.sample_name} not in genealogy graph")
             return []
 
-        ancestor_samples = nx.ancestors(self._graph, sample)
-        return list(ancestor_samples)
+        return self._reachability.ancestors(sample)
 
     def get_descendants(self, sample):
         """
         Get all descendant samples using the project graph.
 
-        Uses networkx to efficiently find all descendants in the genealogy graph.
+        Uses the precomputed reachability index of the genealogy graph.
 
         Parameters
         ----------
@@ -256,12 +431,11 @@ class CrucibleProject(SampleCollection):
                 logger.warning(f"Sample '{sample}' not found")
                 return []
 
-        if sample not in self._graph:
+        if sample not in self._reachability:
             logger.debug(f"Sample {sample.sample_name} not in genealogy graph")
             return []
 
-        descendant_samples = nx.descendants(self._graph, sample)
-        return list(descendant_samples)
+        return self._reachability.descendants(sample)
 
     def get_common_ancestors(self, sample1, sample2):
         """
@@ -299,15 +473,71 @@ class CrucibleProject(SampleCollection):
                 logger.warning(f"Sample '{sample2}' not found")
                 return []
 
-        if sample1 not in self._graph or sample2 not in self._graph:
+        if sample1 not in self._reachability or sample2 not in self._reachability:
             logger.debug(f"One or both samples not in genealogy graph")
             return []
 
-        ancestors1 = nx.ancestors(self._graph, sample1)
-        ancestors2 = nx.ancestors(self._graph, sample2)
-        common_samples = ancestors1.intersection(ancestors2)
+        return self._reachability.common_ancestors(sample1, sample2)
+
+    def get_lowest_common_ancestors(self, sample1, sample2):
+        """
+        Find the nearest common ancestors of two samples.
+
+        Parameters
+        ----------
+        sample1 : Sample or str
+            First sample object or unique_id/name
+        sample2 : Sample or str
+            Second sample object or unique_id/name
+
+        Returns
+        -------
+        list of Sample
+            Common ancestors none of whose descendants is also a common
+            ancestor, deepest first. A sample counts as its own ancestor, so
+            the result is `sample1` if `sample2` descends from it.
+
+        Examples
+        --------
+        >>> project = CrucibleProject("10k_perovskites")
+        >>> project.get_lowest_common_ancestors("TF0001", "TF0002")
+        [Sample(SOL0001)]
+        """
+        resolved = self._resolve_samples([sample1, sample2])
+        if len(resolved) != 2:
+            return []
+        return self._reachability.lowest_common_ancestors(*resolved)
+
+    def get_derivation_path(self, sample1, sample2):
+        """
+        Get the shortest derivation path connecting two samples.
+
+        If one sample descends from the other, the path follows the
+        parent -> child links between them; otherwise it goes up from
+        `sample1` to their nearest common ancestor and down to `sample2`.
 
-        return list(common_samples)
+        Parameters
+        ----------
+        sample1 : Sample or str
+            First sample object or unique_id/name
+        sample2 : Sample or str
+            Second sample object or unique_id/name
+
+        Returns
+        -------
+        list of Sample or None
+            Samples from `sample1` to `sample2`, None if they are unrelated
+
+        Examples
+        --------
+        >>> project = CrucibleProject("10k_perovskites")
+        >>> project.get_derivation_path("TF0001", "TF0002")
+        [Sample(TF0001), Sample(SOL0001), Sample(TF0002)]
+        """
+        resolved = self._resolve_samples([sample1, sample2])
+        if len(resolved) != 2:
+            return None
+        return self._reachability.derivation_path(*resolved)
 
     def get_siblings(self, sample):
         """
@@ -336,22 +566,60 @@ class CrucibleProject(SampleCollection):
                 logger.warning(f"Sample '{sample}' not found")
                 return []
 
-        if sample not in self._graph:
+        if sample not in self._reachability:
             logger.debug(f"Sample {sample.sample_name} not in genealogy graph")
             return []
 
-        # Get all parents
-        parents = list(self._graph.predecessors(sample))
+        return self._cohorts.siblings(sample)
+
+    def get_cohort(self, sample, include_self=False):
+        """
+        Get samples made from exactly the same parents ("same recipe").
+
+        Parameters
+        ----------
+        sample : Sample or str
+            Sample object or unique_id/name
+        include_self : bool, optional
+            Include the sample itself. Default is False.
+
+        Returns
+        -------
+        list of Sample
+            Samples with the same parent set
+
+        Examples
+        --------
+        >>> project = CrucibleProject("10k_perovskites")
+        >>> same_recipe = project.get_cohort("TF0001")
+        """
+        resolved = self._resolve_samples([sample])
+        if not resolved:
+            return []
+        return self._cohorts.cohort(resolved[0], include_self=include_self)
+
+    def get_cohorts(self, sample_type=None, min_size=1):
+        """
+        Group samples by identical parent sets.
 
-        # Get all children of those parents
-        siblings = set()
-        for parent in parents:
-            siblings.update(self._graph.successors(parent))
+        Parameters
+        ----------
+        sample_type : str, optional
+            Only keep samples of this type (e.g., "thin film")
+        min_size : int, optional
+            Minimum number of samples per group. Default is 1.
 
-        # Remove the sample itself
-        siblings.discard(sample)
+        Returns
+        -------
+        dict
+            frozenset of parent Samples -> list of Samples
 
-        return list(siblings)
+        Examples
+        --------
+        >>> project = CrucibleProject("10k_perovskites")
+        >>> recipes = project.get_cohorts("thin film", min_size=2)
+        """
+        return self._cohorts.cohorts(sample_type=sample_type, min_size=min_size)
 
     def get_samples_with_ancestor(self, ancestor):
         """
@@ -377,6 +645,209 @@ class CrucibleProject(SampleCollection):
         """
         return self.get_descendants(ancestor)
     
+    # Batch genealogy queries
+
+    def _resolve_samples(self, samples):
+        """Map Sample objects or unique_ids/names to Samples in the graph."""
+        resolved = []
+        for sample in samples:
+            if isinstance(sample, str):
+                key = sample
+                sample = self._samples_by_id.get(key, self._samples_by_name.get(key))
+                if sample is None:
+                    logger.warning(f"Sample '{key}' not found")
+                    continue
+            if sample not in self._reachability:
+                logger.debug(f"Sample {sample.sample_name} not in genealogy graph")
+                continue
+            resolved.append(sample)
+        return resolved
+
+    def get_ancestors_matrix(self, samples=None):
+        """
+        Get the ancestors of many samples as a sparse membership matrix.
+
+        Parameters
+        ----------
+        samples : list of Sample or str, optional
+            Samples (or unique_ids/names) of the rows. Default is all samples
+            in the genealogy graph.
+
+        Returns
+        -------
+        tuple
+            (rows, matrix): list of row Samples and boolean sparse matrix
+            whose columns follow `project.reachability.nodes`
+
+        Examples
+        --------
+        >>> project = CrucibleProject("10k_perovskites")
+        >>> films = project.get_samples_by_type("thin film")
+        >>> rows, matrix = project.get_ancestors_matrix(films)
+        """
+        if samples is None:
+            return self._reachability.nodes, self._reachability.ancestors_matrix()
+        rows = self._resolve_samples(samples)
+        return rows, self._reachability.ancestors_matrix(rows)
+
+    def get_descendants_matrix(self, samples=None):
+        """
+        Get the descendants of many samples as a sparse membership matrix.
+
+        Parameters
+        ----------
+        samples : list of Sample or str, optional
+            Samples (or unique_ids/names) of the rows. Default is all samples
+            in the genealogy graph.
+
+        Returns
+        -------
+        tuple
+            (rows, matrix): list of row Samples and boolean sparse matrix
+            whose columns follow `project.reachability.nodes`
+        """
+        if samples is None:
+            return self._reachability.nodes, self._reachability.descendants_matrix()
+        rows = self._resolve_samples(samples)
+        return rows, self._reachability.descendants_matrix(rows)
+
+    def get_ancestors_batch(self, samples, sample_type=None):
+        """
+        Get the ancestors of many samples at once.
+
+        Parameters
+        ----------
+        samples : list of Sample or str
+            Sample objects or unique_ids/names
+        sample_type : str, optional
+            Only return ancestors of this type (e.g., "solution")
+
+        Returns
+        -------
+        dict
+            Sample -> list of ancestor Samples
+
+        Examples
+        --------
+        >>> project = CrucibleProject("10k_perovskites")
+        >>> films = project.get_samples_by_type("thin film")
+        >>> solutions = project.get_ancestors_batch(films, sample_type="solution")
+        """
+        rows, matrix = self.get_ancestors_matrix(samples)
+        nodes = self._reachability.nodes
+
+        if sample_type is not None:
+            keep = np.array([node.sample_type == sample_type for node in nodes], dtype=bool)
+            matrix = matrix[:, keep]
+            nodes = [node for node, kk in zip(nodes, keep) if kk]
+
+        return {sample: [nodes[col] for col in matrix.indices[matrix.indptr[row]:matrix.indptr[row+1]]]
+                for row, sample in enumerate(rows)}
+
+    def group_by_ancestor(self, samples, ancestor_type=None):
+        """
+        Group samples by their ancestors (e.g., films by precursor batch).
+
+        Parameters
+        ----------
+        samples : list of Sample or str
+            Sample objects or unique_ids/names to group
+        ancestor_type : str, optional
+            Only group by ancestors of this type (e.g., "solution")
+
+        Returns
+        -------
+        dict
+            Ancestor Sample -> list of samples descending from it
+
+        Examples
+        --------
+        >>> project = CrucibleProject("10k_perovskites")
+        >>> films = project.get_samples_by_type("thin film")
+        >>> batches = project.group_by_ancestor(films, ancestor_type="solution")
+        """
+        ancestors = None
+        if ancestor_type is not None:
+            ancestors = [sample for sample in self.get_samples_by_type(ancestor_type)
+                         if sample in self._reachability]
+
+        groups = self._reachability.group_by_ancestor(self._resolve_samples(samples),
+                                                      ancestors=ancestors)
+
+        # drop ancestors without descendants among the samples
+        return {ancestor: group for ancestor, group in groups.items() if group}
+
+    def _metric_values(self, metric):
+        """One metric value per node of the reachability index (NaN if missing)."""
+        nodes  = self._reachability.nodes
+        values = np.full(len(nodes), np.nan)
+
+        if callable(metric):
+            for cc, sample in enumerate(nodes):
+                try:
+                    value = metric(sample)
+                except (AttributeError, KeyError, ValueError):
+                    continue
+                if value is not None:
+                    values[cc] = value
+            return values
+
+        for key, value in metric.items():
+            sample = self._resolve_samples([key])
+            if sample and value is not None:
+                values[self._reachability.index(sample[0])] = value
+
+        return values
+
+    def aggregate_lineage(self, metric, over="descendants", sample_type=None,
+                          include_self=False):
+        """
+        Aggregate a per-sample metric over the genealogy of every sample.
+
+        Values are summed over the transitive closure of the graph at once,
+        so each sample gets count, sum, mean, std, min and max of the metric
+        over all of its descendants (or ancestors).
+
+        Parameters
+        ----------
+        metric : dict or callable
+            Sample (or unique_id/name) -> value, or function of a Sample
+            returning a value (None, or raising AttributeError/KeyError/
+            ValueError, for samples without it)
+        over : str, optional
+            "descendants" or "ancestors". Default is "descendants".
+        sample_type : str, optional
+            Only return the results of samples of this type
+        include_self : bool, optional
+            Include the metric of the sample itself. Default is False.
+
+        Returns
+        -------
+        np.ndarray
+            Structured array with fields sample_name, sample_type, count,
+            sum, mean, std, min and max, one row per sample
+
+        Examples
+        --------
+        >>> project = CrucibleProject("10k_perovskites")
+        >>> inhomogeneity = lambda sample: sample.uvvis.get_inhomogeneity().mean()
+        >>> table = project.aggregate_lineage(inhomogeneity, sample_type="solution")
+        """
+        values = self._metric_values(metric)
+        stats  = self._reachability.aggregate(values, over=over, include_self=include_self)
+
+        nodes = self._reachability.nodes
+        table = np.zeros(len(nodes), dtype=lineage_dtype)
+        table["sample_name"] = [node.sample_name for node in nodes]
+        table["sample_type"] = [node.sample_type for node in nodes]
+        for key, stat in stats.items():
+            table[key] = stat
+
+        if sample_type is not None:
+            table = table[table["sample_type"] == sample_type]
+
+        return table
+
     def __repr__(self):
         """Return string representation of the collection."""
         return f"{self.__class__.__name__}({self.project_id} | {self.nsamples} samples)"
\ No newline at end of file
@@ -1,10 +1,16 @@
 """
 Read module for tksamples
 
-Contains functions for reading and parsing HDF5 files.
+Contains functions for reading and parsing HDF5 files, and for writing
+and reading the consolidated UV-Vis store.
 """
 
 from .h5tosample import h5_to_samples
 from .tfparser import get_thin_films_from_crucible
+from .store import (write_uvvis_store, read_uvvis_store, read_uvvis_metadata,
+                    iter_uvvis_store)
+from .live import LiveTrayReader
 
-__all__ = ["h5_to_samples", "get_thin_films_from_crucible"]
\ No newline at end of file
+__all__ = ["h5_to_samples", "get_thin_films_from_crucible",
+           "write_uvvis_store", "read_uvvis_store", "read_uvvis_metadata",
+           "iter_uvvis_store", "LiveTrayReader"]
\ No newline at end of file
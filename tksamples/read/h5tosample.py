@@ -13,9 +13,11 @@ Created on Mon Dec 22 15:24:53 2025
 
 # pn
 import numpy as np
+from io import BytesIO
+from uuid import uuid4
 
 # internal modules
-from tksamples.measurements.uvvis import NirvanaUVVis
+from tksamples.measurements.uvvis import NirvanaUVVis, reference_spectrum, correct_intensities
 from tksamples.utils.auxiliary import number_to_well
 
 # echfive
@@ -23,6 +25,41 @@ import h5py
 
 #%%
 
+def open_h5(h5filename):
+    """
+    Open an HDF5 file for reading.
+
+    In-memory files (BytesIO or bytes) are opened as file images with the
+    core driver, so that reads happen in HDF5 rather than through Python
+    file-like callbacks.
+
+    Parameters
+    ----------
+    h5filename : str, BytesIO or bytes
+        Path of the file or in-memory file content
+
+    Returns
+    -------
+    h5py.File
+        The opened file (read-only)
+    """
+    if isinstance(h5filename, BytesIO):
+        image = h5filename.getbuffer()
+    elif isinstance(h5filename, (bytes, bytearray, memoryview)):
+        image = h5filename
+    else:
+        return h5py.File(h5filename, 'r')
+
+    # file access with in-memory core driver, HDF5 copies the image
+    fapl = h5py.h5p.create(h5py.h5p.FILE_ACCESS)
+    fapl.set_fapl_core(backing_store=False)
+    fapl.set_file_image(image)
+
+    # unique name: HDF5 reuses an open file with the same name
+    fid = h5py.h5f.open(uuid4().hex.encode(), h5py.h5f.ACC_RDONLY, fapl=fapl)
+
+    return h5py.File(fid)
+
 def h5_to_samples(dataset, h5filename, erange=None):
     try:
         samples = h5_to_samples_new(dataset, h5filename, erange=erange)
@@ -54,58 +91,127 @@ def attrs2uvvis(dataset, sample_attrs, tray_well, wavelengths, raw_intensities,
     
     return uvvis_sample
 
-def h5_to_samples_new(dataset, h5filename, erange=None):
+def positions2uvvis(dataset, positions, wavelengths, erange,
+                    measurement_settings, carrier_attrs):
+    """
+    Build NirvanaUVVis objects for all positions of a tray at once.
+
+    The spots of all positions are stacked in preallocated arrays and
+    dark/blank corrected in place, with the blank reference computed once per
+    position; each position then receives views of the stacked arrays.
+
+    Parameters
+    ----------
+    positions : list of tuple
+        (sample_attrs, tray_well, raw_intensities, blank_intensities,
+        dark_intensities) for each position
+    """
+    if not positions:
+        return []
+    
+    # stack spots of all positions, blank and dark once per position
+    raw_all   = np.concatenate([np.atleast_2d(pos[2]) for pos in positions]).astype(float)
+    blank_all = np.array([reference_spectrum(pos[3]) for pos in positions], dtype=float)
+    dark_all  = np.array([reference_spectrum(pos[4]) for pos in positions], dtype=float)
+    
+    # spots of each position
+    nspots  = np.array([len(np.atleast_2d(pos[2])) for pos in positions])
+    offsets = np.concatenate([[0], np.cumsum(nspots)])
     
+    # correct in place, references broadcast over the spots of each position
+    cor_all   = np.empty_like(raw_all)
+    trans_all = np.empty_like(raw_all)
+    abs_all   = np.empty_like(raw_all)
+    for cc in range(len(positions)):
+        spots = slice(offsets[cc], offsets[cc+1])
+        correct_intensities(raw_all[spots], blank_all[cc], dark_all[cc],
+                            out=(cor_all[spots], trans_all[spots], abs_all[spots]))
     
-    with h5py.File(h5filename, 'r') as h5file:
+    # hand views to each position
+    samples_list = []
+    for cc, (sample_attrs, tray_well, _, _, _) in enumerate(positions):
         
-        # get carrier information
-        carrier_attrs = dict(h5file.attrs)
+        spots = slice(offsets[cc], offsets[cc+1])
         
-        # get wavelengths (same for all measurments)
-        try:
-            wavelengths = h5file['measurement/pollux_oospec_multipos_line_scan/wavelengths'][()]
-        except:
-            wavelengths = h5file['wavelengths'][()]
+        uvvis_sample = NirvanaUVVis(
+            dataset=dataset,
+            sample_attrs=sample_attrs,
+            tray_well=tray_well,
+            wavelengths=wavelengths,
+            raw_intensities=raw_all[spots],
+            blank_intensities=blank_all[cc],
+            dark_intensities=dark_all[cc],
+            erange=erange,
+            measurement_settings=measurement_settings,
+            carrier_attrs=carrier_attrs,
+            corrected=(cor_all[spots], trans_all[spots], abs_all[spots])
+            )
         
-        # get measurements settings
-        try:
-            measurement_settings = dict(h5file['measurement/pollux_oospec_multipos_line_scan/settings'].attrs)
-        except:
-            measurement_settings = dict(h5file['settings'].attrs)
+        samples_list.append(uvvis_sample)
+    
+    return samples_list
+
+def read_tray_info_new(h5file):
+    """Read carrier attributes, wavelengths and settings of a new format file."""
+    
+    # get carrier information
+    carrier_attrs = dict(h5file.attrs)
+    
+    # get wavelengths (same for all measurments)
+    try:
+        wavelengths = h5file['measurement/pollux_oospec_multipos_line_scan/wavelengths'][()]
+    except:
+        wavelengths = h5file['wavelengths'][()]
+    
+    # get measurements settings
+    try:
+        measurement_settings = dict(h5file['measurement/pollux_oospec_multipos_line_scan/settings'].attrs)
+    except:
+        measurement_settings = dict(h5file['settings'].attrs)
+    
+    return carrier_attrs, wavelengths, measurement_settings
+
+def read_position_new(h5group, poskey):
+    """Read attributes and intensities of a single position (new format)."""
+    
+    # get sample attributes
+    sample_attrs = dict(h5group[poskey].attrs)
+    
+    # get raw intensities
+    raw_intensities = h5group[poskey]['raw_intensities'][()]
+
+    # get blank intensities
+    blank_intensities = h5group[poskey]['blank_intensities'][()]
+    
+    # get dark intensities
+    dark_intensities = h5group[poskey]['dark_intensities'][()]
+    
+    tray_well = number_to_well(int(poskey.split("_")[1]))
+    
+    return sample_attrs, tray_well, raw_intensities, blank_intensities, dark_intensities
+
+def h5_to_samples_new(dataset, h5filename, erange=None):
+    
+    
+    with open_h5(h5filename) as h5file:
+        
+        # get carrier information, wavelengths and settings
+        carrier_attrs, wavelengths, measurement_settings = read_tray_info_new(h5file)
         
         # isolate relevant H5 group and get list of positions
         h5group   = h5file['measurement/pollux_oospec_multipos_line_scan/positions']
         
-        # read each position and return NirvanaUVVis object
-        samples_list = []
-        for poskey in h5group:
-            
-            # get sample attributes
-            sample_attrs = dict(h5group[poskey].attrs)
-            
-            # get raw intensities
-            raw_intensities = h5group[poskey]['raw_intensities'][()]
-
-            # get blank intensities
-            blank_intensities = h5group[poskey]['blank_intensities'][()]
-            
-            # get dark intensities
-            dark_intensities = h5group[poskey]['dark_intensities'][()]
-            
-            tray_well = number_to_well(int(poskey.split("_")[1]))
-            
-            uvvis_sample = attrs2uvvis(dataset, sample_attrs, tray_well,
-                                       wavelengths, raw_intensities,
-                                       blank_intensities, dark_intensities,
-                                       erange, measurement_settings, carrier_attrs)
-            
-            samples_list.append(uvvis_sample)
+        # read each position
+        positions = [read_position_new(h5group, poskey) for poskey in h5group]
+        
+    # return NirvanaUVVis objects, corrected tray-wise
+    samples_list = positions2uvvis(dataset, positions, wavelengths, erange,
+                                   measurement_settings, carrier_attrs)
                 
     return samples_list
 
 def h5_to_samples_old(dataset, h5filename, erange=None):
-    with h5py.File(h5filename, 'r') as h5file:
+    with open_h5(h5filename) as h5file:
         
         # get carrier information
         carrier_attrs = dict(h5file.attrs)
@@ -119,8 +225,8 @@ def h5_to_samples_old(dataset, h5filename, erange=None):
         # isolate relevant H5 group and get list of positions
         h5group   = h5file['measurement/pollux_oospec_multipos_line_scan/positions']
         
-        # read each position and return NirvanaUVVis object
-        samples_list = []
+        # read each position
+        positions = []
         for poskey in h5group:
             
             if "Dark" in poskey:
@@ -159,12 +265,13 @@ def h5_to_samples_old(dataset, h5filename, erange=None):
             if "integration_time" not in sample_attrs:
                 sample_attrs["integration_time"] = float(measurement_settings["spec_integration_time"])
             
-            # make it an object
-            uvvis_sample = attrs2uvvis(dataset, sample_attrs, tray_well,
-                                       wavelengths, raw_intensities,
-                                       blank_intensities, dark_intensities,
-                                       erange, measurement_settings, carrier_attrs)
-            
-            samples_list.append(uvvis_sample)
+            positions.append((sample_attrs, tray_well, raw_intensities))
+    
+    # same blank and dark for all positions
+    positions = [pos + (blank_intensities, dark_intensities) for pos in positions]
+    
+    # return NirvanaUVVis objects, corrected tray-wise
+    samples_list = positions2uvvis(dataset, positions, wavelengths, erange,
+                                   measurement_settings, carrier_attrs)
     
     return samples_list
\ No newline at end of file
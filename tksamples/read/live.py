@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Live Reader: Incremental Ingestion of In-Progress H5 Files
+
+Reads tray files that are still being written by the line-scan instrument
+and returns only the positions written since the previous poll as
+NirvanaUVVis objects. The file is re-opened at every poll: SWMR
+(single-writer/multiple-reader) readers only see existing datasets grow,
+while groups created by the writer become visible when the file is opened
+again.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import time
+import logging
+
+# numpy is my rock
+import numpy as np
+
+# echfive
+import h5py
+
+# internal modules
+from tksamples.read.h5tosample import attrs2uvvis, read_tray_info_new, read_position_new
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+# datasets a position needs before it is considered written
+_position_datasets = ("raw_intensities", "blank_intensities", "dark_intensities")
+
+class LiveTrayReader(object):
+    """
+    Incremental reader for a tray H5 file (new format) that is being written.
+
+    Each call to `poll` re-opens the file (in SWMR mode when possible): the
+    re-open is what makes positions added by the writer visible, SWMR only
+    lets already open datasets grow. Only positions that are complete and
+    have not been returned before are parsed. A position is complete when
+    all its datasets exist and every spot holds data other than the fill
+    value, so preallocated datasets are not read before they are written.
+
+    Parameters
+    ----------
+    dataset : dict
+        Crucible dataset information attached to the measurements
+    h5filename : str
+        Path of the H5 file being written
+    erange : tuple, optional
+        Wavelength range assigned to the measurements
+
+    Examples
+    --------
+    >>> reader = LiveTrayReader(dataset, "/data/tray_52.h5")
+    >>> for new_positions in reader.stream(interval=10, timeout=3600):
+    ...     for uvvis in new_positions:
+    ...         print(uvvis.sample_name, uvvis.absorbances.mean())
+    """
+
+    def __init__(self, dataset, h5filename, erange=None):
+
+        self._dataset    = dataset
+        self._h5filename = h5filename
+        self._erange     = erange
+
+        # positions already returned
+        self._parsed = set()
+
+        return
+
+    @property
+    def parsed_positions(self):
+        """Get the position keys that were already parsed."""
+        return sorted(self._parsed)
+
+    @property
+    def nparsed(self):
+        return len(self._parsed)
+
+    def _open(self):
+        try:
+            return h5py.File(self._h5filename, 'r', libver='latest', swmr=True)
+        except OSError:
+            # file not written in SWMR mode (e.g. old superblock), plain read
+            return h5py.File(self._h5filename, 'r')
+
+    @staticmethod
+    def _is_written(h5dataset):
+        """Check that every spot (row) of a dataset holds non-fill values."""
+        if h5dataset.size == 0:
+            return False
+
+        data = np.atleast_2d(h5dataset[()])
+        fillvalue = h5dataset.fillvalue
+        if np.isnan(fillvalue):
+            written = np.isfinite(data)
+        else:
+            written = data != fillvalue
+
+        return bool(written.any(axis=1).all())
+
+    @staticmethod
+    def _is_complete(h5group, poskey):
+        """Check that all datasets of a position exist and were written."""
+        for key in _position_datasets:
+            if key not in h5group[poskey]:
+                return False
+            h5dataset = h5group[poskey][key]
+            if h5dataset.file.swmr_mode:
+                h5dataset.refresh()
+            if not LiveTrayReader._is_written(h5dataset):
+                return False
+        return True
+
+    def poll(self):
+        """
+        Parse the positions written since the last poll.
+
+        Returns
+        -------
+        list of NirvanaUVVis
+            Measurements of the newly written positions (may be empty)
+        """
+        try:
+            h5file = self._open()
+        except OSError as e:
+            logger.debug(f"Cannot open {self._h5filename} yet: {e}")
+            return []
+
+        samples_list = []
+        with h5file:
+
+            try:
+                h5group = h5file['measurement/pollux_oospec_multipos_line_scan/positions']
+            except KeyError:
+                return []
+
+            new_positions = [poskey for poskey in h5group
+                             if poskey not in self._parsed
+                             and self._is_complete(h5group, poskey)]
+            if not new_positions:
+                return []
+
+            carrier_attrs, wavelengths, measurement_settings = read_tray_info_new(h5file)
+
+            for poskey in new_positions:
+
+                sample_attrs, tray_well, raw_intensities, blank_intensities, \
+                    dark_intensities = read_position_new(h5group, poskey)
+
+                uvvis_sample = attrs2uvvis(self._dataset, sample_attrs, tray_well,
+                                           wavelengths, raw_intensities,
+                                           blank_intensities, dark_intensities,
+                                           self._erange, measurement_settings,
+                                           carrier_attrs)
+
+                samples_list.append(uvvis_sample)
+                self._parsed.add(poskey)
+
+        logger.info(f"{self._h5filename}: {len(samples_list)} new positions "
+                    f"({self.nparsed} total)")
+
+        return samples_list
+
+    def stream(self, interval=5.0, timeout=None):
+        """
+        Poll the file repeatedly and yield the new positions.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between polls. Default is 5.
+        timeout : float, optional
+            Stop after this many seconds. Default polls forever.
+
+        Yields
+        ------
+        list of NirvanaUVVis
+            Measurements of the newly written positions, only when non-empty
+        """
+        start = time.monotonic()
+        while True:
+            new_positions = self.poll()
+            if new_positions:
+                yield new_positions
+            if timeout is not None and time.monotonic() - start >= timeout:
+                return
+            time.sleep(interval)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self._h5filename} | {self.nparsed} positions)"
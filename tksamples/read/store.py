@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+UV-Vis Store: Consolidated HDF5 Spectral Store
+
+Consolidates parsed NirvanaUVVis measurements from many trays into a single
+chunked, compressed HDF5 file (one spectra array indexed by measurement,
+spot and wavelength plus a columnar metadata table) and rebuilds
+NirvanaUVVis objects from it.
+
+Created on Mon Oct 19 2026
+@author: roncofaber
+"""
+
+import json
+import logging
+
+# pn
+import numpy as np
+
+# echfive
+import h5py
+
+# internal modules
+from tksamples.measurements.uvvis import NirvanaUVVis
+
+# Set up logger for this module
+logger = logging.getLogger(__name__)
+
+#%%
+
+STORE_FORMAT  = "tksamples-uvvis-store"
+STORE_VERSION = 1
+
+# metadata columns stored as JSON strings (free-form dictionaries)
+_json_columns = ["dataset", "sample_attrs", "measurement_settings", "carrier_attrs"]
+
+
+def _json_default(obj):
+    """Make numpy and bytes values JSON serializable."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, bytes):
+        return obj.decode(errors="replace")
+    return str(obj)
+
+
+def _wavelength_grids(measurements):
+    """Deduplicate wavelength grids, returns (grids, grid index per measurement)."""
+    grids, grid_index, seen = [], [], {}
+    for measurement in measurements:
+        wavelengths = np.asarray(measurement._wavelengths, dtype=float)
+        key = (wavelengths.shape, wavelengths.tobytes())
+        if key not in seen:
+            seen[key] = len(grids)
+            grids.append(wavelengths)
+        grid_index.append(seen[key])
+    return grids, np.array(grid_index, dtype=np.int32)
+
+
+def write_uvvis_store(measurements, filename, compression="gzip",
+                      compression_opts=4):
+    """
+    Write UV-Vis measurements to a consolidated HDF5 store.
+
+    Parameters
+    ----------
+    measurements : list of NirvanaUVVis
+        Measurements to consolidate
+    filename : str
+        Path of the HDF5 store to create (overwritten if it exists)
+    compression : str, optional
+        HDF5 compression filter. Default is "gzip".
+    compression_opts : int, optional
+        Compression level. Default is 4.
+
+    Returns
+    -------
+    str
+        The path of the written store
+    """
+    measurements = list(measurements)
+    if not measurements:
+        raise ValueError("No measurements to write.")
+
+    nmeas = len(measurements)
+    grids, grid_index = _wavelength_grids(measurements)
+    nwl   = max(len(grid) for grid in grids)
+    nspots = np.array([len(mm._raw_intensities) for mm in measurements], dtype=np.int32)
+    max_spots = int(nspots.max())
+
+    compress = dict(compression=compression, compression_opts=compression_opts) \
+        if compression is not None else {}
+
+    with h5py.File(filename, "w") as h5file:
+
+        h5file.attrs["format"]  = STORE_FORMAT
+        h5file.attrs["version"] = STORE_VERSION
+
+        # wavelength grids, padded with NaN
+        wl_grids = np.full((len(grids), nwl), np.nan)
+        for cc, grid in enumerate(grids):
+            wl_grids[cc, :len(grid)] = grid
+        h5file.create_dataset("wavelengths", data=wl_grids)
+        h5file.create_dataset("grid_length", data=[len(grid) for grid in grids])
+
+        # spectra arrays, one chunk per measurement
+        spectra = h5file.create_group("spectra")
+        raw = spectra.create_dataset(
+            "raw_intensities", shape=(nmeas, max_spots, nwl), dtype=float,
+            chunks=(1, max_spots, nwl), fillvalue=np.nan, **compress)
+        blank = spectra.create_dataset(
+            "blank_intensities", shape=(nmeas, nwl), dtype=float,
+            chunks=(min(nmeas, 64), nwl), fillvalue=np.nan, **compress)
+        dark = spectra.create_dataset(
+            "dark_intensities", shape=(nmeas, nwl), dtype=float,
+            chunks=(min(nmeas, 64), nwl), fillvalue=np.nan, **compress)
+
+        for cc, measurement in enumerate(measurements):
+            ns, nw = measurement._raw_intensities.shape
+            raw[cc, :ns, :nw] = measurement._raw_intensities
+            blank[cc, :nw]    = measurement._blank_intensities
+            dark[cc, :nw]     = measurement._dark_intensities
+
+        # metadata table (one column per dataset)
+        table = h5file.create_group("metadata")
+        table.create_dataset("nspots", data=nspots)
+        table.create_dataset("grid_index", data=grid_index)
+        table.create_dataset("erange", data=np.array(
+            [measurement._erange for measurement in measurements], dtype=float))
+
+        columns = {
+            "sample_name" : [mm.sample_name for mm in measurements],
+            "sample_uuid" : [mm.sample_mfid for mm in measurements],
+            "dataset_id"  : [mm.mfid for mm in measurements],
+            "tray_well"   : [mm.tray_well for mm in measurements],
+            "dataset"     : [mm._dataset for mm in measurements],
+            "sample_attrs": [mm.sample_attrs for mm in measurements],
+            "measurement_settings": [mm.measurement_settings for mm in measurements],
+            "carrier_attrs": [mm.carrier_attrs for mm in measurements],
+            }
+
+        for key, values in columns.items():
+            if key in _json_columns:
+                values = [json.dumps(value, default=_json_default) for value in values]
+            else:
+                values = ["" if value is None else str(value) for value in values]
+            table.create_dataset(key, data=values, dtype=h5py.string_dtype(),
+                                 **compress)
+
+    logger.info(f"Wrote {nmeas} UV-Vis measurements to {filename}")
+
+    return filename
+
+
+def read_uvvis_metadata(filename):
+    """
+    Read the metadata table of a consolidated UV-Vis store.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the HDF5 store
+
+    Returns
+    -------
+    dict
+        Dictionary mapping column names to numpy arrays (JSON columns are
+        returned as raw strings)
+    """
+    with h5py.File(filename, "r") as h5file:
+        _check_store(h5file)
+        table = h5file["metadata"]
+        metadata = {}
+        for key in table:
+            if h5py.check_string_dtype(table[key].dtype) is not None:
+                metadata[key] = table[key].asstr()[()]
+            else:
+                metadata[key] = table[key][()]
+    return metadata
+
+
+def read_uvvis_store(filename, sample_names=None, erange=None):
+    """
+    Build NirvanaUVVis objects from a consolidated UV-Vis store.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the HDF5 store
+    sample_names : iterable of str, optional
+        Only return measurements of these samples. Default returns all.
+    erange : tuple, optional
+        Wavelength range to assign to the measurements. Defaults to the
+        range stored with each measurement.
+
+    Returns
+    -------
+    list of NirvanaUVVis
+        Measurements in store order
+    """
+    with h5py.File(filename, "r") as h5file:
+        _check_store(h5file)
+        table = h5file["metadata"]
+
+        # select rows of interest
+        names = table["sample_name"].asstr()[()]
+        if sample_names is None:
+            rows = np.arange(len(names))
+        else:
+            rows = np.flatnonzero(np.isin(names, list(sample_names)))
+
+        if len(rows) == 0:
+            return []
+
+        measurements = _read_rows(h5file, rows, erange)
+
+    return measurements
+
+
+def iter_uvvis_store(filename, chunk_size=256, erange=None):
+    """
+    Iterate over a consolidated UV-Vis store in chunks of measurements.
+
+    Only one chunk of spectra is held in memory at a time.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the HDF5 store
+    chunk_size : int, optional
+        Number of measurements per chunk. Default is 256.
+    erange : tuple, optional
+        Wavelength range to assign to the measurements
+
+    Yields
+    ------
+    list of NirvanaUVVis
+        Measurements of the chunk, in store order
+    """
+    with h5py.File(filename, "r") as h5file:
+        _check_store(h5file)
+        nmeas = len(h5file["metadata/nspots"])
+        for start in range(0, nmeas, chunk_size):
+            rows = np.arange(start, min(start + chunk_size, nmeas))
+            yield _read_rows(h5file, rows, erange)
+
+
+def _read_rows(h5file, rows, erange=None):
+    """Build NirvanaUVVis objects for increasing row indices of an open store."""
+    table = h5file["metadata"]
+
+    # read everything needed in one go (h5py needs increasing indices)
+    wl_grids    = h5file["wavelengths"][()]
+    grid_length = h5file["grid_length"][()]
+    nspots      = table["nspots"][rows]
+    grid_index  = table["grid_index"][rows]
+    eranges     = table["erange"][rows]
+    tray_wells  = table["tray_well"].asstr()[rows]
+    raw_all     = h5file["spectra/raw_intensities"][rows]
+    blank_all   = h5file["spectra/blank_intensities"][rows]
+    dark_all    = h5file["spectra/dark_intensities"][rows]
+    json_cols   = {key: table[key].asstr()[rows] for key in _json_columns}
+
+    measurements = []
+    for cc in range(len(rows)):
+
+        nwl = grid_length[grid_index[cc]]
+        ns  = nspots[cc]
+
+        uvvis = NirvanaUVVis(
+            dataset=json.loads(json_cols["dataset"][cc]),
+            sample_attrs=json.loads(json_cols["sample_attrs"][cc]),
+            tray_well=tray_wells[cc],
+            wavelengths=wl_grids[grid_index[cc], :nwl],
+            raw_intensities=raw_all[cc, :ns, :nwl],
+            blank_intensities=blank_all[cc, :nwl],
+            dark_intensities=dark_all[cc, :nwl],
+            erange=list(eranges[cc]) if erange is None else erange,
+            measurement_settings=json.loads(json_cols["measurement_settings"][cc]),
+            carrier_attrs=json.loads(json_cols["carrier_attrs"][cc]),
+            )
+        measurements.append(uvvis)
+
+    return measurements
+
+
+def _check_store(h5file):
+    if h5file.attrs.get("format") != STORE_FORMAT:
+        raise ValueError(f"{h5file.filename} is not a tksamples UV-Vis store.")
+    return
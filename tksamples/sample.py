@@ -11,6 +11,8 @@ Created on Wed Jan  7 17:53:17 2026
 """
 
 import logging
+import weakref
+from collections import deque
 
 # internal modules
 from tksamples.core import CruxObj
@@ -20,6 +22,10 @@ logger = logging.getLogger(__name__)
 
 #%%
 
+def is_more_recent(measurement, current):
+    """Check if a measurement is at least as recent as the current one."""
+    return current is None or measurement.measured_at >= current.measured_at
+
 class Sample(CruxObj):
     
     def __init__(self, dataset, measurements=None, **kwargs):
@@ -36,16 +42,23 @@ class Sample(CruxObj):
                          dtype         = "sample",
                          )
 
-        # Set to track measurement types
+        # collections indexing the measurements of this sample
+        self._collections = weakref.WeakSet()
+
+        # measurements by type and dataset ID, and latest measurement by type
         self._measurements = {}
         self._mtypes       = {}
+
+        # measurements only used in time series (e.g. aging scans)
+        self._series_measurements = {}
         if measurements is not None:
             for measurement in measurements.copy():
                 self.add_measurement(measurement)
 
         # Initialize parent/child relationships for genealogy tracking
-        self._parents = []
-        self._children = []
+        # (dicts used as insertion-ordered sets)
+        self._parents = {}
+        self._children = {}
 
         return
     
@@ -65,27 +78,88 @@ class Sample(CruxObj):
     def description(self):
         return self._dataset["description"]
     
-    def add_measurement(self, new_measurement):
-        """Add a measurement to thin film."""
+    def add_measurement(self, new_measurement, series_only=False):
+        """
+        Add a measurement to thin film.
+
+        Several measurements of the same type are kept (e.g. repeated UV-Vis
+        scans); a measurement from the same dataset as an existing one
+        replaces it. The most recent measurement of each type is also
+        reachable as an attribute (e.g. `sample.uvvis`).
+
+        Measurements added with `series_only` (e.g. aging scans) are only
+        used by `get_measurement_series`: they never become the latest
+        measurement and are not indexed by collections.
+        """
         
         # assign measurement
         new_measurement._assign_to_sample(self)
         
+        mtype = new_measurement.mtype
+        if series_only:
+            self._series_measurements.setdefault(mtype, {})[new_measurement.mfid] = new_measurement
+            return
+
         # add to data structure
-        self._measurements[new_measurement.mtype] = new_measurement
-        self._mtypes[new_measurement.mtype] = new_measurement
+        self._measurements.setdefault(mtype, {})[new_measurement.mfid] = new_measurement
+        if is_more_recent(new_measurement, self._mtypes.get(mtype)):
+            self._mtypes[mtype] = new_measurement
+
+        # keep the indices of the collections up to date
+        for collection in self._collections:
+            collection._index_measurement(self, new_measurement)
         
         return
 
+    def get_measurement_series(self, mtype="uvvis", **kwargs):
+        """
+        Get the time-ordered series of measurements of a given type.
+
+        The series includes the measurements added as series only.
+
+        Parameters
+        ----------
+        mtype : str, optional
+            Measurement type. Default is "uvvis".
+        **kwargs
+            Passed to the series class (e.g. wavelengths, value)
+
+        Returns
+        -------
+        UVVisSeries
+            Measurements of the sample sorted by acquisition time
+        """
+        # avoid circular import
+        from tksamples.measurements.series import UVVisSeries
+
+        measurements = dict(self._measurements.get(mtype, {}))
+        measurements.update(self._series_measurements.get(mtype, {}))
+        measurements = list(measurements.values())
+        if not measurements:
+            raise ValueError(f"{self.sample_name}: no '{mtype}' measurements.")
+
+        return UVVisSeries(measurements, **kwargs)
+
     def get_measurements(self, mtype=""):
-        """Get all measurements filtered by type."""
+        """Get all measurements filtered by type, as a {mfid: measurement} dictionary."""
         if mtype:
-            return {key: value for key, value in self._measurements.items() if value.mtype == mtype}
-        return self._measurements
+            return dict(self._measurements.get(mtype, {}))
+        return {mfid: measurement for measurements in self._measurements.values()
+                for mfid, measurement in measurements.items()}
+
+    def get_latest_measurement(self, mtype):
+        """Get the most recent measurement of a given type (None if missing)."""
+        return self._mtypes.get(mtype)
     
+    @property
+    def measurement_types(self):
+        """Get list of measurement types with at least one (non-series) measurement."""
+        return list(self._mtypes)
+
     @property
     def measurements(self):
-        return list(self._measurements.values())
+        return [measurement for measurements in self._measurements.values()
+                for measurement in measurements.values()]
 
     def add_parent(self, parent_sample, _skip_reciprocal=False):
         """
@@ -99,7 +173,7 @@ class Sample(CruxObj):
             The parent sample object (e.g., a precursor solution)
         """
         if parent_sample not in self._parents:
-            self._parents.append(parent_sample)
+            self._parents[parent_sample] = None
             
             if not _skip_reciprocal:
                 parent_sample.add_child(self, _skip_reciprocal=True)
@@ -117,7 +191,7 @@ class Sample(CruxObj):
             The child sample object (e.g., a thin film derived from this sample)
         """
         if child_sample not in self._children:
-            self._children.append(child_sample)
+            self._children[child_sample] = None
 
             if not _skip_reciprocal:
                 child_sample.add_parent(self, _skip_reciprocal=True)
@@ -126,18 +200,18 @@ class Sample(CruxObj):
     @property
     def parents(self):
         """Get list of direct parent samples."""
-        return self._parents
+        return list(self._parents)
 
     @property
     def children(self):
         """Get list of direct child samples."""
-        return self._children
+        return list(self._children)
 
     def get_all_ancestors(self):
         """
         Get all ancestor samples by traversing parent relationships.
 
-        Recursively traverses parent links to find all ancestors
+        Traverses parent links breadth-first to find all ancestors
         (parents, grandparents, etc.).
 
         Returns
@@ -152,15 +226,16 @@ class Sample(CruxObj):
         >>> print(f"Found {len(ancestors)} ancestors")
         """
         ancestors = []
-        visited = set()
-        queue = list(self._parents)
+        visited = set(self._parents)
+        queue = deque(self._parents)
 
         while queue:
-            current = queue.pop(0)
-            if id(current) not in visited:
-                visited.add(id(current))
-                ancestors.append(current)
-                queue.extend(current.parents)
+            current = queue.popleft()
+            ancestors.append(current)
+            for relative in current._parents:
+                if relative not in visited:
+                    visited.add(relative)
+                    queue.append(relative)
 
         return ancestors
 
@@ -168,7 +243,7 @@ class Sample(CruxObj):
         """
         Get all descendant samples by traversing child relationships.
 
-        Recursively traverses child links to find all descendants
+        Traverses child links breadth-first to find all descendants
         (children, grandchildren, etc.).
 
         Returns
@@ -183,15 +258,16 @@ class Sample(CruxObj):
         >>> print(f"Solution produced {len(descendants)} descendants")
         """
         descendants = []
-        visited = set()
-        queue = list(self._children)
+        visited = set(self._children)
+        queue = deque(self._children)
 
         while queue:
-            current = queue.pop(0)
-            if id(current) not in visited:
-                visited.add(id(current))
-                descendants.append(current)
-                queue.extend(current.children)
+            current = queue.popleft()
+            descendants.append(current)
+            for relative in current._children:
+                if relative not in visited:
+                    visited.add(relative)
+                    queue.append(relative)
 
         return descendants
 
@@ -11,12 +11,19 @@ Created on Tue Jan 20 11:17:33 2026
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # internal modules
 from tksamples.collection import SampleCollection
 from tksamples import Sample
+from tksamples.measurements.cube import SpectraCube
 from tksamples.crucible.converters import get_uvvis_measurement, get_image_measurement
 from tksamples.crucible.config import get_cache_dir
+from tksamples.read.store import write_uvvis_store, read_uvvis_store
+from tksamples.analysis.bandgap import get_band_gaps
+from tksamples.analysis.similarity import SpectralIndex
+from tksamples.analysis.qc import UVVisQC
+from tksamples.exclusions import ExclusionRegistry, aging_datasets
 
 # to not make ppl waiting
 from tqdm import tqdm
@@ -26,22 +33,11 @@ logger = logging.getLogger(__name__)
 
 #%%
 
-#TODO make this better lol
-bad_datasets = set([
-    # Trays 3/4, repeated measurements on same tray
-    "251218_130227_pollux_oospec_multipos_line_scan_TRAY3_4_1week",
-    "260107_151134_pollux_oospec_multipos_line_scan__TRAY3_4_4weeks",
-    "260109_111702_pollux_oospec_multipos_line_scan",
-    
-    # Trays 51/52, Tim fucked up
-    "260119_183317_pollux_oospec_multipos_line_scan"
-    ])
-
 class Samples(SampleCollection):
 
     def __init__(self, samples=None, from_crucible=True, cache_dir=None,
                  use_cache=True, overwrite_cache=False, project_id=None,
-                 sample_type=None):
+                 sample_type=None, exclusions=None):
 
         # store internal variables
         self._use_cache = use_cache
@@ -52,6 +48,16 @@ class Samples(SampleCollection):
         # set up knowledge of sample type
         self._sample_type = sample_type
 
+        # quality control of the last UV-Vis ingestion
+        self._qc = None
+
+        # datasets excluded from analysis
+        if exclusions is None:
+            exclusions = ExclusionRegistry.load(cache_dir=self._cache_dir)
+        self._exclusions = exclusions
+        self._datasets_table = None
+        self._datasets_table_version = None
+
         # read samples from crucible
         if samples is None and from_crucible:
             samples = self._get_samples_from_crucible(project_id=project_id,
@@ -97,23 +103,39 @@ class Samples(SampleCollection):
 
         return {dst["unique_id"]:dst for dst in all_datasets}
     
-    def get_measurments_datasets_of_type(self, mtype):
-        
-        measurement_datasets = []
+    @property
+    def exclusions(self):
+        """Registry of datasets excluded from analysis."""
+        return self._exclusions
+
+    def _build_datasets_table(self):
+        """Map measurement type -> datasets, with excluded datasets removed."""
+        table = {}
+        nexcluded = 0
         for dataset in self.samples_datasets:
+            if self._exclusions.is_excluded(dataset):
+                nexcluded += 1
+                continue
+            table.setdefault(dataset["measurement"], []).append(dataset)
 
-            # Check for measurement type
-            if dataset["measurement"] == mtype:
-                # Skip if dataset name contains any bad data
-                if any(bad_data in dataset["dataset_name"] for bad_data in bad_datasets):
-                    continue
-                
-                # Append valid datasets
-                measurement_datasets.append(dataset)
-        
-        return measurement_datasets
-    
-    def _get_measurement_data(self, measurement_type, converter_func, description):
+        if nexcluded:
+            logger.info(f"Excluded {nexcluded} datasets from analysis")
+
+        self._datasets_table = table
+        self._datasets_table_version = (self._exclusions.version, self._version)
+        return
+
+    def get_measurments_datasets_of_type(self, mtype):
+
+        # rebuild the table only if the exclusions or the samples changed
+        if self._datasets_table is None or \
+            self._datasets_table_version != (self._exclusions.version, self._version):
+            self._build_datasets_table()
+
+        return list(self._datasets_table.get(mtype, []))
+
+    def _get_measurement_data(self, measurement_type, converter_func, description,
+                              nworkers=1, qc=None, datasets=None, series_only=False):
         """
         Generic method to retrieve and associate measurements from Crucible.
 
@@ -121,17 +143,36 @@ class Samples(SampleCollection):
             measurement_type: The measurement type string for filtering datasets
             converter_func: Function to convert dataset to measurement object(s)
             description: Description for the progress bar
+            nworkers: Number of threads downloading and parsing datasets
+            qc: Optional QC object whose check(dataset, data) runs on each dataset
+            datasets: Datasets to read instead of the non-excluded ones of the type
+            series_only: Add the measurements as series only (see Sample.add_measurement)
         """
         # Get datasets of the specified type
-        datasets = self.get_measurments_datasets_of_type(mtype=measurement_type)
+        if datasets is None:
+            datasets = self.get_measurments_datasets_of_type(mtype=measurement_type)
+
+        def convert(dataset):
+            return converter_func(self.client, dataset, output_dir=self._cache_dir + "/datasets",
+                                  use_cache=self._use_cache,
+                                  overwrite_existing=self._overwrite)
+
+        # Download and convert datasets, in a thread pool if requested
+        if nworkers is not None and nworkers > 1:
+            with ThreadPoolExecutor(max_workers=nworkers) as executor:
+                results = list(tqdm(executor.map(convert, datasets), total=len(datasets),
+                                    desc=description, unit="dts", leave=False))
+        else:
+            results = map(convert, tqdm(datasets, desc=description, unit="dts", leave=False))
 
         # Collect measurements from all datasets
         measurements = []
-        for dataset in tqdm(datasets, desc=description, unit="dts", leave=False):
-            data = converter_func(self.client, dataset, output_dir=self._cache_dir + "/datasets",
-                                 use_cache=self._use_cache,
-                                 overwrite_existing=self._overwrite)
+        for dataset, data in zip(datasets, results):
             if data is not None:
+                # Check dataset quality as it comes in
+                if qc is not None and not qc.check(dataset, data) and qc.exclude:
+                    continue
+
                 # Handle both single measurements and lists of measurements
                 if isinstance(data, list):
                     measurements.extend(data)
@@ -139,32 +180,222 @@ class Samples(SampleCollection):
                     measurements.append(data)
 
         # Associate measurements with their samples
+        self._assign_measurements(measurements, series_only=series_only)
+
+        return
+
+    def _assign_measurements(self, measurements, series_only=False):
+        """Associate measurement objects with the samples of the collection."""
         for measurement in measurements:
             sample = self.get_sample(sample_id=measurement.sample_mfid,
                                     sample_name=measurement.sample_name)
             if sample is not None:
-                sample.add_measurement(measurement)
+                sample.add_measurement(measurement, series_only=series_only)
             else:
                 logger.warning("Cannot assign measurement to sample - sample not found")
                 logger.debug(f"Measurement details - mfid: {measurement.sample_mfid}, name: {measurement.sample_name}, type: {measurement.mtype}")
 
         return
 
-    def get_uvvis_data(self):
-        """Retrieve and associate UV-Vis spectroscopy measurements."""
+    def get_uvvis_data(self, nworkers=1, qc=True):
+        """
+        Retrieve and associate UV-Vis spectroscopy measurements.
+
+        Parameters
+        ----------
+        nworkers : int, optional
+            Number of threads used to download and parse datasets. Default is 1.
+        qc : UVVisQC or bool, optional
+            Quality control run on each dataset while it is ingested; flagged
+            datasets are excluded if `qc.exclude` is set. Default (True) uses
+            a UVVisQC with default limits, False disables it. The QC object
+            is available as `self.qc` afterwards.
+        """
+        if qc is True:
+            qc = UVVisQC()
+        self._qc = qc or None
+
+        self._get_measurement_data(
+            measurement_type="pollux_oospec_multipos_line_scan",
+            converter_func=get_uvvis_measurement,
+            description="Getting UV-Vis",
+            nworkers=nworkers,
+            qc=self._qc
+        )
+        return
+
+    def get_uvvis_series_data(self, patterns=None, nworkers=1):
+        """
+        Retrieve repeated (aging) UV-Vis scans for time series only.
+
+        The scans stay excluded from analysis: they are added as series-only
+        measurements, reachable through `Sample.get_measurement_series` but
+        never used as the latest measurement (`sample.uvvis`, QC, similarity
+        index, band gaps).
+
+        Parameters
+        ----------
+        patterns : list of str, optional
+            Substrings of the dataset names to read. Default is the Trays 3/4
+            aging scans (`tksamples.exclusions.aging_datasets`).
+        nworkers : int, optional
+            Number of threads used to download and parse datasets. Default is 1.
+        """
+        if patterns is None:
+            patterns = aging_datasets
+
+        datasets = [dataset for dataset in self.samples_datasets
+                    if dataset["measurement"] == "pollux_oospec_multipos_line_scan"
+                    and any(pattern in dataset["dataset_name"] for pattern in patterns)]
+
         self._get_measurement_data(
             measurement_type="pollux_oospec_multipos_line_scan",
             converter_func=get_uvvis_measurement,
-            description="Getting UV-Vis"
+            description="Getting UV-Vis series",
+            nworkers=nworkers,
+            datasets=datasets,
+            series_only=True
         )
         return
 
-    def get_well_images(self):
-        """Retrieve and associate sample well images."""
+    @property
+    def qc(self):
+        """QC object of the last UV-Vis ingestion (None if no QC was run)."""
+        return self._qc
+
+    def export_uvvis_store(self, filename, **kwargs):
+        """
+        Consolidate all loaded UV-Vis measurements into a single HDF5 store.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the store to write
+        **kwargs
+            Passed to `tksamples.read.store.write_uvvis_store`
+
+        Returns
+        -------
+        str
+            The path of the written store
+        """
+        return write_uvvis_store(self.get_measurements("uvvis"), filename, **kwargs)
+
+    def get_uvvis_data_from_store(self, filename, erange=None):
+        """
+        Associate UV-Vis measurements read from a consolidated HDF5 store.
+
+        Only measurements of samples in the collection are read.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the store written by `export_uvvis_store`
+        erange : tuple, optional
+            Wavelength range to assign to the measurements
+        """
+        sample_names = [sample.sample_name for sample in self]
+        measurements = read_uvvis_store(filename, sample_names=sample_names,
+                                        erange=erange)
+        self._assign_measurements(measurements)
+        return
+
+    def get_spectra_cube(self, directory, mtype="uvvis", **kwargs):
+        """
+        Stack the UV-Vis spectra of the collection into a memory-mapped cube.
+
+        Parameters
+        ----------
+        directory : str
+            Directory where the memory-mapped arrays are written
+        mtype : str, optional
+            Measurement type to stack. Default is "uvvis".
+        **kwargs
+            Passed to `SpectraCube.from_samples`
+
+        Returns
+        -------
+        SpectraCube
+            Cube with one row per sample, in collection order
+        """
+        return SpectraCube.from_samples(self.samples, directory, mtype=mtype, **kwargs)
+
+    def get_band_gaps(self, transition="direct", latest=True, **kwargs):
+        """
+        Estimate the optical band gap of every spot of every sample.
+
+        Parameters
+        ----------
+        transition : str, optional
+            Tauc transition type ("direct", "indirect", ...). Default is "direct".
+        latest : bool, optional
+            Only use the most recent UV-Vis measurement of each sample, as
+            the similarity index does. Default is True; with False, repeated
+            scans are told apart by the dataset_id column.
+        **kwargs
+            Passed to `tksamples.analysis.bandgap.tauc_band_gap` (window,
+            min_r2, energy_range)
+
+        Returns
+        -------
+        np.ndarray
+            Structured array with fields sample_name, dataset_id, spot,
+            band_gap [eV], slope and r2, one row per spot in the order
+            of the collection's measurements
+
+        Examples
+        --------
+        >>> table = thin_films.get_band_gaps(energy_range=(1.4, 2.0))
+        >>> table[table["sample_name"] == "TF000123"]["band_gap"]
+        """
+        return get_band_gaps(self.get_measurements("uvvis", latest=latest),
+                             transition=transition, **kwargs)
+
+    def build_similarity_index(self, wavelengths=None, value="absorbances",
+                               ncomponents=None):
+        """
+        Build a nearest-neighbor index over the UV-Vis spectra of the collection.
+
+        Parameters
+        ----------
+        wavelengths : array_like, optional
+            Wavelength grid of the index. Defaults to the grid of the first
+            UV-Vis measurement.
+        value : str, optional
+            Property to index. Default is "absorbances".
+        ncomponents : int, optional
+            Number of principal components kept. Default keeps full spectra.
+
+        Returns
+        -------
+        SpectralIndex
+            Index with one entry per sample, labeled by sample name
+        """
+        measurements = self.get_measurements("uvvis", latest=True)
+        if not measurements:
+            raise ValueError("No UV-Vis measurements loaded.")
+        if wavelengths is None:
+            wavelengths = measurements[0].wavelengths
+
+        index = SpectralIndex(wavelengths, value=value, ncomponents=ncomponents)
+        index.add(measurements)
+
+        return index
+
+    def get_well_images(self, nworkers=1):
+        """
+        Retrieve and associate sample well images.
+
+        Parameters
+        ----------
+        nworkers : int, optional
+            Number of threads used to download and parse datasets. Default is 1.
+        """
         self._get_measurement_data(
             measurement_type="sample well image",
             converter_func=get_image_measurement,
-            description="Getting images"
+            description="Getting images",
+            nworkers=nworkers
         )
         return
 
@@ -181,17 +412,9 @@ class Samples(SampleCollection):
                     unique_datasets.append(dataset)
         return unique_datasets
 
-    def get_measurements(self, mtype):
-        measurements = []
-        for sample in self:
-            for measurement in sample.measurements:
-                if measurement.mtype == mtype:
-                    measurements.append(measurement)
-        return measurements
-
     def _create_sliced_collection(self, sliced_samples):
         """Create a new Samples collection from sliced samples."""
         return Samples(samples=sliced_samples, from_crucible=False,
                        cache_dir=self._cache_dir, use_cache=self._use_cache,
                        overwrite_cache=self._overwrite, project_id=self.project_id,
-                       sample_type=self._sample_type)
\ No newline at end of file
+                       sample_type=self._sample_type, exclusions=self._exclusions)
\ No newline at end of file